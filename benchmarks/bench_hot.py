@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Stress the thread-safe hot tier with mixed get/put traffic
+
+    uv run python benchmarks/bench_hot.py [--ops 20000] [--keys 256]
+
+Prints throughput per thread count and whether the tier's books still
+balance afterwards: no lost hit/miss counts and a size total matching
+its contents.
+"""
+import argparse
+import random
+import threading
+import time
+from typing import Any, Dict
+
+from cortex.storage.concurrent import ThreadSafeHotStorage
+
+
+def stress(
+    storage: Any,
+    threads: int,
+    ops_per_thread: int = 20000,
+    keys: int = 256,
+    read_ratio: float = 0.8,
+    size: int = 100,
+) -> Dict[str, Any]:
+    """Hammer a tier from several threads; throughput and a consistency check"""
+    reads_done = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(n: int) -> None:
+        rng = random.Random(n)
+        barrier.wait()
+        for _ in range(ops_per_thread):
+            module_id = f"m{rng.randrange(keys)}"
+            if rng.random() < read_ratio:
+                storage.retrieve(module_id, size)
+                reads_done[n] += 1
+            else:
+                storage.store(module_id, module_id, size)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    stats = storage.stats()
+    resident = sum(storage.sizes.values())
+    return {
+        "threads": threads,
+        "ops_per_sec": round(threads * ops_per_thread / elapsed),
+        "consistent": (
+            stats["hits"] + stats["misses"] == sum(reads_done)
+            and storage.current_size == resident <= storage.max_size
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=20000, help="operations per thread")
+    parser.add_argument("--keys", type=int, default=256, help="distinct module ids")
+    parser.add_argument("--max-size", type=int, default=10000, help="tier budget in tokens")
+    args = parser.parse_args()
+    for threads in (1, 2, 4, 8):
+        print(stress(ThreadSafeHotStorage(max_size=args.max_size), threads, args.ops, args.keys))
+
+
+if __name__ == "__main__":
+    main()
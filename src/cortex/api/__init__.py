@@ -1,2 +1,2 @@
 """API module"""
-from . import health, modules, knowledge_graph, context, identity, resources, models
+from . import health, modules, knowledge_graph, context, identity, resources, models, deps
@@ -1,13 +1,21 @@
 """Context management endpoints"""
-from fastapi import APIRouter
-from typing import List
-from pydantic import BaseModel
+import asyncio
+import codecs
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
-from .models import ContextPushResponse, ContextAnalysisResponse
+from ..context import Context, ContextAnalysisError, ContextAnalyzer, ContextSessions
+from .deps import get_context_analyzer, get_context_sessions
+from .models import ContextAnalysisResponse, ContextBatchItem, ContextBatchResponse, ContextPushResponse, ContextStreamResponse
 
 router = APIRouter()
 
+# Analysis costs roughly 0.3-0.4ms per 1000 chars; longer texts leave the event loop
+INLINE_ANALYZE_CHARS = 4096
+
 class ContextPushRequest(BaseModel):
+    session_id: Optional[str] = Field(None, max_length=128, description="Omit to start a new session")
     domain: str
     intent: str
     keywords: List[str] = []
@@ -15,27 +23,88 @@ class ContextPushRequest(BaseModel):
 class ContextAnalyzeRequest(BaseModel):
     text: str
 
+class ContextAnalyzeBatchRequest(BaseModel):
+    texts: List[str]
+
+def _analysis(context: Context) -> ContextAnalysisResponse:
+    return ContextAnalysisResponse(
+        keywords=context.keywords,
+        domain=context.domain,
+        intent=context.intent,
+        confidence=context.confidence,
+        patterns=context.patterns,
+        suggested_modules=context.suggested_modules,
+        module_scores=context.module_scores,
+    )
+
 @router.post("/push", response_model=ContextPushResponse)
-async def push_context(request: ContextPushRequest) -> ContextPushResponse:
-    """Push context information"""
+async def push_context(
+    request: ContextPushRequest,
+    sessions: ContextSessions = Depends(get_context_sessions),
+) -> ContextPushResponse:
+    """Push context information into a session; earlier pushes fade over time"""
+    session = sessions.push(request.session_id, request.domain, request.intent, request.keywords)
+    modules, scores = sessions.suggestions(session)
     return ContextPushResponse(
         status="context_updated",
-        domain=request.domain,
-        intent=request.intent,
-        keywords=request.keywords,
-        suggested_modules=["python_expertise"] if "python" in request.keywords else []
+        session_id=session.session_id,
+        domain=session.domain,
+        intent=session.intent,
+        keywords=sessions.keywords(session, sessions.analyzer.max_keywords),
+        suggested_modules=modules,
+        module_scores=scores,
     )
 
 @router.post("/analyze", response_model=ContextAnalysisResponse)
-async def analyze_context(request: ContextAnalyzeRequest) -> ContextAnalysisResponse:
+async def analyze_context(
+    request: ContextAnalyzeRequest,
+    analyzer: ContextAnalyzer = Depends(get_context_analyzer),
+) -> ContextAnalysisResponse:
     """Analyze text to determine context"""
-    keywords = request.text.lower().split()[:10]  # Simple keyword extraction
-    domain = "programming" if any(word in request.text.lower() for word in ["python", "code", "debug"]) else "general"
-    
-    return ContextAnalysisResponse(
-        keywords=keywords,
-        domain=domain,
-        intent="unknown",
-        confidence=0.75,
-        suggested_modules=[]
-    )
+    try:
+        if len(request.text) <= INLINE_ANALYZE_CHARS:
+            return _analysis(analyzer.analyze(request.text))
+        return _analysis(await asyncio.to_thread(analyzer.analyze, request.text))
+    except ContextAnalysisError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+@router.post("/analyze/batch", response_model=ContextBatchResponse)
+async def analyze_context_batch(
+    request: ContextAnalyzeBatchRequest,
+    analyzer: ContextAnalyzer = Depends(get_context_analyzer),
+) -> ContextBatchResponse:
+    """Analyze many texts in one call; each item succeeds or fails on its own"""
+    try:
+        # Hundreds of texts are CPU work; keep the event loop free
+        results = await asyncio.to_thread(analyzer.analyze_batch, request.texts)
+    except ContextAnalysisError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    items = [
+        ContextBatchItem(index=index, error=str(result))
+        if isinstance(result, Exception)
+        else ContextBatchItem(index=index, analysis=_analysis(result))
+        for index, result in enumerate(results)
+    ]
+    failed = sum(1 for item in items if item.error is not None)
+    return ContextBatchResponse(results=items, analyzed=len(items) - failed, failed=failed)
+
+@router.post("/analyze/stream", response_model=ContextStreamResponse)
+async def analyze_context_stream(
+    request: Request,
+    confidence: Optional[float] = Query(None, ge=0.0, le=1.0),
+    analyzer: ContextAnalyzer = Depends(get_context_analyzer),
+) -> ContextStreamResponse:
+    """Analyze a UTF-8 text body of any length as it arrives
+
+    Reading stops as soon as the analysis is confident enough (the
+    server's setting unless confidence is given) or runs out of time;
+    the rest of the body is never read.
+    """
+    analysis = analyzer.stream(confidence)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    async for chunk in request.stream():
+        if not analysis.feed(decoder.decode(chunk)):
+            break
+    else:
+        analysis.feed(decoder.decode(b"", final=True))
+    return ContextStreamResponse(analysis=_analysis(analysis.finish()), chars=analysis.chars, stopped=analysis.stopped)
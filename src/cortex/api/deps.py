@@ -0,0 +1,65 @@
+"""Shared API dependencies"""
+from typing import Optional, Union
+
+from fastapi import Request
+from fastapi.requests import HTTPConnection
+
+from ..context import ContextAnalyzer, ContextSessions
+from ..events import AsyncEventBus, BrokerLink, EventStream
+from ..modules import LoadScheduler, ModuleLoader, ModuleRegistry, ModuleWarmup, TierMigrator
+from ..storage import ColdStorage, SharedWarmStorage, ThreadSafeHotStorage, WarmStorage
+
+
+def get_registry(request: Request) -> ModuleRegistry:
+    """Registry owned by the application lifespan"""
+    return request.app.state.registry
+
+
+def get_event_bus(request: Request) -> AsyncEventBus:
+    return request.app.state.events
+
+
+def get_event_stream(connection: HTTPConnection) -> EventStream:
+    """Usable from WebSocket routes as well as HTTP ones"""
+    return connection.app.state.stream
+
+
+def get_broker_link(request: Request) -> Optional[BrokerLink]:
+    """None unless events are relayed between workers"""
+    return getattr(request.app.state, "broker", None)
+
+
+def get_context_analyzer(request: Request) -> ContextAnalyzer:
+    return request.app.state.analyzer
+
+
+def get_context_sessions(request: Request) -> ContextSessions:
+    return request.app.state.sessions
+
+
+def get_loader(request: Request) -> ModuleLoader:
+    return request.app.state.loader
+
+
+def get_warmup(request: Request) -> ModuleWarmup:
+    return request.app.state.warmup
+
+
+def get_scheduler(request: Request) -> LoadScheduler:
+    return request.app.state.scheduler
+
+
+def get_hot_storage(request: Request) -> ThreadSafeHotStorage:
+    return request.app.state.hot
+
+
+def get_warm_storage(request: Request) -> Union[WarmStorage, SharedWarmStorage]:
+    return request.app.state.warm
+
+
+def get_cold_storage(request: Request) -> ColdStorage:
+    return request.app.state.cold
+
+
+def get_migrator(request: Request) -> TierMigrator:
+    return request.app.state.migrator
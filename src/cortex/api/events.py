@@ -0,0 +1,43 @@
+"""Event stream endpoints"""
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket
+from typing import List, Optional
+
+from ..events import AsyncEventBus, EventStream
+from .deps import get_event_bus, get_event_stream
+from .models import EventHistoryResponse, EventRecordInfo
+
+router = APIRouter()
+
+@router.get("/history", response_model=EventHistoryResponse)
+async def get_event_history(
+    since: int = Query(0, ge=0, description="Return events after this sequence number"),
+    topic: Optional[str] = Query(None, description="Topic pattern, e.g. module.* or #"),
+    limit: int = Query(100, ge=1, le=1000),
+    events: AsyncEventBus = Depends(get_event_bus),
+) -> EventHistoryResponse:
+    """Replay recorded events so late subscribers can catch up"""
+    history = events.history
+    if history is None:
+        raise HTTPException(status_code=404, detail="Event history is disabled")
+    records = history.replay(since, pattern=topic, limit=limit)
+    return EventHistoryResponse(
+        first_seq=history.first_seq,
+        last_seq=history.last_seq,
+        missed=since + 1 < history.first_seq,
+        events=[EventRecordInfo(**record.as_dict()) for record in records],
+    )
+
+@router.websocket("/stream")
+async def stream_events(
+    websocket: WebSocket,
+    topic: List[str] = Query(["#"], description="Topic patterns to receive; repeat for several"),
+    stream: EventStream = Depends(get_event_stream),
+) -> None:
+    """Push matching events as JSON frames: {"event", "data", "timestamp"}
+
+    Replaces polling /resources and /modules. A client that cannot keep up
+    gets a "stream.dropped" notice for skipped frames, or is closed with
+    code 1013 when the server is configured to disconnect slow consumers.
+    """
+    await websocket.accept()
+    await stream.serve(websocket, topic)
@@ -1,8 +1,10 @@
 """Health check endpoints"""
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response, status
 from datetime import datetime
 from typing import Dict, Any
 
+from ..modules import ModuleWarmup
+from .deps import get_warmup
 from .models import HealthStatus, ReadinessStatus, LivenessStatus
 
 router = APIRouter()
@@ -25,9 +27,19 @@ async def health_check() -> HealthStatus:
     )
 
 @router.get("/ready", response_model=ReadinessStatus)
-async def readiness_check() -> ReadinessStatus:
-    """Check if the service is ready to accept requests"""
-    return ReadinessStatus(status="ready")
+async def readiness_check(response: Response, warmup: ModuleWarmup = Depends(get_warmup)) -> ReadinessStatus:
+    """Check if the service is ready to accept requests
+
+    Not ready (503) until high-priority auto_load modules are resident;
+    degraded (also 503) if any of them failed to load.
+    """
+    if warmup.degraded:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ReadinessStatus(status="degraded", progress=warmup.progress())
+    if not warmup.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ReadinessStatus(status="warming_up", progress=warmup.progress())
+    return ReadinessStatus(status="ready", progress=warmup.progress())
 
 @router.get("/live", response_model=LivenessStatus)
 async def liveness_check() -> LivenessStatus:
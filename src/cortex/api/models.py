@@ -15,6 +15,7 @@ class HealthStatus(BaseModel):
 
 class ReadinessStatus(BaseModel):
     status: str
+    progress: Optional[Dict[str, Any]] = None
 
 class LivenessStatus(BaseModel):
     status: str
@@ -88,17 +89,56 @@ class AddEdgeResponse(BaseModel):
 # Context models
 class ContextPushResponse(BaseModel):
     status: str
-    domain: str
+    session_id: str
+    domain: str  # the session's estimate, not just this push's
     intent: str
-    keywords: List[str]
+    keywords: List[str]  # heaviest first, after decay
     suggested_modules: List[str] = []
+    module_scores: Dict[str, float] = {}  # trigger scores of the registered modules suggested
 
 class ContextAnalysisResponse(BaseModel):
     keywords: List[str]
     domain: str
     intent: str
     confidence: float
+    patterns: List[str] = []  # code, question
     suggested_modules: List[str] = []
+    module_scores: Dict[str, float] = {}  # trigger scores of the registered modules suggested
+
+class AnalysisCacheStats(BaseModel):
+    entries: int
+    max_entries: int
+    ttl: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
+    invalidations: int  # times a trigger change emptied the cache
+
+class ContextSessionStats(BaseModel):
+    sessions: int
+    max_sessions: int
+    half_life: float
+    idle_ttl: float
+    created: int
+    expired: int  # idle past idle_ttl
+    evicted: int  # pushed out by max_sessions
+
+class ContextBatchItem(BaseModel):
+    index: int
+    analysis: Optional[ContextAnalysisResponse] = None
+    error: Optional[str] = None
+
+class ContextBatchResponse(BaseModel):
+    results: List[ContextBatchItem]  # in request order
+    analyzed: int
+    failed: int
+
+class ContextStreamResponse(BaseModel):
+    analysis: ContextAnalysisResponse
+    chars: int  # read before stopping
+    stopped: Optional[str] = None  # confident or deadline, when the analysis stopped reading
 
 # Identity models
 class IdentityInfo(BaseModel):
@@ -124,12 +164,141 @@ class MemoryUsageResponse(BaseModel):
     free_tokens: int
     usage_percentage: float
     loaded_modules: List[ModuleMemoryInfo] = []
+    hit_ratio: float = 0.0
+    byte_hit_ratio: float = 0.0
+    admission_rejections: int = 0
 
 class MemoryOptimizeResponse(BaseModel):
     status: str
     freed_tokens: int
     modules_unloaded: int
 
+class LoadSchedulerStats(BaseModel):
+    queued: int
+    submitted: int
+    completed: int
+    failed: int
+    dropped: int
+    budget_ms: float
+    budget_misses: int
+    p50_ms: float
+    p99_ms: float
+
+class WarmTierStats(BaseModel):
+    modules: int
+    bytes_on_disk: int
+    reads: int
+    writes: int
+    read_mb_per_s: float
+    compression_ratio: float
+    # Present when the shared Redis warm tier is enabled
+    redis_hits: Optional[int] = None
+    redis_misses: Optional[int] = None
+    redis_errors: Optional[int] = None
+    redis_fallbacks: Optional[int] = None
+    redis_available: Optional[bool] = None
+
+class DecodePoolStats(BaseModel):
+    workers: int
+    max_in_flight: int
+    in_flight: int
+    queue_depth: int
+    peak_queue_depth: int
+    completed: int
+    failed: int
+    p50_ms: float
+    p99_ms: float
+
+class ColdTierStats(BaseModel):
+    modules: int
+    packs: int
+    bytes_on_disk: int
+    garbage_bytes: int
+    repacks: int
+    decode: Optional[DecodePoolStats] = None  # when decompression is offloaded
+
+class TierMigrationStats(BaseModel):
+    hot_to_warm: int
+    warm_to_cold: int
+    cold_to_warm: int
+    warm_to_hot: int
+    dropped: int
+    skipped_busy: int
+    bytes_moved: int
+    pending: int
+
+class EventSubscriptionStats(BaseModel):
+    event: str
+    handler: str
+    overflow: str
+    priority: int
+    queued: int
+    capacity: int
+    delivered: int
+    dropped: int
+    failed: int
+
+class EventHistoryStats(BaseModel):
+    capacity: int
+    size: int
+    first_seq: int
+    last_seq: int
+    spilled_segments: int
+
+class EventStreamStats(BaseModel):
+    clients: int
+    serialized: int
+    sent: int
+    dropped: int
+    disconnected_slow: int
+
+class EventBrokerPeerStats(BaseModel):
+    peers: int
+    frames: int
+    peers_dropped: int
+
+class EventBrokerStats(BaseModel):
+    role: str  # broker, worker or disconnected
+    socket: str
+    pending: int
+    sent_frames: int
+    sent_events: int
+    received_events: int
+    dropped: int
+    broker: Optional[EventBrokerPeerStats] = None  # only on the elected worker
+
+class EventBusStats(BaseModel):
+    emitted: int
+    dropped: int
+    coalesced_in: int = 0  # raw events merged by coalescing policies
+    coalesced_out: int = 0  # merged events delivered
+    history: Optional[EventHistoryStats] = None
+    stream: Optional[EventStreamStats] = None
+    broker: Optional[EventBrokerStats] = None  # relay to other workers, if configured
+    subscriptions: List[EventSubscriptionStats]
+
+class EventRecordInfo(BaseModel):
+    seq: int
+    timestamp: float
+    event: str
+    data: Any = None
+
+class EventHistoryResponse(BaseModel):
+    first_seq: int
+    last_seq: int
+    missed: bool  # events after since were already overwritten
+    events: List[EventRecordInfo]
+
+class ContentDedupResponse(BaseModel):
+    files: int
+    unique_files: int
+    logical_bytes: int
+    stored_bytes: int
+    bytes_saved: int
+    dedup_ratio: float
+    parses: int
+    hits: int
+
 # Root response
 class RootResponse(BaseModel):
     name: str
@@ -1,25 +1,88 @@
 """Module management endpoints"""
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from typing import List, Optional
 from pydantic import BaseModel
 
+from ..modules import (
+    InsufficientMemoryError,
+    InvalidCursorError,
+    LoadDroppedError,
+    LoadScheduler,
+    ModuleNotFoundError,
+    ModuleRecord,
+    ModuleRegistry,
+)
+from .deps import get_registry, get_scheduler
 from .models import ModuleInfo, ModuleLoadResponse, ModuleUnloadResponse
 
 router = APIRouter()
 
 class ModuleLoadRequest(BaseModel):
     module_id: str
-    priority: str = "normal"
+    priority: str = "normal"  # critical, high, normal or background
+
+def module_info(record: ModuleRecord) -> ModuleInfo:
+    return ModuleInfo(
+        id=record.id,
+        type=record.type,
+        name=record.manifest.name,
+        description=record.manifest.description,
+        size_tokens=record.size,
+        status=record.status.value,
+        version=record.version,
+        dependencies=list(record.manifest.dependencies),
+    )
 
 @router.get("", response_model=List[ModuleInfo])
-async def list_modules(filter: Optional[str] = None, type: Optional[str] = None) -> List[ModuleInfo]:
-    """List available and loaded modules"""
-    # TODO: Implement actual module listing
-    return []
+async def list_modules(
+    response: Response,
+    filter: Optional[str] = Query(None, description="Module id or name prefix"),
+    type: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status", description="available, loading or loaded"),
+    tag: Optional[str] = None,
+    sort: str = Query("name", pattern="^(name|size|last_used)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    registry: ModuleRegistry = Depends(get_registry),
+) -> List[ModuleInfo]:
+    """List available and loaded modules
+
+    The next page's cursor is returned in the X-Next-Cursor header.
+    """
+    try:
+        ids, next_cursor = registry.index.query(
+            type=type,
+            status=status_filter,
+            tag=tag,
+            prefix=filter,
+            sort=sort,
+            descending=order == "desc",
+            cursor=cursor,
+            limit=limit,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [module_info(registry.modules[module_id]) for module_id in ids]
 
 @router.post("/load", response_model=ModuleLoadResponse)
-async def load_module(request: ModuleLoadRequest) -> ModuleLoadResponse:
-    """Load a cognitive module"""
+async def load_module(
+    request: ModuleLoadRequest,
+    scheduler: LoadScheduler = Depends(get_scheduler),
+) -> ModuleLoadResponse:
+    """Load a cognitive module through the priority scheduler"""
+    try:
+        await scheduler.load(request.module_id, request.priority)
+    except ModuleNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except LoadDroppedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except InsufficientMemoryError as e:
+        raise HTTPException(status_code=status.HTTP_507_INSUFFICIENT_STORAGE, detail=str(e))
     return ModuleLoadResponse(
         status="loaded",
         module_id=request.module_id,
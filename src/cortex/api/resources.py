@@ -1,20 +1,58 @@
 """Resource management endpoints"""
-from fastapi import APIRouter
-from typing import Optional
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, Optional
 
-from .models import MemoryUsageResponse, MemoryOptimizeResponse, ModuleMemoryInfo
+from ..context import ContextAnalyzer, ContextSessions
+from ..events import AsyncEventBus, BrokerLink, EventStream
+from ..modules import LoadScheduler, ModuleRegistry, TierMigrator
+from ..storage import ColdStorage, ThreadSafeHotStorage, WarmStorage
+from .deps import (
+    get_broker_link,
+    get_cold_storage,
+    get_context_analyzer,
+    get_context_sessions,
+    get_event_bus,
+    get_event_stream,
+    get_hot_storage,
+    get_migrator,
+    get_registry,
+    get_scheduler,
+    get_warm_storage,
+)
+from .models import (
+    MemoryUsageResponse,
+    MemoryOptimizeResponse,
+    ModuleMemoryInfo,
+    ContentDedupResponse,
+    LoadSchedulerStats,
+    WarmTierStats,
+    ColdTierStats,
+    TierMigrationStats,
+    EventBusStats,
+    AnalysisCacheStats,
+    ContextSessionStats,
+)
 
 router = APIRouter()
 
 @router.get("/memory", response_model=MemoryUsageResponse)
-async def get_memory_usage() -> MemoryUsageResponse:
-    """Get current memory usage statistics"""
+async def get_memory_usage(hot: ThreadSafeHotStorage = Depends(get_hot_storage)) -> MemoryUsageResponse:
+    """Get current memory usage statistics for the hot tier"""
+    stats = hot.stats()
+    sizes = hot.sizes
     return MemoryUsageResponse(
-        used_tokens=0,
-        limit_tokens=100000,
-        free_tokens=100000,
-        usage_percentage=0.0,
-        loaded_modules=[]
+        used_tokens=hot.current_size,
+        limit_tokens=hot.max_size,
+        free_tokens=hot.get_free_space(),
+        usage_percentage=round(100.0 * hot.current_size / hot.max_size, 2) if hot.max_size else 0.0,
+        loaded_modules=[
+            ModuleMemoryInfo(id=module_id, size_tokens=size)
+            for module_id, size in sizes.items()
+        ],
+        hit_ratio=stats["hit_ratio"],
+        byte_hit_ratio=stats["byte_hit_ratio"],
+        admission_rejections=stats["rejections"],
     )
 
 @router.post("/optimize", response_model=MemoryOptimizeResponse)
@@ -25,3 +63,53 @@ async def optimize_memory(target_free_tokens: Optional[int] = None) -> MemoryOpt
         freed_tokens=0,
         modules_unloaded=0
     )
+
+@router.get("/warm", response_model=WarmTierStats)
+async def get_warm_stats(warm: WarmStorage = Depends(get_warm_storage)) -> WarmTierStats:
+    """Warm tier size, compression and measured read throughput"""
+    return WarmTierStats(**warm.stats())
+
+@router.get("/cold", response_model=ColdTierStats)
+async def get_cold_stats(cold: ColdStorage = Depends(get_cold_storage)) -> ColdTierStats:
+    """Cold archive pack count and garbage awaiting repack"""
+    return ColdTierStats(**cold.stats())
+
+@router.get("/migration", response_model=TierMigrationStats)
+async def get_migration_stats(migrator: TierMigrator = Depends(get_migrator)) -> TierMigrationStats:
+    """Modules moved between tiers by the background migrator"""
+    return TierMigrationStats(**migrator.stats())
+
+@router.get("/events", response_model=EventBusStats)
+async def get_event_stats(
+    events: AsyncEventBus = Depends(get_event_bus),
+    stream: EventStream = Depends(get_event_stream),
+    broker: Optional[BrokerLink] = Depends(get_broker_link),
+) -> EventBusStats:
+    """Per-subscriber queue depth and events dropped by overflow"""
+    return EventBusStats(
+        **events.stats(),
+        stream=stream.stats(),
+        broker=broker.stats() if broker is not None else None,
+    )
+
+@router.get("/analysis-cache", response_model=AnalysisCacheStats)
+async def get_analysis_cache_stats(analyzer: ContextAnalyzer = Depends(get_context_analyzer)) -> AnalysisCacheStats:
+    """Hits, misses and evictions of the context analysis cache"""
+    if analyzer.cache is None:
+        raise HTTPException(status_code=404, detail="Analysis cache is disabled")
+    return AnalysisCacheStats(**analyzer.cache.stats())
+
+@router.get("/context-sessions", response_model=ContextSessionStats)
+async def get_context_session_stats(sessions: ContextSessions = Depends(get_context_sessions)) -> ContextSessionStats:
+    """Live context sessions and how many have expired or been evicted"""
+    return ContextSessionStats(**sessions.stats())
+
+@router.get("/content", response_model=ContentDedupResponse)
+async def get_content_dedup(registry: ModuleRegistry = Depends(get_registry)) -> ContentDedupResponse:
+    """Report content deduplication across loaded modules"""
+    return ContentDedupResponse(**asdict(registry.content_store.report()))
+
+@router.get("/scheduler", response_model=Dict[str, LoadSchedulerStats])
+async def get_scheduler_stats(scheduler: LoadScheduler = Depends(get_scheduler)) -> Dict[str, LoadSchedulerStats]:
+    """Per-priority queue depth, latency percentiles and budget misses"""
+    return {priority: LoadSchedulerStats(**stats) for priority, stats in scheduler.report().items()}
@@ -4,18 +4,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 
-from .api import health, modules, knowledge_graph, context, identity, resources
+from .api import health, modules, knowledge_graph, context, identity, resources, events
 from .api.models import RootResponse
-
-# Try to import settings, fall back to simple version if needed
-try:
-    from .core.config import settings
-except ImportError:
-    # Create minimal settings if config fails
-    class Settings:
-        app_name = "Cortex_2"
-        version = "0.1.0"
-    settings = Settings()
+from .core.config import settings
+from .server import CortexServer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,8 +17,25 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
     logger.info("Starting Cortex_2 API server...")
+    server = CortexServer(settings)
+    await server.setup()
+    app.state.server = server
+    app.state.events = server.events
+    app.state.stream = server.stream
+    app.state.broker = server.broker
+    app.state.analyzer = server.analyzer
+    app.state.sessions = server.sessions
+    app.state.registry = server.registry
+    app.state.hot = server.hot
+    app.state.warm = server.warm
+    app.state.cold = server.cold
+    app.state.loader = server.loader
+    app.state.scheduler = server.scheduler
+    app.state.warmup = server.warmup
+    app.state.migrator = server.migrator
     yield
     logger.info("Shutting down Cortex_2 API server...")
+    await server.stop()
 
 # Create FastAPI app
 app = FastAPI(
@@ -54,6 +63,7 @@ app.include_router(knowledge_graph.router, prefix="/knowledge-graph", tags=["Kno
 app.include_router(context.router, prefix="/context", tags=["Context"])
 app.include_router(identity.router, prefix="/identity", tags=["Identity"])
 app.include_router(resources.router, prefix="/resources", tags=["Resources"])
+app.include_router(events.router, prefix="/events", tags=["Events"])
 
 @app.get("/", response_model=RootResponse)
 async def root() -> RootResponse:
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
 """Cortex CLI interface"""
+import asyncio
+import logging
+from pathlib import Path
+
 import click
 
 @click.group()
@@ -17,6 +21,20 @@ def server():
     """Start Cortex server"""
     click.echo("Starting Cortex server...")
 
+@cli.command()
+@click.argument("socket", type=click.Path(path_type=Path))
+def broker(socket):
+    """Run the event broker for multi-worker deployments"""
+    from .events.broker import BrokerError, serve
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(serve(socket))
+    except BrokerError as e:
+        raise click.ClickException(str(e))
+    except KeyboardInterrupt:
+        pass
+
 def main():
     cli()
 
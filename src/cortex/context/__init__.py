@@ -0,0 +1,8 @@
+"""Context analysis"""
+from .analyzer import ContextAnalysisError, ContextAnalyzer
+from .cache import AnalysisCache
+from .sessions import ContextSession, ContextSessions
+from .stream import IncrementalAnalysis
+from .suggest import ModuleSuggester, SuggestionIndex
+from .tables import ContextTables, ContextTablesError
+from .types import Context
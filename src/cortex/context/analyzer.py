@@ -0,0 +1,246 @@
+"""Context Analyzer - keywords, domain and intent from free text
+
+A single text is analyzed as a batch of one. Each text is tokenized by
+one regex pass over its lowercased form and counted with Counter; the
+batch is then a sparse term matrix whose columns (distinct terms) are
+each looked up in the compiled tables (see tables.py) once, so cost past
+the scan follows the batch's vocabulary rather than its length.
+
+Keywords are ranked by informativeness: log-damped frequency, scaled by
+length and doubled for domain or intent terms. Confidence combines how
+strongly and how exclusively the text points at its domain with how
+clearly it states an intent.
+
+Inputs too long to hold are fed through stream() instead (stream.py).
+"""
+import heapq
+import logging
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .cache import AnalysisCache
+from .suggest import ModuleSuggester, PatternKey
+from .tables import ContextTables
+from .types import Context
+
+# Words start with a letter; keeps c++, c#, node.js and snake_case whole
+TOKEN_RE = re.compile(r"[^\W\d_][\w+#]*(?:[.\-][^\W_][\w+#]*)*")
+CODE_RE = re.compile(
+    r"^[ \t]*(?:def|class|import|from|function|const|let|var|public|private|return|#include)\b"
+    r"|[;{}][ \t]*$|=>|```",
+    re.MULTILINE,
+)
+QUESTION_RE = re.compile(
+    r"\?[ \t]*$|^[ \t]*(?:what|why|how|when|where|who|which|can|could|should|would|is|are|does|do)\b",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+logger = logging.getLogger(__name__)
+
+GENERAL = "general"
+
+
+def informativeness(token: str, hit: bool) -> float:
+    """Keyword weight of a term before its frequency: length, doubled for table terms"""
+    return min(len(token), 12) / 12 * (2 if hit else 1)
+
+
+def detect_patterns(text: str) -> List[str]:
+    patterns = []
+    if CODE_RE.search(text):
+        patterns.append("code")
+    if QUESTION_RE.search(text):
+        patterns.append("question")
+    return patterns
+
+
+class ContextAnalysisError(Exception):
+    pass
+
+
+class ContextAnalyzer:
+    """Analyzes input text to determine its context"""
+
+    def __init__(
+        self,
+        tables: Optional[ContextTables] = None,
+        max_keywords: int = 20,
+        min_length: int = 3,
+        max_chars: Optional[int] = None,
+        max_batch: Optional[int] = None,
+        cache: Optional[AnalysisCache] = None,
+        stream_confidence: float = 0.95,
+        stream_max_seconds: Optional[float] = None,
+        suggester: Optional[ModuleSuggester] = None,
+    ):
+        self.tables = tables or ContextTables()
+        self.max_keywords = max_keywords
+        self.min_length = min_length
+        self.max_chars = max_chars
+        self.max_batch = max_batch
+        self.cache = cache
+        # Defaults for stream(): stop once this confident, or after this long
+        self.stream_confidence = stream_confidence
+        self.stream_max_seconds = stream_max_seconds
+        self.suggester = suggester
+
+    def analyze(self, text: str) -> Context:
+        result = self.analyze_batch([text])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def analyze_batch(self, texts: Sequence[str]) -> List[Union[Context, Exception]]:
+        """Analyze many texts at once; results are in input order
+
+        The batch is a sparse term matrix: one row of token counts per
+        text, and one postings list per distinct term. Each distinct term
+        is classified (stopword, length, table hit) once for the whole
+        batch, then scored into every row it occurs in; repeated texts
+        are analyzed once, and with a cache, texts seen recently not at
+        all. A text that cannot be analyzed gets an exception in its slot
+        instead.
+        """
+        if self.max_batch is not None and len(texts) > self.max_batch:
+            raise ContextAnalysisError(f"Batch of {len(texts)} texts exceeds {self.max_batch}")
+        results: List[Union[Context, Exception, None]] = [None] * len(texts)
+        rows: List[int] = []  # row -> index of its first text
+        row_of: Dict[str, int] = {}  # repeated texts share a row
+        duplicates: List[Tuple[int, int]] = []  # (index, row)
+        columns: Dict[str, List[Tuple[int, int, int]]] = {}  # term -> [(row, count, position)]
+        for index, text in enumerate(texts):
+            if not isinstance(text, str):
+                results[index] = ContextAnalysisError(f"Expected text, got {type(text).__name__}")
+                continue
+            if self.max_chars is not None and len(text) > self.max_chars:
+                results[index] = ContextAnalysisError(f"Text exceeds {self.max_chars} characters")
+                continue
+            row = row_of.get(text)
+            if row is not None:
+                duplicates.append((index, row))
+                continue
+            if self.cache is not None:
+                cached = self.cache.get(text)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            row = row_of[text] = len(rows)
+            rows.append(index)
+            for position, (token, count) in enumerate(Counter(TOKEN_RE.findall(text.lower())).items()):
+                postings = columns.get(token)
+                if postings is None:
+                    columns[token] = [(row, count, position)]
+                else:
+                    postings.append((row, count, position))
+
+        domain_scores: List[Dict[str, float]] = [{} for _ in rows]
+        intent_scores: List[Dict[str, float]] = [{} for _ in rows]
+        candidates: List[List[Tuple[float, int, str]]] = [[] for _ in rows]
+        stopwords, terms, min_length = self.tables.stopwords, self.tables.terms, self.min_length
+        for token, postings in columns.items():
+            if len(token) < min_length or token in stopwords:
+                continue
+            hit = terms.get(token)
+            base = informativeness(token, hit is not None)
+            for row, count, position in postings:
+                weight = 1.0 if count == 1 else 1.0 + math.log(count)
+                candidates[row].append((weight * base, -position, token))
+                if hit is not None:
+                    scores = domain_scores[row]
+                    for name in hit[0]:
+                        scores[name] = scores.get(name, 0.0) + weight
+                    scores = intent_scores[row]
+                    for name in hit[1]:
+                        scores[name] = scores.get(name, 0.0) + weight
+
+        for row, index in enumerate(rows):
+            try:
+                results[index] = self._context(texts[index], candidates[row], domain_scores[row], intent_scores[row])
+                if self.cache is not None:
+                    self.cache.put(texts[index], results[index])
+            except Exception as e:
+                logger.error(f"Context analysis failed for batch item {index}: {e}")
+                results[index] = e
+        for index, row in duplicates:
+            # Contexts are not shared; callers may modify theirs
+            first = results[rows[row]]
+            results[index] = first.copy() if isinstance(first, Context) else first
+        return results
+
+    def stream(
+        self,
+        confidence: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+    ) -> "IncrementalAnalysis":
+        """An analysis fed chunk by chunk; see stream.py"""
+        from .stream import IncrementalAnalysis
+
+        return IncrementalAnalysis(
+            self,
+            self.stream_confidence if confidence is None else confidence,
+            self.stream_max_seconds if max_seconds is None else max_seconds,
+        )
+
+    def decide(self, domain_scores: Dict[str, float], intent_scores: Dict[str, float]) -> Tuple[str, str, float]:
+        """(domain, intent, confidence) for accumulated scores"""
+        tables = self.tables
+        domain, domain_strength = GENERAL, 0.0
+        if domain_scores:
+            domain = max(domain_scores, key=lambda d: (domain_scores[d], -tables.domain_order[d]))
+            top = domain_scores[domain]
+            domain_strength = (1 - math.exp(-top)) * top / sum(domain_scores.values())
+        intent, intent_strength = GENERAL, 0.0
+        if intent_scores:
+            intent = max(intent_scores, key=lambda i: (intent_scores[i], -tables.intent_order[i]))
+            intent_strength = 1 - math.exp(-intent_scores[intent])
+        return domain, intent, round(0.1 + 0.6 * domain_strength + 0.3 * intent_strength, 3)
+
+    def suggest(
+        self,
+        terms: Dict[str, float],
+        domain: str,
+        intent: str,
+        text: Optional[str] = None,
+        matched: Iterable[PatternKey] = (),
+    ) -> Tuple[List[str], Dict[str, float]]:
+        """Registered modules by trigger score, then the domain's table modules"""
+        scores: Dict[str, float] = {}
+        if self.suggester is not None:
+            terms = dict(terms)
+            for name in (domain, intent):
+                if name != GENERAL:
+                    terms[name] = 1.0
+            scores = dict(self.suggester.suggest(terms, text, matched))
+        modules = list(scores)
+        modules.extend(m for m in self.tables.domain_modules.get(domain, []) if m not in scores)
+        return modules, scores
+
+    def _context(
+        self,
+        text: str,
+        candidates: List[Tuple[float, int, str]],
+        domain_scores: Dict[str, float],
+        intent_scores: Dict[str, float],
+        patterns: Optional[List[str]] = None,
+        matched: Optional[Iterable[PatternKey]] = None,
+    ) -> Context:
+        # Ties keep first-appearance order
+        keywords = [token for _, _, token in heapq.nlargest(self.max_keywords, candidates)]
+        domain, intent, confidence = self.decide(domain_scores, intent_scores)
+        # Regex triggers run on the text unless the caller already matched them
+        modules, module_scores = self.suggest(
+            dict.fromkeys(keywords, 1.0), domain, intent, text if matched is None else None, matched or ()
+        )
+        return Context(
+            raw_input=text,
+            keywords=keywords,
+            domain=domain,
+            intent=intent,
+            confidence=confidence,
+            patterns=detect_patterns(text) if patterns is None else patterns,
+            suggested_modules=modules,
+            domain_scores=domain_scores,
+            module_scores=module_scores,
+        )
@@ -0,0 +1,111 @@
+"""Analysis Cache - memoized contexts for repeated inputs
+
+Agents resend the same prompts and boilerplate, so results are kept in
+a bounded LRU with a TTL. Keys are a digest of the normalized text
+(surrounding and repeated whitespace and blank lines dropped; case kept,
+since code detection is case-sensitive) plus a version - the registry's
+trigger version in the server - so a trigger change empties the cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .types import Context
+
+
+def normalize(text: str) -> str:
+    return "\n".join(" ".join(words) for words in (line.split() for line in text.splitlines()) if words)
+
+
+def text_key(text: str) -> bytes:
+    return blake2b(normalize(text).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class AnalysisCache:
+    """Thread-safe LRU + TTL cache of analysis results"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        version: Optional[Callable[[], Hashable]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._version = version or (lambda: 0)
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[Hashable, bytes], Tuple[float, Context]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._seen_version: Hashable = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _current(self) -> Hashable:
+        """Current version, dropping every entry if it moved; caller holds the lock"""
+        version = self._version()
+        if version != self._seen_version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self._seen_version = version
+        return version
+
+    def get(self, text: str) -> Optional[Context]:
+        """A private copy of the cached context for text, or None"""
+        key = text_key(text)
+        with self._lock:
+            entry = self._entries.get((self._current(), key))
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, context = entry
+            if expires <= self._clock():
+                del self._entries[(self._seen_version, key)]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end((self._seen_version, key))
+            self.hits += 1
+        return replace(context.copy(), raw_input=text)
+
+    def put(self, text: str, context: Context) -> None:
+        if self.max_entries <= 0:
+            return
+        key = text_key(text)
+        # The text itself is not kept; get() puts the caller's back
+        stored = replace(context.copy(), raw_input="")
+        with self._lock:
+            full_key = (self._current(), key)
+            self._entries[full_key] = (self._clock() + self.ttl, stored)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
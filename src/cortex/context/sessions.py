@@ -0,0 +1,183 @@
+"""Context sessions - conversation context accumulated across pushes
+
+Each push adds to its session's keyword weights and domain/intent votes,
+and older pushes fade with a half-life. Decay is applied lazily: a value
+added at time t is stored as w * 2^((t - origin) / half_life), so every
+stored value shares one growing scale and nothing already stored is
+touched; reading divides by the current scale. A push therefore costs
+O(its keywords); only after REBASE half-lives is the session rescaled,
+in one pass. Keywords come from the client, so each session keeps at
+most max_keywords of them, cut back to the heaviest half on overflow.
+
+Suggestions depend only on the estimated domain and intent, the top
+keywords and the registry's trigger version, so they are cached per
+session until one of those moves.
+
+Sessions are an LRU: one idle past idle_ttl is dropped on the next push,
+and past max_sessions the least recently pushed goes.
+"""
+import heapq
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .analyzer import GENERAL, ContextAnalyzer
+
+REBASE = 64  # half-lives after which stored values are brought back to 1x
+
+
+class ContextSession:
+    """Decayed context of one conversation"""
+
+    def __init__(self, session_id: str, now: float):
+        self.session_id = session_id
+        self.origin = now  # stored values are scaled relative to this
+        self.last_seen = now
+        self.pushes = 0
+        self.weights: Dict[str, float] = {}
+        self.domain_votes: Dict[str, float] = {}
+        self.intent_votes: Dict[str, float] = {}
+        self.domain = GENERAL
+        self.intent = GENERAL
+        self._suggestions: Optional[Tuple[Hashable, List[str], Dict[str, float]]] = None  # (key, modules, scores)
+
+
+class ContextSessions:
+    """Per-session context state, updated incrementally by each push"""
+
+    def __init__(
+        self,
+        analyzer: ContextAnalyzer,
+        half_life: float = 600.0,
+        idle_ttl: float = 3600.0,
+        max_sessions: int = 10_000,
+        max_keywords: int = 200,
+        version: Optional[Callable[[], Hashable]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.analyzer = analyzer
+        self.half_life = half_life
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.max_keywords = max_keywords
+        self._version = version or (lambda: 0)
+        self._clock = clock
+        self._sessions: "OrderedDict[str, ContextSession]" = OrderedDict()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[ContextSession]:
+        return self._sessions.get(session_id)
+
+    def drop(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def push(
+        self,
+        session_id: Optional[str],
+        domain: str,
+        intent: str,
+        keywords: List[str],
+    ) -> ContextSession:
+        """Fold one push into its session, creating the session if needed"""
+        now = self._clock()
+        self._expire(now)
+        session = self._sessions.get(session_id) if session_id else None
+        if session is None:
+            session = ContextSession(session_id or uuid.uuid4().hex, now)
+            self._sessions[session.session_id] = session
+            self.created += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._sessions.move_to_end(session.session_id)
+        session.last_seen = now
+        session.pushes += 1
+
+        if now - session.origin > REBASE * self.half_life:
+            self._rebase(session, now)
+        scale = 2.0 ** ((now - session.origin) / self.half_life)
+        tables = self.analyzer.tables
+        weights, domain_votes, intent_votes = session.weights, session.domain_votes, session.intent_votes
+        # The client's own domain and intent count for more than any one keyword
+        if domain and domain != GENERAL:
+            domain_votes[domain] = domain_votes.get(domain, 0.0) + 2 * scale
+        if intent and intent != GENERAL:
+            intent_votes[intent] = intent_votes.get(intent, 0.0) + 2 * scale
+        for keyword in keywords:
+            keyword = keyword.strip().lower()
+            if not keyword:
+                continue
+            weights[keyword] = weights.get(keyword, 0.0) + scale
+            hit = tables.terms.get(keyword)
+            if hit is not None:
+                for name in hit[0]:
+                    domain_votes[name] = domain_votes.get(name, 0.0) + scale
+                for name in hit[1]:
+                    intent_votes[name] = intent_votes.get(name, 0.0) + scale
+        for votes in (weights, domain_votes, intent_votes):
+            if len(votes) > self.max_keywords:
+                self._prune(votes)
+
+        # Both vote tables stay small: the table's names plus what clients push
+        session.domain = max(domain_votes, key=domain_votes.__getitem__) if domain_votes else GENERAL
+        session.intent = max(intent_votes, key=intent_votes.__getitem__) if intent_votes else GENERAL
+        return session
+
+    def keywords(self, session: ContextSession, limit: int = 20) -> List[str]:
+        """The session's heaviest keywords, at most max_keywords to rank"""
+        return heapq.nlargest(limit, session.weights, key=session.weights.__getitem__)
+
+    def weight(self, session: ContextSession, keyword: str) -> float:
+        """Current, decayed weight of one keyword"""
+        # Multiplying by the inverse underflows to 0 rather than overflowing
+        return session.weights.get(keyword, 0.0) * 2.0 ** ((session.origin - self._clock()) / self.half_life)
+
+    def suggestions(self, session: ContextSession) -> Tuple[List[str], Dict[str, float]]:
+        """Suggested modules and their scores, recomputed only when their inputs change"""
+        keywords = self.keywords(session, self.analyzer.max_keywords)
+        key = (session.domain, session.intent, tuple(sorted(keywords)), self._version())
+        if session._suggestions is None or session._suggestions[0] != key:
+            modules, scores = self.analyzer.suggest(dict.fromkeys(keywords, 1.0), session.domain, session.intent)
+            session._suggestions = (key, modules, scores)
+        return list(session._suggestions[1]), dict(session._suggestions[2])
+
+    def _rebase(self, session: ContextSession, now: float) -> None:
+        factor = 2.0 ** ((session.origin - now) / self.half_life)
+        for votes in (session.weights, session.domain_votes, session.intent_votes):
+            for name in votes:
+                votes[name] *= factor
+        session.origin = now
+
+    def _prune(self, votes: Dict[str, float]) -> None:
+        """Cut a vote table back to its heaviest half"""
+        kept = heapq.nlargest(self.max_keywords // 2, votes.items(), key=lambda item: item[1])
+        votes.clear()
+        votes.update(kept)
+
+    def _expire(self, now: float) -> None:
+        """Drop sessions idle past idle_ttl; the least recently pushed are first"""
+        sessions = self._sessions
+        while sessions:
+            session = next(iter(sessions.values()))
+            if now - session.last_seen < self.idle_ttl:
+                break
+            sessions.popitem(last=False)
+            self.expired += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "half_life": self.half_life,
+            "idle_ttl": self.idle_ttl,
+            "created": self.created,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
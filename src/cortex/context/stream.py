@@ -0,0 +1,158 @@
+"""Incremental analysis - very long inputs fed as a stream of chunks
+
+Chunks are cut into segments on line boundaries (or, for a line longer
+than MAX_CARRY, on whitespace), so no token or line-anchored pattern is
+split; the unfinished tail is carried into the next chunk. Each segment
+is tokenized and counted like a batch row, and its counts are folded
+into running state: per-term count and first position, and domain and
+intent scores, which move by the change in the term's log-damped weight
+(log(new) - log(old)) rather than being recomputed.
+
+Memory stays bounded whatever the input size: the carry is capped, and
+once more than max_terms distinct words are held, words outside the
+tables are cut back to the best-scoring half, so a word seen again after
+being cut starts over. Fed whole, the result matches analyze() on the
+same text.
+
+The analysis stops early - feed() returns False - once its confidence
+reaches the threshold, or when max_seconds have passed since the first
+chunk; the caller then stops reading.
+"""
+import heapq
+import math
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .analyzer import CODE_RE, QUESTION_RE, TOKEN_RE, ContextAnalyzer, informativeness
+from .suggest import PatternKey
+from .types import Context
+
+MAX_CARRY = 4096  # chars held back waiting for a line to end
+MAX_TERMS = 50_000
+
+CONFIDENT = "confident"
+DEADLINE = "deadline"
+
+
+class IncrementalAnalysis:
+    """One streamed input; feed() chunks, then finish()"""
+
+    def __init__(
+        self,
+        analyzer: ContextAnalyzer,
+        confidence: float = 0.95,
+        max_seconds: Optional[float] = None,
+        max_terms: int = MAX_TERMS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.analyzer = analyzer
+        self.confidence = confidence
+        self.max_seconds = max_seconds
+        self.max_terms = max_terms
+        self._clock = clock
+        self._deadline: Optional[float] = None
+        self._carry = ""
+        self._midline = False  # the carry does not start a line
+        self._counts: Dict[str, List[int]] = {}  # term -> [count, first position]
+        self._positions = 0
+        self._domain_scores: Dict[str, float] = {}
+        self._intent_scores: Dict[str, float] = {}
+        self._code = False
+        self._question = False
+        self._matched: Set[PatternKey] = set()  # regex triggers seen so far
+        self.chars = 0
+        self.stopped: Optional[str] = None  # CONFIDENT or DEADLINE
+
+    def feed(self, chunk: str) -> bool:
+        """Take the next chunk; False once the analysis wants no more input"""
+        if self.stopped is not None:
+            return False
+        if self._deadline is None and self.max_seconds is not None:
+            self._deadline = self._clock() + self.max_seconds
+        self.chars += len(chunk)
+        text = self._carry + chunk
+        cut = text.rfind("\n") + 1
+        midline = False
+        if not cut and len(text) > MAX_CARRY:
+            # A very long line: cut after its last whitespace, or anywhere
+            cut = max(text.rfind(" "), text.rfind("\t")) + 1 or len(text)
+            midline = True
+        if cut:
+            self._scan(text[:cut], self._midline, midline)
+            self._midline = midline
+            text = text[cut:]
+        self._carry = text
+
+        if self.analyzer.decide(self._domain_scores, self._intent_scores)[2] >= self.confidence:
+            self.stopped = CONFIDENT
+        elif self._deadline is not None and self._clock() >= self._deadline:
+            self.stopped = DEADLINE
+        return self.stopped is None
+
+    def finish(self) -> Context:
+        """The context of everything fed; the input itself is not kept"""
+        if self._carry:
+            self._scan(self._carry, self._midline, False)
+            self._carry = ""
+        candidates: List[Tuple[float, int, str]] = []
+        terms = self.analyzer.tables.terms
+        for token, (count, position) in self._counts.items():
+            weight = 1.0 if count == 1 else 1.0 + math.log(count)
+            candidates.append((weight * informativeness(token, token in terms), -position, token))
+        patterns = []
+        if self._code:
+            patterns.append("code")
+        if self._question:
+            patterns.append("question")
+        return self.analyzer._context(
+            "", candidates, dict(self._domain_scores), dict(self._intent_scores), patterns, self._matched
+        )
+
+    def _scan(self, segment: str, starts_midline: bool, ends_midline: bool) -> None:
+        tables = self.analyzer.tables
+        stopwords, terms, min_length = tables.stopwords, tables.terms, self.analyzer.min_length
+        counts = self._counts
+        for token, count in Counter(TOKEN_RE.findall(segment.lower())).items():
+            if len(token) < min_length or token in stopwords:
+                continue
+            entry = counts.get(token)
+            if entry is None:
+                counts[token] = [count, self._positions]
+                self._positions += 1
+                delta = 1.0 + math.log(count)
+            else:
+                delta = math.log(entry[0] + count) - math.log(entry[0])
+                entry[0] += count
+            hit = terms.get(token)
+            if hit is None:
+                continue
+            scores = self._domain_scores
+            for name in hit[0]:
+                scores[name] = scores.get(name, 0.0) + delta
+            scores = self._intent_scores
+            for name in hit[1]:
+                scores[name] = scores.get(name, 0.0) + delta
+        if len(counts) > self.max_terms:
+            self._prune()
+
+        # Sentinels keep ^ and $ from matching where a line was cut
+        probe = ("x" if starts_midline else "") + segment + ("x" if ends_midline else "")
+        start = 1 if starts_midline else 0
+        if not (self._code and self._question):
+            self._code = self._code or CODE_RE.search(probe, start) is not None
+            self._question = self._question or QUESTION_RE.search(probe, start) is not None
+        if self.analyzer.suggester is not None:
+            self._matched |= self.analyzer.suggester.match(probe, start)
+
+    def _prune(self) -> None:
+        """Cut words outside the tables back to the best-scoring half"""
+        terms = self.analyzer.tables.terms
+        counts = self._counts
+        kept = {token: entry for token, entry in counts.items() if token in terms}
+        others = [(entry[0] * min(len(token), 12), -entry[1], token) for token, entry in counts.items() if token not in terms]
+        for _, _, token in heapq.nlargest(max(self.max_terms // 2 - len(kept), 0), others):
+            kept[token] = counts[token]
+        # Table terms keep their counts so score deltas stay exact
+        self._counts = kept
+
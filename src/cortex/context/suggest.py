@@ -0,0 +1,238 @@
+"""Module suggestions - one inverted index over every manifest trigger
+
+Keywords and context values map term -> [(module, weight)], the weight
+being the trigger's confidence tier (see modules/manifest.py). A phrase
+is indexed under its joined forms (knowledge_graph, knowledge-graph) at
+full weight and under each of its words at a share of it. Regex
+triggers are indexed by a literal every match must contain, taken from
+the parsed pattern; one scan of the text for those literals picks the
+few regexes worth running. The scan reports the longest literal starting
+at each position, which stands for every literal that is a prefix of
+it. Patterns without such a literal are always run, so they should stay
+rare. Literals come from the interpreter's private regex parser; where
+it is missing or has changed shape, every pattern is simply run.
+
+Scoring is term-at-a-time with max-score early termination: query terms
+are taken heaviest bound first, and once the bound left over cannot lift
+a module that is not yet a candidate into the top k, the remaining long
+postings lists are skipped and only the candidates still in reach are
+finished from a per-module forward index. Cost follows the query and
+the top k rather than the size of the catalog.
+
+The index is rebuilt lazily when the registry's trigger version moves.
+"""
+import heapq
+import logging
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Set, Tuple
+
+from ..modules import ModuleRegistry
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+, private
+except ImportError:  # pragma: no cover
+    try:
+        import sre_parse
+    except ImportError:
+        sre_parse = None
+
+logger = logging.getLogger(__name__)
+
+MIN_LITERAL = 3
+CONTEXT_WEIGHT = 0.5  # a triggers.contexts value matched by domain, intent or keyword
+
+PatternKey = Tuple[str, str]  # (module id, regex); stable across rebuilds
+
+
+def required_literals(regex: str) -> Optional[FrozenSet[str]]:
+    """Lowercased strings one of which every match contains, or None"""
+    if sre_parse is None:
+        return None
+    try:
+        literals = _literals(sre_parse.parse(regex))
+    except re.error:
+        return None
+    except (AttributeError, TypeError, ValueError) as e:
+        # The parser's opcodes or tree layout moved; treat as literal-free
+        logger.debug(f"Cannot take literals from {regex!r}: {e}")
+        return None
+    if literals is None or min(len(literal) for literal in literals) < MIN_LITERAL:
+        return None
+    return literals
+
+
+def _literals(items) -> Optional[FrozenSet[str]]:
+    best: Optional[FrozenSet[str]] = None
+    run: List[str] = []
+
+    def consider(candidate: Optional[FrozenSet[str]]) -> None:
+        nonlocal best
+        # The rarest choice is the one whose shortest literal is longest
+        if candidate and (best is None or min(map(len, candidate)) > min(map(len, best))):
+            best = candidate
+
+    for op, arg in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(arg).lower())
+            continue
+        if run:
+            consider(frozenset(["".join(run)]))
+            run = []
+        if op is sre_parse.SUBPATTERN:
+            consider(_literals(arg[-1]))
+        elif op is sre_parse.BRANCH:
+            branches = [_literals(branch) for branch in arg[1]]
+            if all(branches):
+                consider(frozenset().union(*branches))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and arg[0] >= 1:
+            consider(_literals(arg[2]))
+    if run:
+        consider(frozenset(["".join(run)]))
+    return best
+
+
+class SuggestionIndex:
+    """Inverted index over the triggers of one set of manifests"""
+
+    def __init__(self, registry: ModuleRegistry):
+        postings: Dict[str, Dict[str, float]] = {}
+        self.patterns: Dict[PatternKey, Tuple[Pattern, float]] = {}
+        self.by_literal: Dict[str, List[PatternKey]] = {}
+        self.unindexed: List[PatternKey] = []
+
+        def add(term: str, module_id: str, weight: float) -> None:
+            entries = postings.setdefault(term, {})
+            entries[module_id] = max(weight, entries.get(module_id, 0.0))
+
+        for module_id, record in list(registry.modules.items()):
+            triggers = record.manifest.triggers
+            for keyword, weight in triggers.keywords.items():
+                words = keyword.split()
+                if len(words) > 1:
+                    add("_".join(words), module_id, weight)
+                    add("-".join(words), module_id, weight)
+                for word in words:
+                    add(word, module_id, weight / len(words))
+            for context in triggers.contexts:
+                add(context, module_id, CONTEXT_WEIGHT)
+            for pattern in triggers.patterns:
+                key = (module_id, pattern.regex)
+                try:
+                    self.patterns[key] = (re.compile(pattern.regex, re.IGNORECASE | re.MULTILINE), pattern.confidence)
+                except re.error as e:
+                    logger.warning(f"Skipping trigger pattern {pattern.regex!r} of {module_id}: {e}")
+                    continue
+                literals = required_literals(pattern.regex)
+                if literals is None:
+                    self.unindexed.append(key)
+                else:
+                    for literal in literals:
+                        self.by_literal.setdefault(literal, []).append(key)
+
+        # Heaviest first within a term, so bounds are the first entry
+        self.postings: Dict[str, List[Tuple[str, float]]] = {
+            term: sorted(entries.items(), key=lambda entry: -entry[1]) for term, entries in postings.items()
+        }
+        self.forward: Dict[str, Dict[str, float]] = {}
+        for term, entries in self.postings.items():
+            for module_id, weight in entries:
+                self.forward.setdefault(module_id, {})[term] = weight
+        # The lookahead reports every position where a literal starts, but
+        # only the longest one there; the shorter ones are its prefixes
+        self.by_hit: Dict[str, List[PatternKey]] = {
+            literal: [
+                key
+                for length in range(MIN_LITERAL, len(literal) + 1)
+                for key in self.by_literal.get(literal[:length], ())
+            ]
+            for literal in self.by_literal
+        }
+        literals = sorted(self.by_literal, key=len, reverse=True)
+        self.scanner = (
+            re.compile("(?=(" + "|".join(map(re.escape, literals)) + "))", re.IGNORECASE) if literals else None
+        )
+
+    def match(self, text: str, start: int = 0) -> Set[PatternKey]:
+        """Regex triggers matching text from start"""
+        keys = set(self.unindexed)
+        if self.scanner is not None:
+            for literal in set(self.scanner.findall(text, start)):
+                keys.update(self.by_hit.get(literal.lower(), ()))
+        return {key for key in keys if self.patterns[key][0].search(text, start)}
+
+    def top(
+        self,
+        terms: Dict[str, float],
+        matched: Iterable[PatternKey] = (),
+        k: int = 5,
+    ) -> List[Tuple[str, float]]:
+        """The k best (module, score) pairs; scores are exact for those returned"""
+        scores: Dict[str, float] = {}
+        for key in matched:
+            entry = self.patterns.get(key)
+            if entry is not None:
+                scores[key[0]] = scores.get(key[0], 0.0) + entry[1]
+
+        order = sorted(
+            ((weight * self.postings[term][0][1], term, weight) for term, weight in terms.items() if term in self.postings),
+            reverse=True,
+        )
+        rest = sum(bound for bound, _, _ in order)
+        for position, (bound, term, weight) in enumerate(order):
+            if len(scores) >= k:
+                threshold = heapq.nlargest(k, scores.values())[-1]
+                if rest <= threshold:
+                    # No module outside the candidates can reach the top k;
+                    # finish those that still can from the forward index
+                    scores = {m: s for m, s in scores.items() if s + rest >= threshold}
+                    for _, later, later_weight in order[position:]:
+                        for module_id in scores:
+                            scores[module_id] += later_weight * self.forward.get(module_id, {}).get(later, 0.0)
+                    break
+            for module_id, term_weight in self.postings[term]:
+                scores[module_id] = scores.get(module_id, 0.0) + weight * term_weight
+            rest -= bound
+        best = heapq.nsmallest(k, ((m, s) for m, s in scores.items() if s > 0), key=lambda item: (-item[1], item[0]))
+        return [(module_id, round(score, 3)) for module_id, score in best]
+
+
+class ModuleSuggester:
+    """Top-k registered modules for a context, from a SuggestionIndex kept current"""
+
+    def __init__(self, registry: ModuleRegistry, max_results: int = 5):
+        self.registry = registry
+        self.max_results = max_results
+        self._index: Optional[SuggestionIndex] = None
+        self._version = None
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    @property
+    def index(self) -> SuggestionIndex:
+        version = self.registry.trigger_version
+        index = self._index
+        if index is None or self._version != version:
+            with self._lock:
+                if self._index is None or self._version != version:
+                    self._index = SuggestionIndex(self.registry)
+                    self._version = version
+                    self.rebuilds += 1
+                index = self._index
+        return index
+
+    def match(self, text: str, start: int = 0) -> Set[PatternKey]:
+        return self.index.match(text, start)
+
+    def suggest(
+        self,
+        terms: Dict[str, float],
+        text: Optional[str] = None,
+        matched: Iterable[PatternKey] = (),
+        k: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Score terms (keyword or context -> query weight) and regex hits in text"""
+        index = self.index
+        if text:
+            matched = set(matched) | index.match(text)
+        return index.top(terms, matched, self.max_results if k is None else k)
@@ -0,0 +1,134 @@
+"""Context tables - stopwords and domain/intent vocabularies
+
+The built-in tables cover the context types in the architecture docs; a
+YAML file (settings.context_tables) can replace any of them:
+
+    stopwords: [the, a, ...]
+    domains:
+      programming:
+        keywords: [python, code, debug]
+        modules: [python_expertise]
+    intents:
+      assistance: [help, fix]
+
+Every vocabulary is compiled into one term -> (domains, intents) dict so
+the analyzer does a single lookup per distinct token.
+"""
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import yaml
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+me more most my myself no nor not now of off on once only or other our ours ourselves out over
+own same she should so some such than that the their theirs them themselves then there these they
+this those through to too under until up very was we were what when where which while who whom
+why will with would you your yours yourself yourselves let like get got need want please thanks
+thank really still yet ever also into onto via
+""".split())
+
+DOMAINS: Dict[str, Dict[str, List[str]]] = {
+    "programming": {
+        "keywords": [
+            "python", "code", "coding", "debug", "debugging", "bug", "bugs", "function", "script",
+            "program", "programming", "compile", "compiler", "error", "exception", "stacktrace",
+            "traceback", "api", "class", "method", "variable", "refactor", "test", "tests",
+            "javascript", "typescript", "java", "rust", "golang", "sql", "database", "git",
+            "library", "package", "module", "algorithm", "syntax", "runtime", "deploy", "server",
+        ],
+        "modules": ["python_expertise", "debugging_tools"],
+    },
+    "creative": {
+        "keywords": [
+            "creative", "story", "stories", "poem", "poetry", "novel", "character", "characters",
+            "plot", "fiction", "narrative", "brainstorm", "ideas", "lyrics", "screenplay",
+            "chapter", "write", "writing", "imagine",
+        ],
+        "modules": ["creative_writing"],
+    },
+    "technical_support": {
+        "keywords": [
+            "install", "installation", "troubleshoot", "crash", "crashes", "broken", "printer",
+            "network", "wifi", "driver", "reboot", "settings", "configure", "configuration",
+            "update", "upgrade",
+        ],
+        "modules": [],
+    },
+    "learning": {
+        "keywords": [
+            "learn", "learning", "tutorial", "course", "lesson", "concept", "concepts", "study",
+            "teach", "beginner", "introduction", "basics",
+        ],
+        "modules": [],
+    },
+    "analysis": {
+        "keywords": [
+            "analyze", "analysis", "data", "dataset", "statistics", "statistical", "research",
+            "investigate", "compare", "trend", "trends", "metrics", "report", "chart",
+        ],
+        "modules": [],
+    },
+}
+
+INTENTS: Dict[str, List[str]] = {
+    "assistance": ["help", "assist", "fix", "solve", "support", "troubleshoot", "stuck"],
+    "creation": ["create", "build", "make", "generate", "implement", "design", "write", "draft"],
+    "explanation": ["explain", "understand", "describe", "clarify", "meaning", "difference"],
+    "review": ["review", "check", "improve", "optimize", "critique", "feedback"],
+}
+
+
+class ContextTablesError(Exception):
+    pass
+
+
+class ContextTables:
+    """Compiled lookup tables for the context analyzer"""
+
+    def __init__(
+        self,
+        stopwords: Optional[List[str]] = None,
+        domains: Optional[Dict[str, Dict[str, List[str]]]] = None,
+        intents: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.stopwords: FrozenSet[str] = frozenset(w.lower() for w in stopwords) if stopwords is not None else STOPWORDS
+        self.domains = domains if domains is not None else DOMAINS
+        self.intents = intents if intents is not None else INTENTS
+        self.domain_modules: Dict[str, List[str]] = {
+            name: list(spec.get("modules") or []) for name, spec in self.domains.items()
+        }
+        collected: Dict[str, Tuple[List[str], List[str]]] = {}
+        for name, spec in self.domains.items():
+            for term in spec.get("keywords") or []:
+                collected.setdefault(term.lower(), ([], []))[0].append(name)
+        for name, vocabulary in self.intents.items():
+            for term in vocabulary:
+                collected.setdefault(term.lower(), ([], []))[1].append(name)
+        # term -> (domains, intents)
+        self.terms: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+            term: (tuple(d), tuple(i)) for term, (d, i) in collected.items()
+        }
+        # Ties go to whichever is listed first
+        self.domain_order = {name: n for n, name in enumerate(self.domains)}
+        self.intent_order = {name: n for n, name in enumerate(self.intents)}
+
+    @classmethod
+    def load(cls, path: Path) -> "ContextTables":
+        """Tables from a YAML file; sections it leaves out keep their defaults"""
+        try:
+            raw = yaml.safe_load(Path(path).read_text()) or {}
+        except (OSError, yaml.YAMLError) as e:
+            raise ContextTablesError(f"Cannot read context tables {path}: {e}") from e
+        if not isinstance(raw, dict):
+            raise ContextTablesError(f"Context tables {path} must be a mapping")
+        domains = raw.get("domains")
+        if domains is not None:
+            # A bare list is just the keywords
+            domains = {
+                name: spec if isinstance(spec, dict) else {"keywords": list(spec or [])}
+                for name, spec in domains.items()
+            }
+        return cls(raw.get("stopwords"), domains, raw.get("intents"))
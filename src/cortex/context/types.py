@@ -0,0 +1,26 @@
+"""Context analysis types"""
+from dataclasses import dataclass, field, replace
+from typing import Dict, List
+
+
+@dataclass
+class Context:
+    raw_input: str
+    keywords: List[str]
+    domain: str
+    intent: str
+    confidence: float
+    patterns: List[str] = field(default_factory=list)
+    suggested_modules: List[str] = field(default_factory=list)
+    domain_scores: Dict[str, float] = field(default_factory=dict)
+    module_scores: Dict[str, float] = field(default_factory=dict)  # registered modules suggested
+
+    def copy(self) -> "Context":
+        return replace(
+            self,
+            keywords=list(self.keywords),
+            patterns=list(self.patterns),
+            suggested_modules=list(self.suggested_modules),
+            domain_scores=dict(self.domain_scores),
+            module_scores=dict(self.module_scores),
+        )
@@ -1,4 +1,6 @@
 """Cortex configuration"""
+from typing import List, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -13,7 +15,60 @@ class Settings(BaseSettings):
     # Storage paths
     storage_path: str = "/Users/bard/Code/cortex_2/storage"
     module_path: str = "/Users/bard/Code/cortex_2/modules"
+    module_search_paths: List[str] = ["/Users/bard/Code/cortex_2/modules", "~/.cortex/modules"]
+    module_watch_interval: float = 1.0
+    module_auto_load: bool = True
+    module_warmup_concurrency: int = 2
+    module_load_workers: int = 4
     
+    # Hot tier (storage.hot_size in config/cortex.yaml)
+    storage_hot_size: int = 50000
+    storage_hot_eviction: str = "lru"  # lru, lfu or priority
+    storage_hot_admission: str = "none"  # none or tinylfu
+    storage_hot_stripes: int = 16
+    storage_warm_dir: str = "./storage/warm"  # storage.warm_directory
+    storage_cold_dir: str = "./storage/cold"  # storage.cold_directory
+    storage_cold_repack_interval: float = 300.0
+    storage_cold_decode_workers: int = 2  # processes decompressing cold loads; 0 decodes inline
+    storage_cold_decode_concurrency: int = 2
+    # Optional Redis shared by all instances in front of the local warm tier
+    storage_warm_redis_url: Optional[str] = None  # e.g. redis://localhost:6379/0
+    storage_warm_redis_pool_size: int = 16
+    storage_warm_redis_ttl: int = 86400
+
+    # Event bus
+    events_queue_size: int = 1024  # per subscriber
+    events_overflow: str = "drop_oldest"  # block, drop_oldest or drop_newest
+    events_history_size: int = 4096
+    events_spill_dir: Optional[str] = None  # spill large event payloads here
+    events_stream_buffer: int = 256  # frames per WebSocket client
+    events_stream_slow_consumer: str = "drop"  # drop (downsample) or disconnect
+    events_stream_max_clients: int = 100
+    events_broker_socket: Optional[str] = None  # Unix socket relaying events between workers
+    events_broker_topics: List[str] = [  # registry invalidations; other workers rescan on them
+        "module_registered", "module_unregistered", "module_updated", "dependency_updated",
+    ]
+
+    # Context analysis
+    context_tables: Optional[str] = None  # YAML replacing the built-in stopword/domain/intent tables
+    context_max_keywords: int = 20
+    context_max_chars: int = 1_000_000  # per text
+    context_batch_max_items: int = 1000
+    context_cache_size: int = 1024  # analyses memoized; 0 disables
+    context_cache_ttl: float = 300.0
+    context_stream_confidence: float = 0.95  # streamed analysis stops reading once this confident
+    context_stream_max_seconds: float = 1.0
+    context_session_half_life: float = 600.0  # seconds for a pushed keyword's weight to halve
+    context_session_idle_ttl: float = 3600.0
+    context_max_sessions: int = 10_000
+    context_suggest_max: int = 5  # registered modules suggested per context
+
+    # Background tier migration
+    migration_interval: float = 10.0
+    migration_hot_idle: float = 900.0  # seconds unused before hot -> warm
+    migration_warm_idle: float = 86400.0  # seconds unused before warm -> cold
+    migration_io_bytes_per_sec: int = 8 * 1024 * 1024
+
     # Memory limits
     memory_limit_tokens: int = 100000
     memory_buffer_tokens: int = 5000
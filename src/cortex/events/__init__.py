@@ -0,0 +1,7 @@
+"""Event system"""
+from .broker import Broker, BrokerError, BrokerLink
+from .bus import AsyncEventBus, OverflowPolicy, Subscription
+from .coalesce import CoalescePolicy, CountSummary, LastValue, MicroBatch, make_coalescer
+from .history import EventHistory, EventRecord
+from .stream import EventStream, StreamClient
+from .topics import TopicTrie, is_wildcard, matches
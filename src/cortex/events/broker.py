@@ -0,0 +1,330 @@
+"""Event Broker - relay bus events between worker processes
+
+With several uvicorn workers each process has its own registry, tiers
+and event bus. A BrokerLink in every worker forwards selected local
+topics (registry invalidation events by default) to a broker over a
+Unix domain socket, and emits what the other workers sent on its own bus
+as remote events. A worker acts on remote invalidations by rescanning
+its module paths; load, unload and eviction events describe another
+worker's own tiers, so relaying those topics only mirrors them onto the
+local bus, e.g. for /events clients.
+
+The broker is whichever process holds an flock on "<socket>.lock": a
+sidecar started with `cortex broker <socket>`, or else
+the first worker to take it. The lock goes away with its process, so
+when the broker dies its links reconnect and one of them takes over.
+
+A frame is a 4-byte big-endian length and a msgpack list of
+[event, data] pairs. Links batch everything emitted within
+flush_interval into one frame, and the broker forwards each frame's
+bytes to every other peer without decoding them.
+"""
+import asyncio
+import fcntl
+import functools
+import logging
+import os
+import random
+import struct
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..storage.codec import pack, unpack
+from .bus import AsyncEventBus
+from .topics import is_wildcard
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+
+# Registry changes: other workers rescan instead of waiting for their next poll
+INVALIDATION_EVENTS = ("module_registered", "module_unregistered", "module_updated", "dependency_updated")
+
+
+class BrokerError(Exception):
+    pass
+
+
+def encode_frame(messages: List[Any]) -> bytes:
+    payload = pack(messages)
+    return HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Payload of the next frame; IncompleteReadError once the peer is gone"""
+    (length,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if length > MAX_FRAME:
+        raise BrokerError(f"Frame of {length} bytes exceeds {MAX_FRAME}")
+    return await reader.readexactly(length)
+
+
+def try_lock(path: Path) -> Optional[int]:
+    """Take the broker lock without waiting; held until the returned fd is closed"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+class Broker:
+    """Forwards each frame from one peer to all the others"""
+
+    def __init__(self, path: Path, max_peer_buffer: int = 4 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_peer_buffer = max_peer_buffer
+        self.peers: Set[asyncio.StreamWriter] = set()
+        self._connections: Set[asyncio.Task] = set()
+        self.frames = 0
+        self.peers_dropped = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        # Only the lock holder gets here, so a socket file left behind is stale
+        self.path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._serve, path=str(self.path))
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.peers.add(writer)
+        self._connections.add(asyncio.current_task())
+        try:
+            while True:
+                payload = await read_frame(reader)
+                self.frames += 1
+                frame = HEADER.pack(len(payload)) + payload
+                for peer in list(self.peers):
+                    if peer is not writer:
+                        self._send(peer, frame)
+        except BrokerError as e:
+            logger.warning(f"Dropping event broker peer: {e}")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(asyncio.current_task())
+            self.peers.discard(writer)
+            writer.close()
+
+    def _send(self, peer: asyncio.StreamWriter, frame: bytes) -> None:
+        if peer.transport.get_write_buffer_size() > self.max_peer_buffer:
+            # Disconnected, the worker reconnects and rescans rather than falling further behind
+            logger.warning("Dropping event broker peer that stopped reading")
+            self.peers_dropped += 1
+            self.peers.discard(peer)
+            peer.close()
+            return
+        peer.write(frame)
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        # Closed transports end each handler with an EOF
+        for peer in list(self.peers):
+            peer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        self.path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"peers": len(self.peers), "frames": self.frames, "peers_dropped": self.peers_dropped}
+
+
+class BrokerLink:
+    """One worker's connection to the broker, becoming the broker if there is none
+
+    on_remote(event, data) is called for every event received from
+    another worker, after it has been emitted on the local bus.
+    """
+
+    def __init__(
+        self,
+        bus: AsyncEventBus,
+        path: Path,
+        topics: Iterable[str] = INVALIDATION_EVENTS,
+        on_remote: Optional[Callable[[str, Any], None]] = None,
+        flush_interval: float = 0.005,
+        batch_size: int = 1000,
+        max_pending: int = 10000,
+        retry_interval: float = 0.5,
+    ):
+        self.bus = bus
+        self.path = Path(path)
+        self.lock_path = Path(f"{path}.lock")
+        self.topics = list(topics)
+        self.on_remote = on_remote
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self.broker: Optional[Broker] = None
+        self.connected = False
+        self.sent_frames = 0
+        self.sent_events = 0
+        self.received_events = 0
+        self.dropped = 0
+        self._pending: Deque[Tuple[str, Any]] = deque(maxlen=max_pending)
+        self._wakeup = asyncio.Event()
+        self._handlers: List[Tuple[str, Callable]] = []
+        self._lock_fd: Optional[int] = None
+
+    @property
+    def role(self) -> str:
+        if self.broker is not None:
+            return "broker"
+        return "worker" if self.connected else "disconnected"
+
+    # Outgoing
+
+    def _subscribe(self) -> None:
+        for topic in self.topics:
+            # Exact subscriptions are not told the event name
+            handler = self._forward if is_wildcard(topic) else functools.partial(self._forward, topic)
+            self.bus.on(topic, handler, priority=-100, local_only=True)
+            self._handlers.append((topic, handler))
+
+    def _unsubscribe(self) -> None:
+        for topic, handler in self._handlers:
+            self.bus.off(topic, handler)
+        self._handlers = []
+
+    def _forward(self, event: str, data: Any) -> None:
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1  # oldest goes; the peers' watchers still poll
+        self._pending.append((event, data))
+        self._wakeup.set()
+
+    def _next_frame(self) -> Tuple[Optional[bytes], int]:
+        """Encode up to batch_size pending events; (frame, events in it)"""
+        batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+        try:
+            return encode_frame(batch), len(batch)
+        except (TypeError, ValueError):
+            pass
+        # Rare: keep the messages that do serialize
+        kept = []
+        for message in batch:
+            try:
+                pack(message)
+            except (TypeError, ValueError) as e:
+                self.dropped += 1
+                logger.warning(f"Not relaying {message[0]} to other workers: {e}")
+                continue
+            kept.append(message)
+        return (encode_frame(kept) if kept else None), len(kept)
+
+    async def _send_loop(self, writer: asyncio.StreamWriter) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Let the rest of a burst arrive so it goes out as one frame
+            await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            while self._pending:
+                frame, count = self._next_frame()
+                if frame is None:
+                    continue
+                writer.write(frame)
+                await writer.drain()
+                self.sent_frames += 1
+                self.sent_events += count
+
+    # Incoming
+
+    async def _receive_loop(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            for event, data in unpack(await read_frame(reader)):
+                self.received_events += 1
+                self.bus.emit(event, data, remote=True)
+                if self.on_remote is not None:
+                    try:
+                        self.on_remote(event, data)
+                    except Exception as e:
+                        logger.error(f"Remote event callback failed on {event}: {e}")
+
+    # Connection
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.broker is None:
+            fd = try_lock(self.lock_path)
+            if fd is not None:
+                broker = Broker(self.path)
+                try:
+                    await broker.start()
+                except OSError:
+                    os.close(fd)
+                    raise
+                self.broker, self._lock_fd = broker, fd
+                logger.info(f"Elected event broker on {self.path} (pid {os.getpid()})")
+        return await asyncio.open_unix_connection(str(self.path))
+
+    async def run(self) -> None:
+        """Relay events until cancelled, reconnecting (and re-electing) as needed"""
+        self._subscribe()
+        try:
+            while True:
+                try:
+                    reader, writer = await self._connect()
+                except OSError as e:
+                    logger.debug(f"Event broker not reachable at {self.path}: {e}")
+                    await asyncio.sleep(self.retry_interval)
+                    continue
+                self.connected = True
+                if self._pending:
+                    self._wakeup.set()
+                sender = asyncio.create_task(self._send_loop(writer))
+                receiver = asyncio.create_task(self._receive_loop(reader))
+                try:
+                    done, _ = await asyncio.wait([sender, receiver], return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    self.connected = False
+                    for task in (sender, receiver):
+                        task.cancel()
+                    await asyncio.gather(sender, receiver, return_exceptions=True)
+                    writer.close()
+                reason = next((repr(t.exception()) for t in done if not t.cancelled() and t.exception()), "closed")
+                logger.warning(f"Lost the event broker at {self.path} ({reason}); reconnecting")
+                # Stagger the workers so the election is not a stampede
+                await asyncio.sleep(self.retry_interval * random.random())
+        finally:
+            self._unsubscribe()
+            await self._resign()
+
+    async def _resign(self) -> None:
+        if self.broker is not None:
+            await self.broker.close()
+            self.broker = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "role": self.role,
+            "socket": str(self.path),
+            "pending": len(self._pending),
+            "sent_frames": self.sent_frames,
+            "sent_events": self.sent_events,
+            "received_events": self.received_events,
+            "dropped": self.dropped,
+            "broker": self.broker.stats() if self.broker is not None else None,
+        }
+
+
+async def serve(path: Path) -> None:
+    """Run a standalone broker until cancelled"""
+    path = Path(path)
+    fd = try_lock(Path(f"{path}.lock"))
+    if fd is None:
+        raise BrokerError(f"Another event broker already serves {path}")
+    broker = Broker(path)
+    await broker.start()
+    logger.info(f"Event broker listening on {path}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await broker.close()
+        os.close(fd)
+
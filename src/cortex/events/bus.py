@@ -0,0 +1,340 @@
+"""Async Event Bus - bounded per-subscriber queues
+
+Every subscription gets its own bounded queue drained by its own task,
+so handlers run concurrently and a slow subscriber only ever backs up
+its own queue. emit() is synchronous, never waits and may be called from
+any thread (module loads run on worker threads); publish() is the async
+variant that honours the block overflow policy.
+
+Subscriptions may use wildcard patterns (see topics.py). Each concrete
+event name resolves once to a priority-sorted dispatch plan that is
+cached until subscriptions change, so emit is a dict lookup however many
+patterns are registered. Given an EventHistory, every event is recorded
+with a sequence number and new subscribers can replay what they missed.
+
+Topics given a coalescing policy (see coalesce.py) are buffered on the
+emitting thread and handed to the loop once per window, so neither the
+loop nor the subscribers see the raw event rate.
+
+Events relayed from other workers (see broker.py) are emitted with
+remote=True: they skip coalescing, having been merged by their origin,
+and are not delivered to local_only subscriptions, which is how the
+relay avoids echoing them back.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .coalesce import CoalesceBuffer, CoalescePolicy, make_coalescer
+from .history import EventHistory
+from .topics import TopicTrie, is_wildcard
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(str, Enum):
+    """What a full subscriber queue does with a new event"""
+    BLOCK = "block"  # publish() waits for room
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+
+class Subscription:
+    """One handler's queue and the tasks draining it
+
+    Wildcard subscribers are called with (event, data), since the event
+    name is otherwise lost; exact ones with just data.
+    """
+
+    def __init__(
+        self,
+        event: str,
+        handler: Callable,
+        queue_size: int,
+        overflow: OverflowPolicy,
+        concurrency: int = 1,
+        priority: int = 0,
+        seq: int = 0,
+        local_only: bool = False,
+    ):
+        self.event = event
+        self.handler = handler
+        self.overflow = overflow
+        self.priority = priority
+        self.seq = seq
+        self.local_only = local_only
+        self.wants_event = is_wildcard(event)
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.replayed_through = 0  # live copies of replayed events are skipped
+        self._tasks = [asyncio.create_task(self._drain()) for _ in range(max(1, concurrency))]
+
+    @property
+    def name(self) -> str:
+        return getattr(self.handler, "__qualname__", repr(self.handler))
+
+    def offer(self, item: Tuple[int, str, Any]) -> None:
+        """Queue (seq, event, data) without waiting; a full queue sheds per the overflow policy"""
+        if item[0] and item[0] <= self.replayed_through:
+            return
+        if self.queue.full():
+            self.dropped += 1
+            if self.overflow != OverflowPolicy.DROP_OLDEST:
+                # drop_newest; emit() cannot wait, so block sheds the same way
+                return
+            self.queue.get_nowait()
+            self.queue.task_done()
+        self.queue.put_nowait(item)
+
+    async def put(self, item: Tuple[int, str, Any]) -> None:
+        if self.overflow == OverflowPolicy.BLOCK:
+            await self.queue.put(item)
+        else:
+            self.offer(item)
+
+    async def _drain(self) -> None:
+        while True:
+            _, event, data = await self.queue.get()
+            try:
+                result = self.handler(event, data) if self.wants_event else self.handler(data)
+                if asyncio.iscoroutine(result):
+                    await result
+                self.delivered += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Event handler {self.name} failed on {event}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "event": self.event,
+            "handler": self.name,
+            "overflow": self.overflow.value,
+            "priority": self.priority,
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+class AsyncEventBus:
+    """asyncio event bus with backpressure
+
+    Subscribe from the event loop; handlers may be plain functions or
+    coroutines. Higher priority subscribers are queued to first.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 1024,
+        overflow: Union[str, OverflowPolicy] = OverflowPolicy.DROP_OLDEST,
+        history: Optional[EventHistory] = None,
+    ):
+        self.queue_size = queue_size
+        self.overflow = OverflowPolicy(overflow)
+        self.history = history
+        self.subscribers: Dict[str, List[Subscription]] = {}
+        self.emitted = 0
+        self._trie: TopicTrie[Subscription] = TopicTrie()
+        self._plans: Dict[str, List[Subscription]] = {}
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._coalesce_trie: TopicTrie[Tuple[int, CoalescePolicy]] = TopicTrie()
+        self._coalesce_plans: Dict[str, Optional[CoalescePolicy]] = {}
+        self._buffers: Dict[str, CoalesceBuffer] = {}
+        self._buffers_lock = threading.Lock()
+        self.coalesced_in = 0
+        self.coalesced_out = 0
+
+    def on(
+        self,
+        event: str,
+        handler: Callable,
+        queue_size: Optional[int] = None,
+        overflow: Union[str, OverflowPolicy, None] = None,
+        concurrency: int = 1,
+        priority: int = 0,
+        replay_since: Optional[int] = None,
+        local_only: bool = False,
+    ) -> Subscription:
+        """Subscribe handler to an event name or pattern
+
+        concurrency > 1 lets the handler process events out of order.
+        With replay_since, recorded events after that sequence number are
+        queued first. local_only skips events relayed from other workers.
+        """
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(
+            event,
+            handler,
+            queue_size or self.queue_size,
+            OverflowPolicy(overflow) if overflow is not None else self.overflow,
+            concurrency,
+            priority,
+            next(self._seq),
+            local_only,
+        )
+        self.subscribers.setdefault(event, []).append(subscription)
+        self._trie.add(event, subscription)
+        self._plans.clear()
+        if replay_since is not None and self.history is not None:
+            for record in self.history.replay(replay_since, pattern=event):
+                subscription.offer((record.seq, record.event, record.data))
+                subscription.replayed_through = record.seq
+        return subscription
+
+    def off(self, event: str, handler: Callable) -> None:
+        for subscription in list(self.subscribers.get(event, [])):
+            if subscription.handler == handler:
+                subscription.cancel()
+                self.subscribers[event].remove(subscription)
+                self._trie.remove(event, subscription)
+        if not self.subscribers.get(event):
+            self.subscribers.pop(event, None)
+        self._plans.clear()
+
+    def clear(self, event: Optional[str] = None) -> None:
+        """Clear subscribers for an event or all events"""
+        for name in [event] if event else list(self.subscribers):
+            for subscription in self.subscribers.pop(name, []):
+                subscription.cancel()
+                self._trie.remove(name, subscription)
+        self._plans.clear()
+
+    def coalesce(self, pattern: str, policy: Union[str, CoalescePolicy], **kwargs: Any) -> CoalescePolicy:
+        """Merge events matching pattern, e.g. coalesce("resource.*", "last_value", window_ms=250)
+
+        When several patterns match an event, the latest registered wins.
+        """
+        if isinstance(policy, str):
+            policy = make_coalescer(policy, **kwargs)
+        self._coalesce_trie.add(pattern, (next(self._seq), policy))
+        self._coalesce_plans.clear()
+        return policy
+
+    def _coalescer(self, event: str) -> Optional[CoalescePolicy]:
+        try:
+            return self._coalesce_plans[event]
+        except KeyError:
+            matched = self._coalesce_trie.match(event)
+            policy = max(matched, key=lambda entry: entry[0])[1] if matched else None
+            self._coalesce_plans[event] = policy
+            return policy
+
+    def plan(self, event: str) -> List[Subscription]:
+        """Subscriptions matching event, highest priority first; memoized"""
+        plan = self._plans.get(event)
+        if plan is None:
+            plan = sorted(self._trie.match(event), key=lambda s: (-s.priority, s.seq))
+            self._plans[event] = plan
+        return plan
+
+    def _on_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def emit(self, event: str, data: Any = None, remote: bool = False) -> None:
+        """Queue an event for its subscribers without waiting; thread-safe"""
+        seq = self._record(event, data)
+        if self._loop is None or self._plans.get(event) == []:
+            return
+        policy = None if remote else self._coalescer(event)
+        if policy is not None:
+            self._buffer(policy, event, data)
+        elif self._on_loop():
+            self._offer(seq, event, data, remote)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._offer, seq, event, data, remote)
+
+    def _record(self, event: str, data: Any) -> int:
+        self.emitted += 1
+        return self.history.append(event, data) if self.history is not None else 0
+
+    def _offer(self, seq: int, event: str, data: Any, remote: bool = False) -> None:
+        for subscription in self.plan(event):
+            if not (remote and subscription.local_only):
+                subscription.offer((seq, event, data))
+
+    def _buffer(self, policy: CoalescePolicy, event: str, data: Any) -> None:
+        """Add to the event's open window, scheduling its flush; any thread"""
+        with self._buffers_lock:
+            self.coalesced_in += 1
+            buffer = self._buffers.get(event)
+            opened = buffer is None
+            if opened:
+                buffer = self._buffers[event] = CoalesceBuffer()
+            full = policy.add(buffer, data)
+        on_loop = self._on_loop()
+        if full:
+            if on_loop:
+                self._flush(policy, event, buffer)
+            else:
+                self._loop.call_soon_threadsafe(self._flush, policy, event, buffer)
+        elif opened:
+            if on_loop:
+                self._loop.call_later(policy.window, self._flush, policy, event, buffer)
+            else:
+                self._loop.call_soon_threadsafe(self._loop.call_later, policy.window, self._flush, policy, event, buffer)
+
+    def _flush(self, policy: CoalescePolicy, event: str, buffer: CoalesceBuffer) -> None:
+        with self._buffers_lock:
+            if self._buffers.get(event) is not buffer:
+                return  # already flushed early
+            del self._buffers[event]
+            self.coalesced_out += 1
+        # Merged events carry no sequence number; history holds the raw ones
+        self._offer(0, event, policy.result(buffer))
+
+    def flush(self) -> None:
+        """Deliver every open coalescing window now"""
+        with self._buffers_lock:
+            pending = list(self._buffers.items())
+        for event, buffer in pending:
+            self._flush(self._coalescer(event), event, buffer)
+
+    async def publish(self, event: str, data: Any = None) -> None:
+        """Queue an event, waiting for room in block-policy queues"""
+        seq = self._record(event, data)
+        policy = self._coalescer(event)
+        if policy is not None and self._loop is not None:
+            self._buffer(policy, event, data)
+            return
+        for subscription in self.plan(event):
+            await subscription.put((seq, event, data))
+
+    async def join(self) -> None:
+        """Wait until every queued event has been handled"""
+        for subscription in [s for subs in list(self.subscribers.values()) for s in subs]:
+            await subscription.queue.join()
+
+    async def close(self) -> None:
+        subscriptions = [s for subs in self.subscribers.values() for s in subs]
+        self.clear()
+        await asyncio.gather(*(t for s in subscriptions for t in s._tasks), return_exceptions=True)
+        if self.history is not None:
+            self.history.close()
+
+    def stats(self) -> Dict[str, Any]:
+        subscriptions = [s.stats() for subs in list(self.subscribers.values()) for s in subs]
+        return {
+            "emitted": self.emitted,
+            "dropped": sum(s["dropped"] for s in subscriptions),
+            "coalesced_in": self.coalesced_in,
+            "coalesced_out": self.coalesced_out,
+            "history": self.history.stats() if self.history is not None else None,
+            "subscriptions": subscriptions,
+        }
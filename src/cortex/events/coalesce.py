@@ -0,0 +1,91 @@
+"""Event Coalescing - merge high-frequency topics before fan-out
+
+A topic with a coalescing policy is buffered per event name for a window
+and delivered to subscribers as one merged event, so subscriber work
+follows the window rate rather than the raw event rate:
+
+- last_value: only the newest data
+- count: {"count", "first", "last", "window_ms"}
+- batch: a list of data, flushed early once max_items arrive
+"""
+from typing import Any, Dict, List, Type
+
+
+class CoalesceBuffer:
+    """Events collected for one event name during one window"""
+
+    __slots__ = ("items", "count")
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.count = 0
+
+
+class CoalescePolicy:
+    """Base policy: collect everything, flush after window_ms or max_items"""
+
+    name = "batch"
+
+    def __init__(self, window_ms: float = 100.0, max_items: int = 0):
+        self.window_ms = window_ms
+        self.window = window_ms / 1000
+        self.max_items = max_items
+
+    def add(self, buffer: CoalesceBuffer, data: Any) -> bool:
+        """Buffer data; True when the buffer should be flushed now"""
+        buffer.count += 1
+        buffer.items.append(data)
+        return bool(self.max_items) and buffer.count >= self.max_items
+
+    def result(self, buffer: CoalesceBuffer) -> Any:
+        return buffer.items
+
+
+class MicroBatch(CoalescePolicy):
+    pass
+
+
+class LastValue(CoalescePolicy):
+    name = "last_value"
+
+    def add(self, buffer: CoalesceBuffer, data: Any) -> bool:
+        buffer.count += 1
+        buffer.items[:] = [data]
+        return False
+
+    def result(self, buffer: CoalesceBuffer) -> Any:
+        return buffer.items[-1]
+
+
+class CountSummary(CoalescePolicy):
+    name = "count"
+
+    def add(self, buffer: CoalesceBuffer, data: Any) -> bool:
+        buffer.count += 1
+        if buffer.items:
+            buffer.items[1:] = [data]
+        else:
+            buffer.items.append(data)
+        return False
+
+    def result(self, buffer: CoalesceBuffer) -> Any:
+        return {
+            "count": buffer.count,
+            "first": buffer.items[0],
+            "last": buffer.items[-1],
+            "window_ms": self.window_ms,
+        }
+
+
+COALESCE_POLICIES: Dict[str, Type[CoalescePolicy]] = {
+    "last_value": LastValue,
+    "count": CountSummary,
+    "batch": MicroBatch,
+}
+
+
+def make_coalescer(name: str, **kwargs: Any) -> CoalescePolicy:
+    try:
+        return COALESCE_POLICIES[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown coalescing policy: {name}") from None
@@ -0,0 +1,231 @@
+"""Event History - fixed-capacity ring buffer with replay
+
+Keeps the last capacity events as compact records: an interned event
+name, a monotonic sequence number, a timestamp and the payload. With a
+spill directory, payloads of roughly spill_min_bytes or more are written
+to segment files (msgpack) and only their location is kept in memory; a
+segment is deleted once every record in it has been overwritten.
+
+append() only estimates a payload's size; packing and writing happen on
+a background writer thread, and a record keeps its payload in memory
+until the writer has put it on disk.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from ..storage.codec import pack, unpack
+from .topics import matches
+
+logger = logging.getLogger(__name__)
+
+
+def estimated_size(data: Any, limit: int) -> int:
+    """Rough serialized size of data, counted only until it reaches limit"""
+    size = 0
+    stack = [data]
+    while stack and size < limit:
+        item = stack.pop()
+        if isinstance(item, (str, bytes, bytearray)):
+            size += len(item)
+        elif isinstance(item, Mapping):
+            size += 1
+            for key, value in item.items():
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            size += 1
+            stack.extend(item)
+        else:
+            size += 8
+    return size
+
+
+class EventRecord:
+    """One recorded event; data is a (segment, offset, length) when spilled"""
+
+    __slots__ = ("seq", "timestamp", "event", "data", "spilled")
+
+    def __init__(self, seq: int, timestamp: float, event: str, data: Any, spilled: bool = False):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.event = event
+        self.data = data
+        self.spilled = spilled
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "timestamp": self.timestamp, "event": self.event, "data": self.data}
+
+
+class EventHistory:
+    """Thread-safe ring buffer of the most recent events"""
+
+    def __init__(self, capacity: int = 4096, spill_dir: Optional[Path] = None, spill_min_bytes: int = 1024):
+        self.capacity = max(1, capacity)
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.spill_min_bytes = spill_min_bytes
+        self._ring: List[Optional[EventRecord]] = [None] * self.capacity
+        self._next_seq = 1
+        self._lock = threading.Lock()
+        self._segments: Dict[int, Any] = {}  # segment number -> open file
+        self._segment_ends: Dict[int, int] = {}  # only touched by the writer
+        # Bounded like the ring: the oldest queued record is the next overwritten
+        self._spills: Deque[EventRecord] = deque(maxlen=self.capacity)
+        self._spilling = threading.Condition(self._lock)
+        self._writing = False
+        self._writer: Optional[threading.Thread] = None
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            for stale in self.spill_dir.glob("events-*.spill"):
+                stale.unlink()
+
+    def __len__(self) -> int:
+        return min(self._next_seq - 1, self.capacity)
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest sequence number still held"""
+        return max(1, self._next_seq - self.capacity)
+
+    @property
+    def last_seq(self) -> int:
+        return self._next_seq - 1
+
+    # Spilling
+
+    def _segment(self, seq: int) -> int:
+        return seq // self.capacity
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.spill_dir / f"events-{segment:08d}.spill"
+
+    def _queue_spill(self, record: EventRecord) -> None:
+        """Hand a large record to the writer; caller holds the lock"""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_spills, name="event-history-spill", daemon=True)
+            self._writer.start()
+        self._spills.append(record)
+        self._spilling.notify_all()
+
+    def _write_spills(self) -> None:
+        while True:
+            with self._lock:
+                self._writing = False
+                self._spilling.notify_all()
+                self._spilling.wait_for(lambda: self._spills or self._writer is None)
+                if not self._spills:
+                    return
+                record = self._spills.popleft()
+                self._writing = True
+            try:
+                self._spill(record)
+            except Exception as e:
+                logger.error(f"Spilling event {record.seq} failed: {e}")
+
+    def _spill(self, record: EventRecord) -> None:
+        """Write a record's payload to its segment, off the append path"""
+        if self._ring[record.seq % self.capacity] is not record:
+            return  # overwritten while queued
+        try:
+            payload = pack(record.data)
+        except (TypeError, ValueError):
+            return  # not serializable; keep it in memory
+        segment = self._segment(record.seq)
+        with self._lock:
+            f = self._segments.get(segment)
+            if f is None:
+                f = self._segments[segment] = open(self._segment_path(segment), "a+b", buffering=0)
+                self._segment_ends[segment] = 0
+                self._drop_segments_before(self._segment(self.first_seq))
+        offset = self._segment_ends[segment]
+        f.write(payload)
+        self._segment_ends[segment] = offset + len(payload)
+        with self._lock:
+            # A new record, since replay() may have handed this one out
+            if self._ring[record.seq % self.capacity] is record:
+                self._ring[record.seq % self.capacity] = EventRecord(
+                    record.seq, record.timestamp, record.event, (segment, offset, len(payload)), True
+                )
+
+    def _drop_segments_before(self, segment: int) -> None:
+        """Close and delete old segments; caller holds the lock"""
+        for old in [s for s in self._segments if s < segment]:
+            self._segments.pop(old).close()
+            self._segment_ends.pop(old, None)
+            self._segment_path(old).unlink(missing_ok=True)
+
+    def _load(self, record: EventRecord) -> Any:
+        segment, offset, length = record.data
+        f = self._segments.get(segment)
+        if f is None:
+            return None
+        return unpack(os.pread(f.fileno(), length, offset))
+
+    def flush(self) -> None:
+        """Wait until every queued payload is on disk"""
+        with self._lock:
+            self._spilling.wait_for(lambda: not self._spills and not self._writing)
+
+    # Recording and replay
+
+    def append(self, event: str, data: Any = None) -> int:
+        """Record an event; returns its sequence number"""
+        spill = self.spill_dir is not None and estimated_size(data, self.spill_min_bytes) >= self.spill_min_bytes
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            record = EventRecord(seq, time.time(), sys.intern(event), data)
+            self._ring[seq % self.capacity] = record
+            if spill:
+                self._queue_spill(record)
+        return seq
+
+    def replay(self, since: int = 0, pattern: Optional[str] = None, limit: Optional[int] = None) -> List[EventRecord]:
+        """Records after sequence number since, oldest first
+
+        pattern filters by topic (wildcards allowed). Records older than
+        first_seq have been overwritten; a caller whose since is below
+        first_seq - 1 has missed events.
+        """
+        results: List[EventRecord] = []
+        matched: Dict[str, bool] = {}
+        with self._lock:
+            for seq in range(max(since + 1, self.first_seq), self._next_seq):
+                record = self._ring[seq % self.capacity]
+                if pattern is not None:
+                    if record.event not in matched:
+                        matched[record.event] = matches(pattern, record.event)
+                    if not matched[record.event]:
+                        continue
+                if record.spilled:
+                    record = EventRecord(record.seq, record.timestamp, record.event, self._load(record))
+                results.append(record)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def close(self) -> None:
+        """Finish queued spills, stop the writer and delete the segments"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+            self._spilling.notify_all()
+        if writer is not None:
+            writer.join()
+        with self._lock:
+            self._drop_segments_before(sys.maxsize)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "size": len(self),
+                "first_seq": self.first_seq,
+                "last_seq": self.last_seq,
+                "spilled_segments": len(self._segments),
+            }
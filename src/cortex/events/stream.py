@@ -0,0 +1,183 @@
+"""Event Stream - fan event-bus topics out to WebSocket clients
+
+While any client is connected the stream holds one bus subscription
+("#"); with none, it costs the bus nothing. Each event is serialized to
+JSON once, and only if some client's topic filters match it; the same
+frame is then queued for every matching client. Clients have bounded
+send buffers drained by their own sender task, so one slow dashboard
+never delays the others or the bus. A client whose buffer overflows is
+downsampled (oldest frames dropped, with a notice) or disconnected.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .bus import AsyncEventBus, Subscription
+from .topics import TopicTrie
+
+logger = logging.getLogger(__name__)
+
+SLOW_CONSUMER_POLICIES = ("drop", "disconnect")
+# Close code for "try again later" (RFC 6455 registry)
+TRY_AGAIN_LATER = 1013
+
+
+class StreamClient:
+    """One WebSocket connection's filters and bounded send buffer"""
+
+    def __init__(self, websocket: Any, patterns: List[str], max_buffer: int):
+        self.websocket = websocket
+        self.patterns = patterns
+        self.max_buffer = max_buffer
+        self.buffer: Deque[str] = deque()
+        self.sent = 0
+        self.dropped = 0
+        self._unreported = 0
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.shed = False
+
+    def push(self, frame: str) -> bool:
+        """Queue a frame; False when the buffer was already full"""
+        overflow = len(self.buffer) >= self.max_buffer
+        if overflow:
+            self.buffer.popleft()
+            self.dropped += 1
+            self._unreported += 1
+        self.buffer.append(frame)
+        self._ready.set()
+        return not overflow
+
+    async def send_loop(self) -> None:
+        while not self.closed:
+            await self._ready.wait()
+            self._ready.clear()
+            while self.buffer and not self.closed:
+                if self._unreported:
+                    notice = json.dumps({"event": "stream.dropped", "data": {"count": self._unreported}})
+                    self._unreported = 0
+                    await self.websocket.send_text(notice)
+                await self.websocket.send_text(self.buffer.popleft())
+                self.sent += 1
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+
+class EventStream:
+    """WebSocket fan-out hub for one event bus"""
+
+    def __init__(
+        self,
+        bus: AsyncEventBus,
+        max_buffer: int = 256,
+        slow_consumer: str = "drop",
+        max_clients: int = 100,
+    ):
+        if slow_consumer not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {slow_consumer}")
+        self.bus = bus
+        self.max_buffer = max_buffer
+        self.slow_consumer = slow_consumer
+        self.max_clients = max_clients
+        self.clients: List[StreamClient] = []
+        self.serialized = 0
+        self.disconnected_slow = 0
+        self._sent = 0  # by clients already gone
+        self._dropped = 0
+        self._trie: TopicTrie[StreamClient] = TopicTrie()
+        self._plans: Dict[str, List[StreamClient]] = {}
+        self._subscription: Optional[Subscription] = None
+
+    def stop(self) -> None:
+        for client in list(self.clients):
+            client.close()
+            self._remove(client)
+
+    # Client registry
+
+    def _add(self, client: StreamClient) -> None:
+        if self._subscription is None:
+            self._subscription = self.bus.on("#", self._dispatch, priority=-100)
+        self.clients.append(client)
+        for pattern in client.patterns:
+            self._trie.add(pattern, client)
+        self._plans.clear()
+
+    def _remove(self, client: StreamClient) -> None:
+        if client in self.clients:
+            self.clients.remove(client)
+            self._sent += client.sent
+            self._dropped += client.dropped
+            for pattern in client.patterns:
+                self._trie.remove(pattern, client)
+            self._plans.clear()
+        if not self.clients and self._subscription is not None:
+            self.bus.off("#", self._dispatch)
+            self._subscription = None
+
+    def _plan(self, event: str) -> List[StreamClient]:
+        plan = self._plans.get(event)
+        if plan is None:
+            plan = self._plans[event] = self._trie.match(event)
+        return plan
+
+    # Fan-out
+
+    def _dispatch(self, event: str, data: Any) -> None:
+        clients = self._plan(event)
+        if not clients:
+            return
+        frame = json.dumps({"event": event, "data": data, "timestamp": time.time()}, default=str)
+        self.serialized += 1
+        for client in clients:
+            if not client.push(frame) and self.slow_consumer == "disconnect":
+                self._shed(client)
+
+    def _shed(self, client: StreamClient) -> None:
+        logger.warning(f"Disconnecting slow event stream client after {client.dropped} dropped frames")
+        self.disconnected_slow += 1
+        client.shed = True
+        client.close()
+        self._remove(client)
+
+    async def serve(self, websocket: Any, patterns: List[str]) -> None:
+        """Stream matching events to an accepted WebSocket until it disconnects"""
+        if len(self.clients) >= self.max_clients:
+            await websocket.close(code=TRY_AGAIN_LATER)
+            return
+        client = StreamClient(websocket, patterns or ["#"], self.max_buffer)
+        self._add(client)
+        sender = asyncio.create_task(client.send_loop())
+        receiver = asyncio.create_task(self._receive_until_closed(websocket))
+        try:
+            await asyncio.wait([sender, receiver], return_when=asyncio.FIRST_COMPLETED)
+            if client.shed:
+                await websocket.close(code=TRY_AGAIN_LATER)
+        finally:
+            client.close()
+            self._remove(client)
+            # Not awaited: the server may be cancelling this handler
+            for task in (sender, receiver):
+                task.cancel()
+
+    @staticmethod
+    async def _receive_until_closed(websocket: Any) -> None:
+        # Clients do not send anything yet; this only notices disconnects
+        while True:
+            message = await websocket.receive()
+            if message.get("type") == "websocket.disconnect":
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self.clients),
+            "serialized": self.serialized,
+            "sent": self._sent + sum(c.sent for c in self.clients),
+            "dropped": self._dropped + sum(c.dropped for c in self.clients),
+            "disconnected_slow": self.disconnected_slow,
+        }
@@ -0,0 +1,89 @@
+"""Topic Trie - hierarchical wildcard subscriptions
+
+Topics are dot-separated segments (``module.loaded``). In a pattern, ``*``
+matches exactly one segment and ``#`` matches zero or more, so
+``module.*`` catches ``module.loaded`` and ``#`` catches everything.
+Matching walks the trie once per topic instead of testing every pattern.
+"""
+from typing import Dict, Generic, List, Set, TypeVar
+
+T = TypeVar("T")
+
+SEPARATOR = "."
+ONE = "*"
+ANY = "#"
+
+
+def is_wildcard(pattern: str) -> bool:
+    return any(segment in (ONE, ANY) for segment in pattern.split(SEPARATOR))
+
+
+def matches(pattern: str, topic: str) -> bool:
+    """Whether a single pattern matches topic"""
+    trie: "TopicTrie[bool]" = TopicTrie()
+    trie.add(pattern, True)
+    return bool(trie.match(topic))
+
+
+class _Node(Generic[T]):
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node[T]"] = {}
+        self.values: List[T] = []
+
+
+class TopicTrie(Generic[T]):
+    """Values stored under patterns, looked up by concrete topic"""
+
+    def __init__(self):
+        self.root: _Node[T] = _Node()
+
+    def add(self, pattern: str, value: T) -> None:
+        node = self.root
+        for segment in pattern.split(SEPARATOR):
+            node = node.children.setdefault(segment, _Node())
+        node.values.append(value)
+
+    def remove(self, pattern: str, value: T) -> bool:
+        path = [self.root]
+        segments = pattern.split(SEPARATOR)
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return False
+            path.append(node)
+        if value not in path[-1].values:
+            return False
+        path[-1].values.remove(value)
+        # Prune branches left empty
+        for segment, parent, node in reversed(list(zip(segments, path, path[1:]))):
+            if node.values or node.children:
+                break
+            del parent.children[segment]
+        return True
+
+    def match(self, topic: str) -> List[T]:
+        """Values of every pattern matching topic, each once"""
+        segments = topic.split(SEPARATOR)
+        found: List[T] = []
+        seen: Set[int] = set()
+        self._walk(self.root, segments, 0, found, seen)
+        return found
+
+    def _walk(self, node: _Node[T], segments: List[str], i: int, found: List[T], seen: Set[int]) -> None:
+        any_node = node.children.get(ANY)
+        if any_node is not None:
+            # '#' absorbs segments i..j for every j, including none
+            for j in range(i, len(segments) + 1):
+                self._walk(any_node, segments, j, found, seen)
+        if i == len(segments):
+            for value in node.values:
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    found.append(value)
+            return
+        for key in (segments[i], ONE):
+            child = node.children.get(key)
+            if child is not None:
+                self._walk(child, segments, i + 1, found, seen)
@@ -0,0 +1,16 @@
+"""Module system"""
+from .content import ContentStore, DedupReport
+from .index import InvalidCursorError, ModuleIndex
+from .loader import HasDependentsError, InsufficientMemoryError, ModuleLoader, ModuleNotLoadedError
+from .manifest import ManifestError, parse_manifest
+from .migration import DemandPredictor, TierMigrator, TokenBucket
+from .registry import (
+    CircularDependencyError,
+    ModuleAlreadyExistsError,
+    ModuleNotFoundError,
+    ModuleRegistry,
+)
+from .scheduler import LoadDroppedError, LoadScheduler
+from .types import ModuleManifest, ModuleRecord, ModuleStats, ModuleStatus, ModuleTriggers, ModuleType, TriggerPattern
+from .warmup import ModuleWarmup
+from .watcher import ModuleWatcher
@@ -0,0 +1,167 @@
+"""Content-addressed store for parsed module files
+
+Files are keyed by a hash of their bytes, so identical files shipped by
+several modules (or kept across versions of one module) are parsed once
+and shared. Shared data is frozen to keep one module from mutating
+another's view. Lower storage tiers keep each file's digest beside its
+content, so a copy restored from them is interned under the same key
+and shares the entry of any module that read the file from disk.
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def freeze(value: Any) -> Any:
+    """Deep-convert parsed JSON into read-only structures"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of freeze, for serializers that want plain containers"""
+    if isinstance(value, MappingProxyType):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+def parse_content(raw: bytes, suffix: str) -> Any:
+    if suffix == ".json":
+        return freeze(json.loads(raw))
+    return raw.decode("utf-8")
+
+
+@dataclass
+class ContentEntry:
+    digest: str
+    data: Any
+    size: int
+    refs: int = 0
+
+
+@dataclass
+class DedupReport:
+    files: int
+    unique_files: int
+    logical_bytes: int
+    stored_bytes: int
+    bytes_saved: int
+    dedup_ratio: float
+    parses: int
+    hits: int
+
+
+class ContentStore:
+    """Parsed content shared by digest, reference counted per (owner, file)"""
+
+    def __init__(self):
+        self.entries: Dict[str, ContentEntry] = {}
+        self.refs: Dict[Tuple[str, str], str] = {}  # (owner, relative path) -> digest
+        self._owned: Dict[str, Set[str]] = {}  # owner -> relative paths
+        self.parses = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def load(self, owner: str, relative: str, path: Path) -> Any:
+        """Return parsed content for path, parsing only unseen bytes
+
+        Safe to call from worker threads; reading and parsing happen
+        outside the lock.
+        """
+        raw = path.read_bytes()
+        digest = content_digest(raw)
+        with self._lock:
+            entry = self.entries.get(digest)
+        if entry is None:
+            parsed = ContentEntry(digest, parse_content(raw, path.suffix), len(raw))
+            with self._lock:
+                entry = self.entries.setdefault(digest, parsed)
+                self.parses += entry is parsed
+        else:
+            with self._lock:
+                self.hits += 1
+
+        with self._lock:
+            # Re-fetch: the entry may have been released while unlocked
+            entry = self.entries.setdefault(digest, entry)
+            self._ref(owner, relative, entry)
+        return entry.data
+
+    def intern(self, owner: str, relative: str, digest: str, data: Any, size: int) -> Any:
+        """Share already-parsed content (e.g. restored from a lower tier) by its digest"""
+        with self._lock:
+            entry = self.entries.get(digest)
+            if entry is None:
+                entry = self.entries[digest] = ContentEntry(digest, freeze(data), size)
+            else:
+                self.hits += 1
+            self._ref(owner, relative, entry)
+        return entry.data
+
+    def _ref(self, owner: str, relative: str, entry: ContentEntry) -> None:
+        """Point (owner, relative) at entry; caller holds the lock"""
+        key = (owner, relative)
+        previous = self.refs.get(key)
+        if previous != entry.digest:
+            entry.refs += 1
+            self.refs[key] = entry.digest
+            self._owned.setdefault(owner, set()).add(relative)
+            if previous is not None:
+                self._decref(previous)
+
+    def get(self, digest: str) -> Any:
+        entry = self.entries.get(digest)
+        return entry.data if entry else None
+
+    def digest_of(self, owner: str, relative: str) -> str:
+        return self.refs[(owner, relative)]
+
+    def size_of(self, digest: str) -> int:
+        entry = self.entries.get(digest)
+        return entry.size if entry else 0
+
+    def release(self, owner: str, relative: Optional[str] = None) -> None:
+        """Drop an owner's reference to one file, or to all its files"""
+        with self._lock:
+            owned = self._owned.get(owner, set())
+            for rel in ([relative] if relative is not None else list(owned)):
+                owned.discard(rel)
+                digest = self.refs.pop((owner, rel), None)
+                if digest is not None:
+                    self._decref(digest)
+            if not owned:
+                self._owned.pop(owner, None)
+
+    def _decref(self, digest: str) -> None:
+        entry = self.entries[digest]
+        entry.refs -= 1
+        if entry.refs <= 0:
+            del self.entries[digest]
+
+    def report(self) -> DedupReport:
+        with self._lock:
+            logical = sum(self.entries[d].size for d in self.refs.values())
+            stored = sum(e.size for e in self.entries.values())
+        return DedupReport(
+            files=len(self.refs),
+            unique_files=len(self.entries),
+            logical_bytes=logical,
+            stored_bytes=stored,
+            bytes_saved=logical - stored,
+            dedup_ratio=logical / stored if stored else 1.0,
+            parses=self.parses,
+            hits=self.hits,
+        )
@@ -0,0 +1,175 @@
+"""Module index - facet sets and sort orders for listing modules
+
+Every facet (type, status, tag) maps to a set of module ids and every sort
+order is kept as a sorted list, so a listing page is read by seeking to
+the cursor and walking forward instead of scanning all records.
+"""
+import base64
+import json
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .types import ModuleRecord
+
+SORT_FIELDS = ("name", "size", "last_used")
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class _Facets:
+    type: str
+    status: str
+    tags: Tuple[str, ...]
+    names: Tuple[str, ...]
+    keys: Tuple[Tuple[Any, str], ...]  # one (sort key, id) per SORT_FIELDS entry
+
+
+def _facets(record: ModuleRecord) -> _Facets:
+    last_used = record.stats.last_used.timestamp() if record.stats.last_used else 0.0
+    return _Facets(
+        type=record.type,
+        status=record.status.value,
+        tags=tuple(sorted({tag.lower() for tag in record.manifest.tags})),
+        names=tuple(sorted({record.id.lower(), record.manifest.name.lower()})),
+        keys=((record.manifest.name.lower(), record.id), (record.size, record.id), (last_used, record.id)),
+    )
+
+
+def encode_cursor(key: Tuple[Any, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    try:
+        key, module_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+    return (key, module_id)
+
+
+class ModuleIndex:
+    """Registry-maintained indexes over module records"""
+
+    def __init__(self):
+        self.by_type: Dict[str, Set[str]] = {}
+        self.by_status: Dict[str, Set[str]] = {}
+        self.by_tag: Dict[str, Set[str]] = {}
+        self._names: List[Tuple[str, str]] = []  # sorted (lowercased id or name, id)
+        self._orders: Dict[str, List[Tuple[Any, str]]] = {f: [] for f in SORT_FIELDS}
+        self._facets: Dict[str, _Facets] = {}
+
+    def __len__(self) -> int:
+        return len(self._facets)
+
+    def update(self, record: ModuleRecord) -> None:
+        """Index a new record or re-index a changed one"""
+        new = _facets(record)
+        old = self._facets.get(record.id)
+        if old == new:
+            return
+        if old is not None:
+            self._drop(record.id, old)
+        self._facets[record.id] = new
+        self.by_type.setdefault(new.type, set()).add(record.id)
+        self.by_status.setdefault(new.status, set()).add(record.id)
+        for tag in new.tags:
+            self.by_tag.setdefault(tag, set()).add(record.id)
+        for name in new.names:
+            insort(self._names, (name, record.id))
+        for field, key in zip(SORT_FIELDS, new.keys):
+            insort(self._orders[field], key)
+
+    def remove(self, module_id: str) -> None:
+        old = self._facets.pop(module_id, None)
+        if old is not None:
+            self._drop(module_id, old)
+
+    def _drop(self, module_id: str, facets: _Facets) -> None:
+        for index, value in ((self.by_type, facets.type), (self.by_status, facets.status)):
+            index[value].discard(module_id)
+        for tag in facets.tags:
+            self.by_tag[tag].discard(module_id)
+        for name in facets.names:
+            del self._names[bisect_left(self._names, (name, module_id))]
+        for field, key in zip(SORT_FIELDS, facets.keys):
+            order = self._orders[field]
+            del order[bisect_left(order, key)]
+
+    def _prefix_ids(self, prefix: str) -> Set[str]:
+        prefix = prefix.lower()
+        ids = set()
+        for i in range(bisect_left(self._names, (prefix, "")), len(self._names)):
+            name, module_id = self._names[i]
+            if not name.startswith(prefix):
+                break
+            ids.add(module_id)
+        return ids
+
+    def query(
+        self,
+        type: Optional[str] = None,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        prefix: Optional[str] = None,
+        sort: str = "name",
+        descending: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[str], Optional[str]]:
+        """Return one page of module ids and the cursor for the next page"""
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort}")
+        filters = []
+        if type is not None:
+            filters.append(self.by_type.get(type, set()))
+        if status is not None:
+            filters.append(self.by_status.get(status, set()))
+        if tag is not None:
+            filters.append(self.by_tag.get(tag.lower(), set()))
+        if prefix:
+            filters.append(self._prefix_ids(prefix))
+
+        # Facet sets are shared, not copied; the smallest rejects most ids first
+        filters.sort(key=len)
+
+        def matches(module_id: str) -> bool:
+            return all(module_id in ids for ids in filters)
+
+        position = SORT_FIELDS.index(sort)
+        if filters and len(filters[0]) * 4 < len(self._facets):
+            # Selective filter: sorting its matches beats walking the full order
+            smallest, rest = filters[0], filters[1:]
+            order = sorted(
+                self._facets[module_id].keys[position]
+                for module_id in smallest
+                if all(module_id in ids for ids in rest)
+            )
+            filters = []
+        else:
+            order = self._orders[sort]
+
+        after = decode_cursor(cursor) if cursor else None
+        try:
+            if descending:
+                end = bisect_left(order, after) if after else len(order)
+                walk = (order[i] for i in range(end - 1, -1, -1))
+            else:
+                start = bisect_right(order, after) if after else 0
+                walk = (order[i] for i in range(start, len(order)))
+        except TypeError as e:
+            raise InvalidCursorError(f"Cursor does not match sort field {sort}") from e
+
+        page: List[Tuple[Any, str]] = []
+        # Stops as soon as the page (plus one, for the cursor) is full
+        for key in walk:
+            if matches(key[1]):
+                page.append(key)
+                if len(page) > limit:
+                    break
+
+        next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+        return [module_id for _, module_id in page[:limit]], next_cursor
@@ -0,0 +1,228 @@
+"""Module Loader - moves modules between available and loaded"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Sequence
+
+from .registry import ModuleRegistry
+from .types import ModuleRecord, ModuleStatus
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ("critical", "high", "normal", "background")
+PRIORITY_ALIASES = {"low": "background"}
+
+
+def normalize_priority(priority: str) -> str:
+    priority = PRIORITY_ALIASES.get(priority, priority)
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}")
+    return priority
+
+
+def priority_rank(priority: str) -> int:
+    """Lower ranks load first; unknown priorities sort with normal"""
+    try:
+        return PRIORITIES.index(normalize_priority(priority))
+    except ValueError:
+        return PRIORITIES.index("normal")
+
+
+class ModuleNotLoadedError(Exception):
+    pass
+
+
+class HasDependentsError(Exception):
+    pass
+
+
+class InsufficientMemoryError(Exception):
+    pass
+
+
+def tier_payload(registry: ModuleRegistry, module_id: str, content: Any) -> Dict[str, Any]:
+    """Content as kept in lower storage tiers, tagged with its source files
+
+    File digests travel with the content so a restored copy is shared
+    through the registry's content store again.
+    """
+    return {
+        "signature": registry.source_signature(module_id),
+        "content": content,
+        "digests": registry.content_digests(module_id),
+    }
+
+
+class ModuleLoader:
+    """Loads modules and their dependencies through the registry
+
+    load() blocks on file I/O and is safe to call from worker threads;
+    concurrent loads of the same module wait for the first one. With a hot
+    tier, loaded modules count against its token budget and modules it
+    evicts are unloaded. lower_tiers (e.g. warm, then cold) are checked
+    for a still-current copy before the module's files are parsed.
+    """
+
+    def __init__(
+        self,
+        registry: ModuleRegistry,
+        event_bus: Any = None,
+        hot: Optional[Any] = None,
+        lower_tiers: Sequence[Any] = (),
+    ):
+        self.registry = registry
+        self.event_bus = event_bus
+        self.hot = hot
+        self.lower_tiers = list(lower_tiers)
+        self._guard = threading.Lock()
+        # Plain HotStorage needs serializing; ThreadSafeHotStorage locks itself
+        self._hot_lock = nullcontext() if getattr(hot, "thread_safe", False) else threading.RLock()
+        self._module_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        if hot is not None:
+            hot.on_evict = self._evicted
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        if self.event_bus is not None:
+            self.event_bus.emit(event, data)
+
+    def _lock_for(self, module_id: str) -> threading.Lock:
+        with self._guard:
+            return self._module_locks[module_id]
+
+    def load(self, module_id: str, priority: str = "normal") -> ModuleRecord:
+        """Load a module after its dependencies"""
+        self.registry.get(module_id)
+        self.touch(module_id)
+        deps = []
+        for dep in self.registry.get_dependencies(module_id):
+            if dep not in self.registry.modules:
+                logger.warning(f"{module_id}: dependency {dep} is not registered")
+                continue
+            deps.append(dep)
+        prefetched = self._prefetch([m for m in deps + [module_id] if not self.is_loaded(m)])
+        for dep in deps:
+            self._access(dep)
+            self._load_one(dep, priority, prefetched)
+        return self._load_one(module_id, priority, prefetched)
+
+    def touch(self, module_id: str) -> None:
+        """Record a use of a module"""
+        self.registry.record_usage(module_id)
+        self._access(module_id)
+
+    def _access(self, module_id: str) -> None:
+        # Every request counts towards hot-tier hit ratios and admission
+        if self.hot is not None:
+            with self._hot_lock:
+                self.hot.retrieve(module_id, self.registry.modules[module_id].size)
+
+    def _load_one(self, module_id: str, priority: str, prefetched: Optional[Dict[int, Dict[str, Any]]] = None) -> ModuleRecord:
+        with self._lock_for(module_id):
+            record = self.registry.get(module_id)
+            if record.status == ModuleStatus.LOADED:
+                return record
+
+            self.registry.set_status(module_id, ModuleStatus.LOADING)
+            start = time.perf_counter()
+            try:
+                source, payload = self._from_lower_tiers(module_id, prefetched or {})
+                if payload is None:
+                    record = self.registry.load_content(module_id)
+                else:
+                    record = self.registry.load_content(module_id, payload["content"], payload.get("digests"))
+            except Exception:
+                self.registry.set_status(module_id, ModuleStatus.AVAILABLE)
+                raise
+            if self.hot is not None:
+                # Residency class comes from the manifest, not the request;
+                # foreground requests skip the admission filter
+                residency = PRIORITIES[priority_rank(record.manifest.priority)]
+                force = priority_rank(priority) < priority_rank("normal")
+                with self._hot_lock:
+                    admitted = self.hot.store(module_id, record.content, record.size, residency, force=force)
+                if not admitted:
+                    self.registry.unload_content(module_id)
+                    raise InsufficientMemoryError(
+                        f"{module_id} ({record.size} tokens) was not admitted to the hot tier; "
+                        f"{self.hot.get_free_space()} tokens free"
+                    )
+
+        self._emit("module_loaded", {
+            "module_id": module_id,
+            "load_time_ms": round((time.perf_counter() - start) * 1000, 2),
+            "memory_used": record.size,
+            "priority": priority,
+            "source": source,
+        })
+        return record
+
+    def _prefetch(self, module_ids: List[str]) -> Dict[int, Dict[str, Any]]:
+        """Batch-fetch a dependency chain from tiers that support it (e.g. Redis MGET)"""
+        batches: Dict[int, Dict[str, Any]] = {}
+        if len(module_ids) < 2:
+            return batches
+        for i, tier in enumerate(self.lower_tiers):
+            if hasattr(tier, "retrieve_many"):
+                try:
+                    batches[i] = tier.retrieve_many(module_ids)
+                except Exception as e:
+                    logger.error(f"Prefetching {len(module_ids)} modules failed: {e}")
+        return batches
+
+    def _from_lower_tiers(self, module_id: str, prefetched: Dict[int, Dict[str, Any]]) -> tuple:
+        """(tier name, payload) of the first current copy, else ("disk", None)"""
+        if not self.lower_tiers:
+            return "disk", None
+        signature = self.registry.source_signature(module_id)
+        for i, tier in enumerate(self.lower_tiers):
+            name = tier.tier.value if hasattr(tier, "tier") else type(tier).__name__
+            try:
+                payload = prefetched[i].get(module_id) if i in prefetched else tier.retrieve(module_id)
+            except Exception as e:
+                logger.error(f"Reading {module_id} from {name} failed: {e}")
+                continue
+            if payload is None:
+                continue
+            if payload.get("signature") == signature:
+                return name, payload
+            # Source files changed since this copy was demoted
+            tier.remove(module_id)
+        return "disk", None
+
+    def unload(self, module_id: str, force: bool = False) -> None:
+        if not self.is_loaded(module_id):
+            raise ModuleNotLoadedError(f"Module not loaded: {module_id}")
+        dependents = [d for d in self.registry.get_dependents(module_id) if self.is_loaded(d)]
+        if dependents and not force:
+            raise HasDependentsError(f"{module_id} is required by {', '.join(dependents)}")
+        with self._lock_for(module_id):
+            self.registry.unload_content(module_id)
+            if self.hot is not None:
+                with self._hot_lock:
+                    self.hot.remove(module_id)
+        self._emit("module_unloaded", {"module_id": module_id})
+
+    def evict(self, module_id: str) -> bool:
+        """Push a loaded module out of the hot tier (and down a tier)"""
+        if self.hot is None or not self.is_loaded(module_id):
+            return False
+        with self._lock_for(module_id):
+            with self._hot_lock:
+                if module_id not in self.hot:
+                    return False
+                self.hot.evict(module_id)
+        return True
+
+    def _evicted(self, module_id: str, data: Any) -> None:
+        if module_id in self.registry.modules:
+            self.registry.unload_content(module_id)
+        self._emit("module_evicted", {"module_id": module_id})
+
+    def is_loaded(self, module_id: str) -> bool:
+        record = self.registry.modules.get(module_id)
+        return record is not None and record.status == ModuleStatus.LOADED
+
+    def get_loaded_modules(self) -> List[str]:
+        return sorted(self.registry.index.by_status.get(ModuleStatus.LOADED.value, ()))
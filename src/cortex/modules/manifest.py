@@ -0,0 +1,143 @@
+"""Manifest parsing
+
+Manifests in the wild use a few layouts (see modules/ and the module guide);
+everything is normalized into a ModuleManifest here.
+"""
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+from .types import ModuleManifest, ModuleTriggers, ModuleType, TriggerPattern
+
+MANIFEST_FILE = "manifest.yaml"
+
+# Trigger weights by confidence tier; untiered keyword lists and patterns
+# without a confidence get the default
+TIER_WEIGHTS = {"high_confidence": 1.0, "medium_confidence": 0.6, "low_confidence": 0.3}
+DEFAULT_TRIGGER_WEIGHT = 0.8
+
+
+class ManifestError(Exception):
+    pass
+
+
+def _first(*values: Any, default: Any = None) -> Any:
+    for value in values:
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def _parse_dependencies(raw: Any) -> Dict[str, str]:
+    """Required dependencies as module_id -> version spec"""
+    if isinstance(raw, dict):
+        raw = raw.get("required") or []
+    deps: Dict[str, str] = {}
+    for entry in raw or []:
+        if isinstance(entry, str):
+            deps[entry] = ""
+        elif isinstance(entry, dict) and "id" in entry:
+            if not entry.get("optional", False):
+                deps[entry["id"]] = str(entry.get("version", ""))
+        elif isinstance(entry, dict):
+            for dep_id, spec in entry.items():
+                deps[dep_id] = str(spec or "")
+    return deps
+
+
+def _parse_keywords(raw: Any) -> List[str]:
+    if isinstance(raw, dict):
+        return [kw for tier in raw.values() for kw in (tier or [])]
+    return list(raw or [])
+
+
+def _parse_triggers(raw: Dict[str, Any]) -> ModuleTriggers:
+    keywords: Dict[str, float] = {}
+    tiers = raw.get("keywords")
+    if not isinstance(tiers, dict):
+        tiers = {None: tiers}
+    for tier, values in tiers.items():
+        weight = TIER_WEIGHTS.get(tier, DEFAULT_TRIGGER_WEIGHT)
+        for keyword in values or []:
+            keyword = str(keyword).lower()
+            keywords[keyword] = max(weight, keywords.get(keyword, 0.0))
+
+    patterns = []
+    for entry in raw.get("patterns") or raw.get("file_patterns") or []:
+        if isinstance(entry, dict) and entry.get("regex"):
+            patterns.append(TriggerPattern(
+                str(entry["regex"]),
+                float(entry.get("confidence", DEFAULT_TRIGGER_WEIGHT)),
+                str(entry.get("description", "")),
+            ))
+        elif isinstance(entry, str):
+            patterns.append(TriggerPattern(entry, DEFAULT_TRIGGER_WEIGHT))
+
+    # contexts: [debugging, ...] or context_patterns: [{task_type: debugging}, ...]
+    contexts: List[str] = []
+    for entry in list(raw.get("contexts") or []) + list(raw.get("context_patterns") or []):
+        values = entry.values() if isinstance(entry, dict) else [entry]
+        for value in values:
+            value = str(value).lower()
+            if value not in contexts:
+                contexts.append(value)
+    return ModuleTriggers(keywords, patterns, contexts)
+
+
+def _parse_sections(raw: Any) -> Dict[str, List[str]]:
+    sections: Dict[str, List[str]] = {}
+    for key, value in (raw or {}).items():
+        if key.endswith("_files"):
+            key = key[: -len("_files")]
+        if isinstance(value, dict):
+            value = value.get("files") or []
+        if isinstance(value, list):
+            sections[key] = [str(f) for f in value]
+    return sections
+
+
+def parse_manifest(module_dir: Path) -> ModuleManifest:
+    """Parse and normalize the manifest in module_dir"""
+    path = module_dir / MANIFEST_FILE
+    try:
+        raw = yaml.safe_load(path.read_text()) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise ManifestError(f"Cannot read manifest {path}: {e}") from e
+    if not isinstance(raw, dict) or "id" not in raw:
+        raise ManifestError(f"Manifest {path} has no id")
+
+    metadata = raw.get("metadata") or {}
+    size = raw.get("size") or {}
+    resources = raw.get("resources") or {}
+    triggers = raw.get("triggers") or {}
+    behavior = raw.get("behavior") or {}
+
+    return ModuleManifest(
+        id=str(raw["id"]),
+        version=str(raw.get("version", "0.0.0")),
+        type=str(raw.get("type", ModuleType.KNOWLEDGE.value)),
+        name=_first(metadata.get("name"), raw.get("name"), default=str(raw["id"])),
+        description=_first(metadata.get("description"), raw.get("description"), default=""),
+        size_tokens=int(_first(
+            metadata.get("size_tokens"), size.get("tokens"), resources.get("size_tokens"), default=0
+        )),
+        tags=list(metadata.get("tags") or []),
+        dependencies=_parse_dependencies(raw.get("dependencies")),
+        conflicts=list(raw.get("conflicts") or []),
+        keywords=[str(kw).lower() for kw in _parse_keywords(triggers.get("keywords"))],
+        sections=_parse_sections(raw.get("content")),
+        auto_load=bool(behavior.get("auto_load", False)),
+        priority=str(behavior.get("priority", "normal")),
+        triggers=_parse_triggers(triggers),
+        raw=raw,
+    )
+
+
+def resolve_content_path(module_dir: Path, relative: str) -> Path:
+    """Content files live either beside the manifest or under content/"""
+    path = module_dir / relative
+    if not path.exists() and (module_dir / "content" / relative).exists():
+        return module_dir / "content" / relative
+    return path
+
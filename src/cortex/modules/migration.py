@@ -0,0 +1,272 @@
+"""Background migration of modules between storage tiers
+
+Demotes modules hot -> warm -> cold as they go idle or memory runs
+short, and promotes modules the demand predictor expects to be needed
+soon. All disk traffic goes through a byte-rate token bucket, and a tick
+backs off entirely while interactive loads are queued, so migration
+never competes with foreground work.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .loader import ModuleLoader, tier_payload
+from .registry import ModuleRegistry
+from .scheduler import LoadScheduler
+
+logger = logging.getLogger(__name__)
+
+# Never demoted by the migrator
+PINNED_PRIORITIES = ("critical",)
+# Queued loads at these priorities pause migration
+FOREGROUND_PRIORITIES = ("critical", "high", "normal")
+
+
+class TokenBucket:
+    """Byte budget refilled at rate bytes/second, up to burst"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: int) -> None:
+        """Wait until amount bytes may be moved
+
+        Transfers larger than the burst are let through once the bucket
+        is full and leave it in debt, so they are paid for afterwards.
+        """
+        needed = min(amount, self.burst)
+        while True:
+            self._refill()
+            if self.tokens >= needed:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((needed - self.tokens) / self.rate)
+
+
+class DemandPredictor:
+    """Exponentially decayed request rate per module
+
+    Fed from the registry's usage counters; a module used n times within
+    the last half_life seconds scores roughly n.
+    """
+
+    def __init__(self, half_life: float = 600.0):
+        self.half_life = half_life
+        self.scores: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self._observed: Optional[float] = None
+
+    def observe(self, registry: ModuleRegistry, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        decay = 1.0 if self._observed is None else 0.5 ** ((now - self._observed) / self.half_life)
+        self._observed = now
+        for module_id, record in list(registry.modules.items()):
+            count = record.stats.usage_count
+            delta = count - self._counts.get(module_id, 0)
+            self._counts[module_id] = count
+            self.scores[module_id] = self.scores.get(module_id, 0.0) * decay + delta
+        for module_id in set(self.scores) - set(registry.modules):
+            del self.scores[module_id]
+            self._counts.pop(module_id, None)
+
+    def score(self, module_id: str) -> float:
+        return self.scores.get(module_id, 0.0)
+
+    def likely(self, threshold: float) -> List[str]:
+        """Modules scoring at least threshold, most wanted first"""
+        ranked = sorted(self.scores.items(), key=lambda item: (-item[1], item[0]))
+        return [module_id for module_id, score in ranked if score >= threshold]
+
+
+class TierMigrator:
+    """Moves modules between the hot, warm and cold tiers in the background
+
+    Set as the hot tier's lower_tier: evicted modules are queued here and
+    written to the warm tier on the next tick, off the load path.
+    """
+
+    def __init__(
+        self,
+        loader: ModuleLoader,
+        warm: Any,
+        cold: Any,
+        scheduler: Optional[LoadScheduler] = None,
+        predictor: Optional[DemandPredictor] = None,
+        interval: float = 10.0,
+        hot_idle: float = 900.0,
+        warm_idle: float = 86400.0,
+        pressure_high: float = 0.9,
+        pressure_low: float = 0.75,
+        io_bytes_per_sec: float = 8 * 1024 * 1024,
+        promote_threshold: float = 2.0,
+        max_promotions: int = 4,
+        pending_limit: int = 256,
+    ):
+        self.loader = loader
+        self.registry = loader.registry
+        self.hot = loader.hot
+        self.warm = warm
+        self.cold = cold
+        self.scheduler = scheduler
+        self.predictor = predictor or DemandPredictor()
+        self.interval = interval
+        self.hot_idle = hot_idle
+        self.warm_idle = warm_idle
+        self.pressure_high = pressure_high
+        self.pressure_low = pressure_low
+        self.bucket = TokenBucket(io_bytes_per_sec)
+        self.promote_threshold = promote_threshold
+        self.max_promotions = max_promotions
+        self.pending_limit = pending_limit
+        self._pending: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._first_seen: Dict[str, float] = {}
+        self._running = False
+        self.counters: Dict[str, int] = {
+            "hot_to_warm": 0,
+            "warm_to_cold": 0,
+            "cold_to_warm": 0,
+            "warm_to_hot": 0,
+            "dropped": 0,
+            "skipped_busy": 0,
+            "bytes_moved": 0,
+        }
+
+    # Hot tier lower_tier hook
+
+    def store(self, module_id: str, content: Any) -> None:
+        """Queue evicted content for the warm tier; may run on a worker thread"""
+        if len(self._pending) >= self.pending_limit:
+            # Dropping is safe: the module can always be re-read from disk
+            self.counters["dropped"] += 1
+            return
+        self._pending.append((module_id, tier_payload(self.registry, module_id, content)))
+
+    # Migration passes
+
+    def _foreground_busy(self) -> bool:
+        if self.scheduler is None:
+            return False
+        depth = self.scheduler.queue_depth()
+        return any(depth[p] for p in FOREGROUND_PRIORITIES)
+
+    def _last_used(self, module_id: str, now: float) -> float:
+        last_used = self.registry.modules[module_id].stats.last_used
+        if last_used is not None:
+            return last_used.timestamp()
+        return self._first_seen.setdefault(module_id, now)
+
+    async def _flush_demotions(self) -> None:
+        while self._pending:
+            module_id, payload = self._pending.popleft()
+            await asyncio.to_thread(self.warm.store, module_id, payload)
+            entry = self.warm.index.get(module_id)
+            await self._spend(entry.size if entry else 0)
+
+    async def _spend(self, size: int) -> None:
+        self.counters["bytes_moved"] += size
+        await self.bucket.acquire(size)
+
+    def hot_candidates(self, now: float) -> List[str]:
+        """Hot modules to demote: idle ones, then LRU ones under pressure"""
+        resident = []
+        for module_id in self.hot.module_ids():
+            record = self.registry.modules.get(module_id)
+            if record is None or record.manifest.priority in PINNED_PRIORITIES:
+                continue
+            if self.predictor.score(module_id) >= self.promote_threshold:
+                continue
+            resident.append((self._last_used(module_id, now), module_id, record.size))
+        resident.sort()
+
+        chosen = [m for last_used, m, _ in resident if now - last_used >= self.hot_idle]
+        used = self.hot.current_size - sum(size for _, m, size in resident if m in chosen)
+        if self.hot.max_size and self.hot.current_size >= self.pressure_high * self.hot.max_size:
+            for _, module_id, size in resident:
+                if used <= self.pressure_low * self.hot.max_size:
+                    break
+                if module_id not in chosen:
+                    chosen.append(module_id)
+                    used -= size
+        return chosen
+
+    async def _demote_hot(self, now: float) -> None:
+        for module_id in self.hot_candidates(now):
+            if self.loader.evict(module_id):
+                self.counters["hot_to_warm"] += 1
+        await self._flush_demotions()
+
+    async def _demote_warm(self, now: float) -> None:
+        idle = [
+            module_id for module_id, entry in list(self.warm.index.items())
+            if now - entry.last_access >= self.warm_idle
+            and self.predictor.score(module_id) < self.promote_threshold
+        ]
+        for module_id in idle:
+            size = self.warm.index[module_id].size if module_id in self.warm else 0
+            moved = await asyncio.to_thread(self._move, self.warm, self.cold, module_id)
+            if moved:
+                self.counters["warm_to_cold"] += 1
+                await self._spend(size)
+
+    @staticmethod
+    def _move(source: Any, target: Any, module_id: str) -> bool:
+        payload = source.retrieve(module_id)
+        if payload is None:
+            return False
+        target.store(module_id, payload)
+        source.remove(module_id)
+        return True
+
+    async def _promote(self) -> None:
+        wanted = [m for m in self.predictor.likely(self.promote_threshold) if not self.loader.is_loaded(m)]
+        for module_id in wanted[: self.max_promotions]:
+            if module_id not in self.warm and module_id in self.cold:
+                size = self.cold.index[module_id].length
+                if await asyncio.to_thread(self._move, self.cold, self.warm, module_id):
+                    self.counters["cold_to_warm"] += 1
+                    await self._spend(size)
+            if self.scheduler is not None:
+                # Speculative: the scheduler caps background slots and drops stale jobs
+                future = self.scheduler.submit(module_id, "background")
+                future.add_done_callback(self._promoted)
+
+    def _promoted(self, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self.counters["warm_to_hot"] += 1
+
+    async def tick(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        self.predictor.observe(self.registry, now)
+        await self._flush_demotions()
+        if self._foreground_busy():
+            self.counters["skipped_busy"] += 1
+            return
+        await self._demote_hot(now)
+        await self._demote_warm(now)
+        await self._promote()
+
+    async def run(self) -> None:
+        """Migrate every interval seconds until stop() is called"""
+        self._running = True
+        while self._running:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Tier migration failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stop(self) -> None:
+        self._running = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "pending": len(self._pending)}
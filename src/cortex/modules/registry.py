@@ -0,0 +1,352 @@
+"""Module Registry - central catalog of available modules"""
+import logging
+import re
+import threading
+from dataclasses import replace
+from hashlib import blake2b
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .content import ContentStore
+from .index import ModuleIndex
+from .manifest import MANIFEST_FILE, ManifestError, parse_manifest, resolve_content_path
+from .types import ModuleManifest, ModuleRecord, ModuleStats, ModuleStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ModuleAlreadyExistsError(Exception):
+    pass
+
+
+class ModuleNotFoundError(Exception):
+    pass
+
+
+class CircularDependencyError(Exception):
+    pass
+
+
+def _parse_version(version: str) -> tuple:
+    parts = [int(p) for p in re.findall(r"\d+", version)[:3]]
+    return tuple(parts + [0] * (3 - len(parts)))
+
+
+class ModuleRegistry:
+    """Tracks all modules, their metadata and content"""
+
+    def __init__(self, event_bus: Any = None, content_store: Optional[ContentStore] = None):
+        self.modules: Dict[str, ModuleRecord] = {}
+        self.keyword_index: Dict[str, Set[str]] = {}
+        self.event_bus = event_bus
+        self.content_store = content_store or ContentStore()
+        self.index = ModuleIndex()
+        # Bumped whenever the set of manifests (and so of triggers) changes
+        self.trigger_version = 0
+        self._lock = threading.RLock()
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        if self.event_bus is not None:
+            self.event_bus.emit(event, data)
+
+    def _store(self, record: ModuleRecord) -> None:
+        with self._lock:
+            self.modules[record.id] = record
+            self.index.update(record)
+
+    def get(self, module_id: str) -> ModuleRecord:
+        record = self.modules.get(module_id)
+        if record is None:
+            raise ModuleNotFoundError(f"Module not found: {module_id}")
+        return record
+
+    # Registration
+
+    def register(self, module_path: str) -> str:
+        """Register the module at module_path and return its id"""
+        path = Path(module_path)
+        manifest = parse_manifest(path)
+        record = ModuleRecord(
+            id=manifest.id,
+            version=manifest.version,
+            type=manifest.type,
+            path=path,
+            manifest=manifest,
+        )
+        with self._lock:
+            if manifest.id in self.modules:
+                raise ModuleAlreadyExistsError(f"Module already registered: {manifest.id}")
+            self._store(record)
+            self._index(record)
+            self.trigger_version += 1
+        self._emit("module_registered", {"module_id": record.id, "version": record.version})
+        return record.id
+
+    def unregister(self, module_id: str) -> None:
+        with self._lock:
+            record = self.get(module_id)
+            self._unindex(record)
+            self.content_store.release(module_id)
+            self.index.remove(module_id)
+            del self.modules[module_id]
+            self.trigger_version += 1
+        self._emit("module_unregistered", {"module_id": module_id})
+
+    def _index(self, record: ModuleRecord) -> None:
+        for keyword in record.manifest.keywords:
+            self.keyword_index.setdefault(keyword, set()).add(record.id)
+
+    def _unindex(self, record: ModuleRecord) -> None:
+        for keyword in record.manifest.keywords:
+            ids = self.keyword_index.get(keyword)
+            if ids is not None:
+                ids.discard(record.id)
+                if not ids:
+                    del self.keyword_index[keyword]
+
+    # Content
+
+    def _read_sections(
+        self,
+        record: ModuleRecord,
+        sections: Dict[str, List[str]],
+        previous: Dict[str, Dict[str, Any]],
+        changed: Set[Path],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Parse section files, reusing previous data for untouched files"""
+        content: Dict[str, Dict[str, Any]] = {}
+        for section, files in sections.items():
+            old_section = previous.get(section, {})
+            new_section: Dict[str, Any] = {}
+            for relative in files:
+                path = resolve_content_path(record.path, relative)
+                if relative in old_section and path not in changed:
+                    new_section[relative] = old_section[relative]
+                    continue
+                if not path.exists():
+                    logger.debug(f"Content file missing: {path}")
+                    continue
+                try:
+                    new_section[relative] = self.content_store.load(record.id, relative, path)
+                except (OSError, ValueError) as e:
+                    # Likely caught mid-write; keep the last good copy
+                    logger.warning(f"Cannot parse {path}: {e}")
+                    if relative in old_section:
+                        new_section[relative] = old_section[relative]
+            content[section] = new_section
+
+        kept = {relative for files in content.values() for relative in files}
+        for relative in {r for files in previous.values() for r in files} - kept:
+            self.content_store.release(record.id, relative)
+        return content
+
+    def load_content(
+        self,
+        module_id: str,
+        content: Optional[Dict[str, Dict[str, Any]]] = None,
+        digests: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> ModuleRecord:
+        """Parse a module's content files and mark it loaded
+
+        content, when given (e.g. promoted from a lower storage tier), is
+        installed instead of reading the files; files listed in digests
+        (section -> relative -> [digest, size]) are shared through the
+        content store like files read from disk.
+        """
+        record = self.get(module_id)
+        if record.status == ModuleStatus.LOADED:
+            return record
+        if content is None:
+            # Files are read without holding the lock so loads can run in parallel
+            content = self._read_sections(record, record.manifest.sections, {}, set())
+        elif digests:
+            interned: Dict[str, Dict[str, Any]] = {}
+            for section, files in content.items():
+                keys = digests.get(section, {})
+                interned[section] = {}
+                for relative, data in files.items():
+                    if relative in keys:
+                        digest, size = keys[relative]
+                        data = self.content_store.intern(module_id, relative, digest, data, size)
+                    interned[section][relative] = data
+            content = interned
+        with self._lock:
+            record = replace(self.get(module_id), content=content, status=ModuleStatus.LOADED)
+            self._store(record)
+        return record
+
+    def unload_content(self, module_id: str) -> ModuleRecord:
+        with self._lock:
+            self.content_store.release(module_id)
+            record = replace(self.get(module_id), content={}, status=ModuleStatus.AVAILABLE)
+            self._store(record)
+        return record
+
+    def set_status(self, module_id: str, status: ModuleStatus) -> ModuleRecord:
+        with self._lock:
+            record = replace(self.get(module_id), status=status)
+            self._store(record)
+        return record
+
+    def content_digests(self, module_id: str) -> Dict[str, Dict[str, List[Any]]]:
+        """section -> relative -> [digest, size] for a loaded module's files"""
+        store = self.content_store
+        digests: Dict[str, Dict[str, List[Any]]] = {}
+        for section, files in self.get(module_id).content.items():
+            for relative in files:
+                digest = store.refs.get((module_id, relative))
+                if digest is not None:
+                    digests.setdefault(section, {})[relative] = [digest, store.size_of(digest)]
+        return digests
+
+    def content_files(self, module_id: str) -> List[Path]:
+        """Manifest plus every content file the manifest references"""
+        record = self.get(module_id)
+        files = [record.path / MANIFEST_FILE]
+        for relative_files in record.manifest.sections.values():
+            files.extend(resolve_content_path(record.path, f) for f in relative_files)
+        return files
+
+    def source_signature(self, module_id: str) -> str:
+        """Fingerprint of a module's files on disk (paths, sizes, mtimes)
+
+        Copies of content kept elsewhere are stale once this changes.
+        """
+        digest = blake2b(digest_size=16)
+        digest.update(self.get(module_id).version.encode())
+        for path in self.content_files(module_id):
+            try:
+                st = path.stat()
+                digest.update(f"{path}:{st.st_size}:{st.st_mtime_ns}".encode())
+            except FileNotFoundError:
+                digest.update(f"{path}:missing".encode())
+        return digest.hexdigest()
+
+    # Hot reload
+
+    def refresh(self, module_id: str, changed_files: Iterable[Path]) -> ModuleRecord:
+        """Re-parse only what changed on disk and swap the record in place
+
+        A changed manifest is re-parsed and re-indexed; content is re-read
+        only for loaded modules, and only for changed or newly listed files.
+        Dependents are notified but not reloaded.
+        """
+        old = self.get(module_id)
+        changed = {Path(p) for p in changed_files}
+        manifest: ModuleManifest = old.manifest
+        manifest_changed = old.path / MANIFEST_FILE in changed
+        if manifest_changed:
+            manifest = parse_manifest(old.path)
+            if manifest.id != module_id:
+                raise ManifestError(f"Module id changed from {module_id} to {manifest.id}")
+        elif old.status != ModuleStatus.LOADED:
+            return old
+
+        content = old.content
+        if old.status == ModuleStatus.LOADED:
+            content = self._read_sections(old, manifest.sections, old.content, changed)
+
+        new = replace(
+            old,
+            version=manifest.version,
+            type=manifest.type,
+            manifest=manifest,
+            content=content,
+            revision=old.revision + 1,
+        )
+        with self._lock:
+            if manifest_changed:
+                self._unindex(old)
+                self._index(new)
+                self.trigger_version += 1
+            self._store(new)
+
+        self._emit("module_updated", {
+            "module_id": module_id,
+            "revision": new.revision,
+            "changed_files": sorted(str(p) for p in changed),
+        })
+        for dependent in self.get_dependents(module_id):
+            self._emit("dependency_updated", {
+                "module_id": dependent,
+                "dependency": module_id,
+                "revision": new.revision,
+            })
+        return new
+
+    # Discovery
+
+    def find_by_keyword(self, keyword: str) -> List[ModuleRecord]:
+        ids = self.keyword_index.get(keyword.lower(), set())
+        return [self.modules[module_id] for module_id in sorted(ids)]
+
+    # Dependencies
+
+    def get_dependencies(self, module_id: str) -> List[str]:
+        """All transitive dependencies in load order (deepest first)"""
+        result: List[str] = []
+        visiting: Set[str] = set()
+        done: Set[str] = set()
+
+        def visit(current: str) -> None:
+            if current in done:
+                return
+            if current in visiting:
+                raise CircularDependencyError(f"Circular dependency through {current}")
+            visiting.add(current)
+            record = self.modules.get(current)
+            for dep in (record.manifest.dependencies if record else {}):
+                visit(dep)
+                if dep not in result:
+                    result.append(dep)
+            visiting.discard(current)
+            done.add(current)
+
+        visit(module_id)
+        return result
+
+    def get_dependents(self, module_id: str) -> List[str]:
+        """Modules that directly depend on module_id"""
+        return sorted(
+            record.id for record in self.modules.values()
+            if module_id in record.manifest.dependencies
+        )
+
+    def check_conflicts(self, module_id: str) -> List[str]:
+        """Loaded modules that conflict with module_id"""
+        record = self.get(module_id)
+        conflicts = []
+        for other in self.modules.values():
+            if other.id == module_id or other.status != ModuleStatus.LOADED:
+                continue
+            if other.id in record.manifest.conflicts or module_id in other.manifest.conflicts:
+                conflicts.append(other.id)
+        return conflicts
+
+    @staticmethod
+    def version_compatible(version: str, spec: str) -> bool:
+        """Check version against a spec such as '>=1.0.0' or '~=1.2.0'"""
+        match = re.match(r"\s*(>=|<=|==|~=|>|<)?\s*(.*)", spec or "")
+        op, required = match.group(1) or "==", match.group(2)
+        if not required:
+            return True
+        have, want = _parse_version(version), _parse_version(required)
+        if op == "~=":
+            return have >= want and have[:2] == want[:2]
+        return {
+            ">=": have >= want, "<=": have <= want, ">": have > want,
+            "<": have < want, "==": have == want,
+        }[op]
+
+    # Stats
+
+    def record_usage(self, module_id: str) -> None:
+        with self._lock:
+            record = self.get(module_id)
+            record.stats.usage_count += 1
+            record.stats.last_used = datetime.now()
+            self.index.update(record)
+
+    def get_stats(self, module_id: str) -> ModuleStats:
+        return self.get(module_id).stats
@@ -0,0 +1,220 @@
+"""Load Scheduler - priority queues in front of the module loader
+
+Loads are queued by priority (critical, high, normal, background) and run
+on a bounded pool of workers. Background loads are speculative: they only
+start when nothing more urgent is queued, may occupy at most
+background_slots workers so interactive loads always find a free worker,
+and are dropped once they have waited past their budget. With a single
+worker there is none to spare, so background loads are dropped at once.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .loader import PRIORITIES, ModuleLoader, normalize_priority
+from .types import ModuleRecord
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGETS_MS = {"critical": 50, "high": 200, "normal": 1000, "background": 30000}
+
+
+class LoadDroppedError(Exception):
+    pass
+
+
+@dataclass
+class _Job:
+    module_id: str
+    priority: str
+    future: asyncio.Future
+    enqueued_at: float
+    started: bool = False
+
+
+@dataclass
+class PriorityStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    budget_misses: int = 0
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class LoadScheduler:
+    """Runs module loads by priority on a bounded worker pool"""
+
+    def __init__(
+        self,
+        loader: ModuleLoader,
+        workers: int = 4,
+        background_slots: int = 1,
+        budgets_ms: Optional[Dict[str, float]] = None,
+    ):
+        self.loader = loader
+        self.workers = max(1, workers)
+        self.background_slots = max(0, min(background_slots, self.workers - 1))
+        self.budgets_ms = {**DEFAULT_BUDGETS_MS, **(budgets_ms or {})}
+        self.stats: Dict[str, PriorityStats] = {p: PriorityStats() for p in PRIORITIES}
+        self._heap: List[Tuple[int, int, _Job]] = []
+        self._seq = itertools.count()
+        self._pending: Dict[str, _Job] = {}
+        self._busy_background = 0
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, module_id: str, priority: str = "normal") -> asyncio.Future:
+        """Queue a load; a pending load of the same module is shared and promoted"""
+        priority = normalize_priority(priority)
+        self.loader.registry.get(module_id)
+        self.stats[priority].submitted += 1
+
+        job = self._pending.get(module_id)
+        if job is not None:
+            if PRIORITIES.index(priority) < PRIORITIES.index(job.priority) and not job.started:
+                job.priority = priority
+                self._push(job)
+            return job.future
+
+        loop = asyncio.get_running_loop()
+        job = _Job(module_id, priority, loop.create_future(), time.monotonic())
+        if self.loader.is_loaded(module_id):
+            self.loader.touch(module_id)
+            job.future.set_result(self.loader.registry.get(module_id))
+            self._record(job, ok=True)
+            return job.future
+        if priority == "background" and not self.background_slots:
+            self._drop(job, "has no worker to spare")
+            return job.future
+
+        self._pending[module_id] = job
+        self._push(job)
+        return job.future
+
+    async def load(self, module_id: str, priority: str = "normal") -> ModuleRecord:
+        return await asyncio.shield(self.submit(module_id, priority))
+
+    def cancel_speculative(self, module_id: Optional[str] = None) -> int:
+        """Drop queued background loads (all, or one module's)"""
+        dropped = 0
+        for job in list(self._pending.values()):
+            if job.priority == "background" and not job.started and module_id in (None, job.module_id):
+                self._drop(job, "cancelled")
+                dropped += 1
+        return dropped
+
+    def queue_depth(self) -> Dict[str, int]:
+        depth = {p: 0 for p in PRIORITIES}
+        for job in self._pending.values():
+            if not job.started:
+                depth[job.priority] += 1
+        return depth
+
+    def _push(self, job: _Job) -> None:
+        # Promotion pushes a second entry; the stale one is skipped on pop
+        heapq.heappush(self._heap, (PRIORITIES.index(job.priority), next(self._seq), job))
+        self._wakeup.set()
+
+    def _drop(self, job: _Job, reason: str) -> None:
+        self._pending.pop(job.module_id, None)
+        self.stats[job.priority].dropped += 1
+        if not job.future.done():
+            job.future.set_exception(LoadDroppedError(f"Load of {job.module_id} {reason}"))
+            job.future.exception()  # mark retrieved; fire-and-forget prefetches may never await
+
+    def _pop_runnable(self) -> Optional[_Job]:
+        now = time.monotonic()
+        while self._heap:
+            rank, _, job = self._heap[0]
+            if job.started or rank != PRIORITIES.index(job.priority) or job.future.done():
+                heapq.heappop(self._heap)
+                continue
+            if job.priority == "background":
+                if (now - job.enqueued_at) * 1000 > self.budgets_ms["background"]:
+                    heapq.heappop(self._heap)
+                    self._drop(job, "went stale in the queue")
+                    continue
+                if self._busy_background >= self.background_slots:
+                    return None  # only background work left and its slots are full
+            heapq.heappop(self._heap)
+            return job
+        return None
+
+    async def _worker(self) -> None:
+        while True:
+            job = self._pop_runnable()
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            job.started = True
+            background = job.priority == "background"
+            self._busy_background += background
+            try:
+                record = await asyncio.to_thread(self.loader.load, job.module_id, job.priority)
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+                self._record(job, ok=False)
+            else:
+                if not job.future.done():
+                    job.future.set_result(record)
+                self._record(job, ok=True)
+            finally:
+                self._busy_background -= background
+                self._pending.pop(job.module_id, None)
+                self._wakeup.set()
+
+    def _record(self, job: _Job, ok: bool) -> None:
+        stats = self.stats[job.priority]
+        latency_ms = (time.monotonic() - job.enqueued_at) * 1000
+        if not ok:
+            stats.failed += 1
+            return
+        stats.completed += 1
+        stats.latencies_ms.append(latency_ms)
+        if latency_ms > self.budgets_ms[job.priority]:
+            stats.budget_misses += 1
+            logger.warning(
+                f"{job.priority} load of {job.module_id} took {latency_ms:.0f}ms "
+                f"(budget {self.budgets_ms[job.priority]}ms)"
+            )
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        depth = self.queue_depth()
+        return {
+            priority: {
+                "queued": depth[priority],
+                "submitted": s.submitted,
+                "completed": s.completed,
+                "failed": s.failed,
+                "dropped": s.dropped,
+                "budget_ms": self.budgets_ms[priority],
+                "budget_misses": s.budget_misses,
+                "p50_ms": round(s.percentile(50), 2),
+                "p99_ms": round(s.percentile(99), 2),
+            }
+            for priority, s in self.stats.items()
+        }
@@ -0,0 +1,78 @@
+"""Module system types"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class ModuleType(str, Enum):
+    KNOWLEDGE = "knowledge"
+    CAPABILITY = "capability"
+    IDENTITY = "identity"
+    MEMORY = "memory"
+
+
+class ModuleStatus(str, Enum):
+    AVAILABLE = "available"
+    LOADING = "loading"
+    LOADED = "loaded"
+
+
+@dataclass
+class ModuleStats:
+    usage_count: int = 0
+    last_used: Optional[datetime] = None
+
+
+@dataclass
+class TriggerPattern:
+    regex: str
+    confidence: float
+    description: str = ""
+
+
+@dataclass
+class ModuleTriggers:
+    """Activation triggers, weighted by the manifest's confidence tiers"""
+    keywords: Dict[str, float] = field(default_factory=dict)  # keyword -> weight
+    patterns: List[TriggerPattern] = field(default_factory=list)
+    contexts: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ModuleManifest:
+    """Normalized view of a module's manifest.yaml"""
+    id: str
+    version: str
+    type: str
+    name: str
+    description: str
+    size_tokens: int = 0
+    tags: List[str] = field(default_factory=list)
+    dependencies: Dict[str, str] = field(default_factory=dict)
+    conflicts: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+    sections: Dict[str, List[str]] = field(default_factory=dict)  # section -> relative files
+    auto_load: bool = False
+    priority: str = "normal"
+    triggers: ModuleTriggers = field(default_factory=ModuleTriggers)
+    raw: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ModuleRecord:
+    """Registry entry for a module"""
+    id: str
+    version: str
+    type: str
+    path: Path
+    manifest: ModuleManifest
+    status: ModuleStatus = ModuleStatus.AVAILABLE
+    stats: ModuleStats = field(default_factory=ModuleStats)
+    content: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # section -> file -> data
+    revision: int = 1
+
+    @property
+    def size(self) -> int:
+        return self.manifest.size_tokens
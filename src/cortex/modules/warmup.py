@@ -0,0 +1,97 @@
+"""Background warm-up of auto_load modules
+
+Runs after startup so the server accepts connections immediately; the
+readiness probe stays red until every high-priority module is resident,
+and reports degraded if one of them failed to load.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict, List
+
+from .loader import PRIORITIES, priority_rank
+from .scheduler import LoadScheduler
+
+logger = logging.getLogger(__name__)
+
+GATING_PRIORITIES = ("critical", "high")
+
+
+class ModuleWarmup:
+    """Preloads auto_load modules in priority order with bounded concurrency
+
+    concurrency bounds how many warm-up loads are in the scheduler at once,
+    so warm-up never floods the queues ahead of interactive requests.
+    """
+
+    def __init__(self, scheduler: LoadScheduler, concurrency: int = 2, enabled: bool = True):
+        self.scheduler = scheduler
+        self.loader = scheduler.loader
+        self.concurrency = max(1, concurrency)
+        self.enabled = enabled
+        self.plan: List[str] = []
+        self.gating: List[str] = []
+        self.loaded: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.finished = False
+
+    def build_plan(self) -> List[str]:
+        """auto_load modules, highest priority first"""
+        if not self.enabled:
+            return []
+        records = [r for r in self.loader.registry.modules.values() if r.manifest.auto_load]
+        records.sort(key=lambda r: (priority_rank(r.manifest.priority), r.id))
+        return [r.id for r in records]
+
+    async def run(self) -> None:
+        self.plan = self.build_plan()
+        registry = self.loader.registry
+        self.gating = [m for m in self.plan if registry.modules[m].manifest.priority in GATING_PRIORITIES]
+        queue = deque(self.plan)
+
+        async def worker() -> None:
+            while queue:
+                module_id = queue.popleft()
+                priority = PRIORITIES[priority_rank(registry.modules[module_id].manifest.priority)]
+                try:
+                    await self.scheduler.load(module_id, priority)
+                    self.loaded.append(module_id)
+                except Exception as e:
+                    logger.error(f"Warm-up failed for {module_id}: {e}")
+                    self.failed[module_id] = str(e)
+
+        logger.info(f"Warming up {len(self.plan)} modules ({len(self.gating)} gating readiness)")
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(self.plan)))))
+        finally:
+            self.finished = True
+        logger.info(f"Warm-up done: {len(self.loaded)} loaded, {len(self.failed)} failed")
+
+    @property
+    def degraded(self) -> List[str]:
+        """Gating modules that failed to load"""
+        return [m for m in self.gating if m in self.failed]
+
+    @property
+    def ready(self) -> bool:
+        """True once every gating module is loaded"""
+        if not self.enabled:
+            return True
+        if self.degraded:
+            return False
+        if self.finished:
+            return True
+        if not self.plan:
+            return False
+        loaded = set(self.loaded)
+        return all(m in loaded for m in self.gating)
+
+    def progress(self) -> Dict[str, Any]:
+        settled = set(self.loaded) | set(self.failed)
+        return {
+            "total": len(self.plan),
+            "loaded": len(self.loaded),
+            "failed": sorted(self.failed),
+            "degraded": self.degraded,
+            "pending": [m for m in self.gating if m not in settled],
+        }
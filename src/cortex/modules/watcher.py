@@ -0,0 +1,122 @@
+"""Module file watcher - polls search paths for changed modules
+
+Uses mtime/size polling so it works everywhere, including filesystems
+without inotify. A directory that fails to register is remembered by its
+manifest's signature and retried only once that changes (or a module is
+removed, which may free the id it clashed with).
+"""
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .manifest import MANIFEST_FILE, ManifestError
+from .registry import ModuleAlreadyExistsError, ModuleRegistry
+
+logger = logging.getLogger(__name__)
+
+Signature = Optional[Tuple[int, int]]  # (mtime_ns, size), None if missing
+
+
+def _signature(path: Path) -> Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ModuleWatcher:
+    """Keeps a registry in sync with modules on disk"""
+
+    def __init__(self, registry: ModuleRegistry, search_paths: Iterable[str], interval: float = 1.0):
+        self.registry = registry
+        self.search_paths = [Path(p).expanduser() for p in search_paths]
+        self.interval = interval
+        self.running = False
+        self._dirs: Dict[Path, str] = {}  # module dir -> module id
+        self._snapshots: Dict[str, Dict[Path, Signature]] = {}
+        self._failed: Dict[Path, Signature] = {}  # module dir -> manifest signature
+        self._wake = asyncio.Event()
+
+    def _discover(self) -> List[Path]:
+        found = []
+        for root in self.search_paths:
+            if not root.is_dir():
+                continue
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, MANIFEST_FILE)):
+                        found.append(Path(entry.path))
+        return found
+
+    def _snapshot(self, module_id: str) -> Dict[Path, Signature]:
+        return {path: _signature(path) for path in self.registry.content_files(module_id)}
+
+    def scan(self) -> Dict[str, List[Path]]:
+        """Run one poll; returns changed files per refreshed module"""
+        changes: Dict[str, List[Path]] = {}
+        present = set(self._discover())
+
+        for module_dir in list(self._dirs):
+            if module_dir not in present:
+                module_id = self._dirs.pop(module_dir)
+                self._snapshots.pop(module_id, None)
+                if module_id in self.registry.modules:
+                    self.registry.unregister(module_id)
+                self._failed.clear()
+        for module_dir in list(self._failed):
+            if module_dir not in present:
+                del self._failed[module_dir]
+
+        for module_dir in present - set(self._dirs):
+            signature = _signature(module_dir / MANIFEST_FILE)
+            if module_dir in self._failed and self._failed[module_dir] == signature:
+                continue
+            try:
+                module_id = self.registry.register(str(module_dir))
+            except (ManifestError, ModuleAlreadyExistsError) as e:
+                logger.warning(f"Skipping module at {module_dir}: {e}")
+                self._failed[module_dir] = signature
+                continue
+            self._failed.pop(module_dir, None)
+            self._dirs[module_dir] = module_id
+            self._snapshots[module_id] = self._snapshot(module_id)
+
+        for module_id, snapshot in self._snapshots.items():
+            changed = [path for path, sig in snapshot.items() if _signature(path) != sig]
+            if not changed:
+                continue
+            try:
+                self.registry.refresh(module_id, changed)
+            except ManifestError as e:
+                logger.warning(f"Not reloading {module_id}: {e}")
+            # Re-snapshot either way so a broken manifest is retried only once it changes again
+            self._snapshots[module_id] = self._snapshot(module_id)
+            changes[module_id] = changed
+
+        return changes
+
+    async def run(self) -> None:
+        """Poll until stopped"""
+        self.running = True
+        while self.running:
+            try:
+                # Stats and parses files; keep the event loop free meanwhile
+                await asyncio.to_thread(self.scan)
+            except Exception as e:
+                logger.error(f"Module watcher error: {e}", exc_info=True)
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def request_scan(self) -> None:
+        """Poll now rather than after the interval, e.g. when another worker saw a change"""
+        self._wake.set()
+
+    def stop(self) -> None:
+        self.running = False
+        self._wake.set()
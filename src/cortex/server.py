@@ -5,30 +5,156 @@ import signal
 import sys
 from pathlib import Path
 import logging
-from typing import Optional
+from typing import Any, Optional
+
+from .context import AnalysisCache, ContextAnalyzer, ContextSessions, ContextTables, ModuleSuggester
+from .events import AsyncEventBus, BrokerLink, EventHistory, EventStream
+from .events.broker import INVALIDATION_EVENTS
+from .modules import LoadScheduler, ModuleLoader, ModuleRegistry, ModuleWarmup, ModuleWatcher, TierMigrator
+from .storage import ColdStorage, DecodePool, SharedWarmStorage, ThreadSafeHotStorage, WarmStorage, connect
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger('cortex.server')
 
 class CortexServer:
-    """Main Cortex_2 server"""
+    """Main Cortex_2 server
+
+    Owns the module system and storage tiers and their background tasks;
+    the API lifespan runs one of these too.
+    """
     
-    def __init__(self):
+    def __init__(self, config: Any = None):
+        if config is None:
+            from .core.config import settings as config
+        self.settings = config
         self.running = False
         self.tasks = []
+        self.events: Optional[AsyncEventBus] = None
+        self.stream: Optional[EventStream] = None
+        self.broker: Optional[BrokerLink] = None
+        self.analyzer: Optional[ContextAnalyzer] = None
+        self.sessions: Optional[ContextSessions] = None
+        self.registry: Optional[ModuleRegistry] = None
+        self.watcher: Optional[ModuleWatcher] = None
+        self.hot: Optional[ThreadSafeHotStorage] = None
+        self.warm: Optional[Any] = None  # WarmStorage or SharedWarmStorage
+        self.cold: Optional[ColdStorage] = None
+        self.loader: Optional[ModuleLoader] = None
+        self.scheduler: Optional[LoadScheduler] = None
+        self.warmup: Optional[ModuleWarmup] = None
+        self.migrator: Optional[TierMigrator] = None
+        
+    async def setup(self):
+        """Build components and start their background tasks"""
+        settings = self.settings
+        spill_dir = Path(settings.events_spill_dir) if settings.events_spill_dir else None
+        self.events = AsyncEventBus(
+            settings.events_queue_size,
+            settings.events_overflow,
+            EventHistory(settings.events_history_size, spill_dir),
+        )
+        self.stream = EventStream(
+            self.events,
+            settings.events_stream_buffer,
+            settings.events_stream_slow_consumer,
+            settings.events_stream_max_clients,
+        )
+        self.registry = ModuleRegistry(self.events)
+        tables = ContextTables.load(Path(settings.context_tables)) if settings.context_tables else ContextTables()
+        cache = None
+        if settings.context_cache_size > 0:
+            # Any manifest change may change suggestions, so it empties the cache
+            cache = AnalysisCache(
+                settings.context_cache_size,
+                settings.context_cache_ttl,
+                version=lambda: self.registry.trigger_version,
+            )
+        self.analyzer = ContextAnalyzer(
+            tables,
+            settings.context_max_keywords,
+            max_chars=settings.context_max_chars,
+            max_batch=settings.context_batch_max_items,
+            cache=cache,
+            stream_confidence=settings.context_stream_confidence,
+            stream_max_seconds=settings.context_stream_max_seconds,
+            suggester=ModuleSuggester(self.registry, settings.context_suggest_max),
+        )
+        self.sessions = ContextSessions(
+            self.analyzer,
+            settings.context_session_half_life,
+            settings.context_session_idle_ttl,
+            settings.context_max_sessions,
+            max_keywords=settings.context_max_keywords * 10,
+            version=lambda: self.registry.trigger_version,
+        )
+        self.watcher = ModuleWatcher(self.registry, settings.module_search_paths, settings.module_watch_interval)
+        self.watcher.scan()
+        if settings.events_broker_socket:
+            self.broker = BrokerLink(
+                self.events,
+                Path(settings.events_broker_socket),
+                settings.events_broker_topics,
+                on_remote=self._on_remote_event,
+            )
+        
+        # Storage tiers
+        self.warm = WarmStorage(Path(settings.storage_warm_dir))
+        if settings.storage_warm_redis_url:
+            client = connect(settings.storage_warm_redis_url, settings.storage_warm_redis_pool_size)
+            self.warm = SharedWarmStorage(client, self.warm, ttl=settings.storage_warm_redis_ttl)
+        decoder = None
+        if settings.storage_cold_decode_workers > 0:
+            decoder = DecodePool(settings.storage_cold_decode_workers, settings.storage_cold_decode_concurrency)
+        self.cold = ColdStorage(
+            Path(settings.storage_cold_dir),
+            repack_interval=settings.storage_cold_repack_interval,
+            decoder=decoder,
+        )
+        # Loads run on worker threads, so the hot tier must be thread-safe
+        self.hot = ThreadSafeHotStorage(
+            settings.storage_hot_size,
+            settings.storage_hot_eviction,
+            admission=settings.storage_hot_admission,
+            stripes=settings.storage_hot_stripes,
+        )
+        
+        self.loader = ModuleLoader(self.registry, self.events, hot=self.hot, lower_tiers=(self.warm, self.cold))
+        self.scheduler = LoadScheduler(self.loader, workers=settings.module_load_workers)
+        await self.scheduler.start()
+        self.warmup = ModuleWarmup(self.scheduler, settings.module_warmup_concurrency, settings.module_auto_load)
+        self.migrator = TierMigrator(
+            self.loader,
+            self.warm,
+            self.cold,
+            self.scheduler,
+            interval=settings.migration_interval,
+            hot_idle=settings.migration_hot_idle,
+            warm_idle=settings.migration_warm_idle,
+            io_bytes_per_sec=settings.migration_io_bytes_per_sec,
+        )
+        # Evicted modules are written to the warm tier by the migrator
+        self.hot.lower_tier = self.migrator
+        
+        self.running = True
+        self.tasks = [
+            asyncio.create_task(self.watcher.run()),
+            asyncio.create_task(self.warmup.run()),
+            asyncio.create_task(self.cold.run()),
+            asyncio.create_task(self.migrator.run()),
+        ]
+        if self.broker is not None:
+            self.tasks.append(asyncio.create_task(self.broker.run()))
+
+    def _on_remote_event(self, event: str, data: Any) -> None:
+        """Another worker's registry changed; catch up now instead of at the next poll"""
+        if event in INVALIDATION_EVENTS:
+            self.watcher.request_scan()
         
     async def start(self):
         """Start the server"""
         logger.info("Starting Cortex_2 server...")
-        self.running = True
+        await self.setup()
         
         # TODO: Initialize components
-        # - Module Registry
-        # - Context Analyzer
         # - Identity Manager
         # - Resource Monitor
         # - Learning System
@@ -43,6 +169,9 @@ class CortexServer:
         """Stop the server"""
         logger.info("Stopping Cortex_2 server...")
         self.running = False
+        for component in (self.watcher, self.cold, self.migrator):
+            if component is not None:
+                component.stop()
         
         # Cancel all tasks
         for task in self.tasks:
@@ -50,6 +179,15 @@ class CortexServer:
             
         # Wait for tasks to complete
         await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if self.scheduler is not None:
+            await self.scheduler.stop()
+        if self.stream is not None:
+            self.stream.stop()
+        if self.events is not None:
+            await self.events.close()
+        if self.cold is not None and self.cold.decoder is not None:
+            await asyncio.to_thread(self.cold.decoder.shutdown)
         
         logger.info("Cortex_2 server stopped")
         
@@ -77,6 +215,12 @@ async def main():
         await server.stop()
 
 if __name__ == "__main__":
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     # Ensure logs directory exists
     Path("/Users/bard/Code/cortex_2/logs").mkdir(exist_ok=True)
     
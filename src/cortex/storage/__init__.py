@@ -0,0 +1,10 @@
+"""Storage tiers"""
+from .admission import CountMinSketch, TinyLFUAdmission, make_admission
+from .cold import ColdStorage
+from .concurrent import SizeAccountant, ThreadSafeHotStorage
+from .decode import DecodeError, DecodePool
+from .eviction import EvictionPolicy, LFUPolicy, LRUPolicy, PriorityPolicy, make_policy
+from .hot import HotStorage, replay
+from .shared import SharedWarmStorage, connect
+from .types import StorageTier
+from .warm import WarmStorage
@@ -0,0 +1,94 @@
+"""TinyLFU admission for the hot tier
+
+A count-min sketch estimates how often each module has been requested
+recently. When admitting a module would evict others, the candidate only
+gets in if it is requested more often than everything it would displace
+combined, so a one-off scan of a large module cannot flush out a set of
+small, popular ones.
+"""
+from hashlib import blake2b
+from typing import Iterable, List, Optional
+
+# Counters saturate at 15, as in the 4-bit counters of the TinyLFU paper
+MAX_COUNT = 15
+
+
+class CountMinSketch:
+    """Approximate frequency counts with periodic aging
+
+    After sample_size increments every counter is halved, so estimates
+    follow recent popularity instead of all-time totals.
+    """
+
+    def __init__(self, width: int = 1024, depth: int = 4, sample_size: Optional[int] = None):
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self.depth = depth
+        self.rows = [bytearray(self.width) for _ in range(depth)]
+        self.sample_size = sample_size or 10 * self.width
+        self.additions = 0
+        self.resets = 0
+
+    def _slots(self, key: str) -> List[int]:
+        digest = blake2b(key.encode(), digest_size=8).digest()
+        h1 = int.from_bytes(digest[:4], "little")
+        h2 = int.from_bytes(digest[4:], "little") | 1
+        mask = self.width - 1
+        return [(h1 + i * h2) & mask for i in range(self.depth)]
+
+    def increment(self, key: str) -> None:
+        slots = self._slots(key)
+        current = min(row[slot] for row, slot in zip(self.rows, slots))
+        if current < MAX_COUNT:
+            # Conservative update: only raise the counters at the minimum
+            for row, slot in zip(self.rows, slots):
+                if row[slot] == current:
+                    row[slot] = current + 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.age()
+
+    def estimate(self, key: str) -> int:
+        return min(row[slot] for row, slot in zip(self.rows, self._slots(key)))
+
+    def age(self) -> None:
+        """Halve every counter"""
+        for row in self.rows:
+            row[:] = bytes(count >> 1 for count in row)
+        self.additions //= 2
+        self.resets += 1
+
+
+class TinyLFUAdmission:
+    """Admits a candidate only if it is hotter than the victims it displaces"""
+
+    def __init__(self, expected_items: int = 1024):
+        self.sketch = CountMinSketch(width=expected_items)
+        self.admitted = 0
+        self.rejected = 0
+
+    def record(self, key: str) -> None:
+        self.sketch.increment(key)
+
+    def frequency(self, key: str) -> int:
+        return self.sketch.estimate(key)
+
+    def admit(self, candidate: str, victims: Iterable[str]) -> bool:
+        displaced = sum(self.sketch.estimate(victim) for victim in victims)
+        if self.sketch.estimate(candidate) > displaced:
+            self.admitted += 1
+            return True
+        self.rejected += 1
+        return False
+
+
+ADMISSION_FILTERS = {"tinylfu": TinyLFUAdmission}
+
+
+def make_admission(name: str) -> Optional[TinyLFUAdmission]:
+    """Admission filter by name; "none" admits everything"""
+    if name == "none":
+        return None
+    try:
+        return ADMISSION_FILTERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown admission filter: {name}") from None
@@ -0,0 +1,91 @@
+"""Content blobs shared between the module payloads of a disk tier
+
+Payloads built by tier_payload() carry each content file's digest. The
+warm and cold tiers store such files once per digest, as blobs, and
+keep only the digests in the module's own record, so identical files
+shipped by several modules (or kept across versions of one module) take
+space on disk once. Blobs are reference counted per module and dropped
+with the last module that points at them.
+"""
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def split_blobs(module_data: Any) -> Tuple[Any, Dict[str, Any]]:
+    """(payload with digested files left out, digest -> file content)
+
+    Anything that is not a tier payload with digests is returned as is.
+    """
+    if not isinstance(module_data, Mapping) or not module_data.get("digests"):
+        return module_data, {}
+    digests = module_data["digests"]
+    blobs: Dict[str, Any] = {}
+    content: Dict[str, Dict[str, Any]] = {}
+    for section, files in module_data["content"].items():
+        keys = digests.get(section, {})
+        content[section] = {}
+        for relative, data in files.items():
+            if relative in keys:
+                blobs[keys[relative][0]] = data
+            else:
+                content[section][relative] = data
+    return {**module_data, "content": content}, blobs
+
+
+def join_blobs(module_data: Any, fetch: Callable[[str], Any]) -> Optional[Any]:
+    """Inverse of split_blobs; None if a blob cannot be fetched"""
+    if not isinstance(module_data, dict) or not module_data.get("digests"):
+        return module_data
+    content = module_data["content"]
+    for section, keys in module_data["digests"].items():
+        files = content.setdefault(section, {})
+        for relative, (digest, _size) in keys.items():
+            data = fetch(digest)
+            if data is None:
+                return None
+            files[relative] = data
+    return module_data
+
+
+def blob_digests(module_data: Any) -> List[str]:
+    """Digests a stored payload refers to"""
+    if not isinstance(module_data, Mapping) or not module_data.get("digests"):
+        return []
+    return sorted({key[0] for keys in module_data["digests"].values() for key in keys.values()})
+
+
+class BlobRefs:
+    """Which blobs each module refers to, and how many modules share each
+
+    Not thread-safe; tiers call it under their own lock.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.modules: Dict[str, List[str]] = {}
+
+    def link(self, module_id: str, digests: List[str]) -> Tuple[List[str], List[str]]:
+        """Point module_id at digests; (newly referenced, no longer referenced)"""
+        added = []
+        for digest in digests:
+            self.counts[digest] = self.counts.get(digest, 0) + 1
+            if self.counts[digest] == 1:
+                added.append(digest)
+        # Drop the previous version's references last so shared blobs survive
+        dropped = self.unlink(module_id)
+        self.modules[module_id] = list(digests)
+        return added, dropped
+
+    def unlink(self, module_id: str) -> List[str]:
+        """Forget module_id's references; blobs nothing refers to any more"""
+        dropped = []
+        for digest in self.modules.pop(module_id, ()):
+            self.counts[digest] -= 1
+            if self.counts[digest] <= 0:
+                del self.counts[digest]
+                dropped.append(digest)
+        return dropped
+
+    def bytes_saved(self, size_of: Callable[[str], int]) -> int:
+        """Bytes that storing each shared blob once saves"""
+        return sum((count - 1) * size_of(digest) for digest, count in self.counts.items())
@@ -0,0 +1,23 @@
+"""msgpack encoding shared by the on-disk tiers"""
+from collections.abc import Mapping
+from typing import Any
+
+import msgpack
+
+
+def _encode(obj: Any) -> Any:
+    # Content from the ContentStore is frozen into MappingProxyType/frozenset
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Cannot serialize {type(obj).__name__} to a storage tier")
+
+
+def pack(module_data: Any) -> bytes:
+    return msgpack.packb(module_data, default=_encode, use_bin_type=True)
+
+
+def unpack(payload: Any) -> Any:
+    """Decode a msgpack payload (bytes or memoryview)"""
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False)
@@ -0,0 +1,327 @@
+"""Cold tier - lzma-compressed modules in append-only pack files
+
+Modules are appended to a few large `pack-NNNNNN.pack` files instead of
+one file each, so tens of thousands of archived modules don't exhaust
+inodes. Only the offset table lives in memory; retrieving a module is one
+seek and one read. Overwrites and deletes (which append a tombstone)
+leave garbage behind that repack() reclaims by copying the live records
+out of mostly-dead packs. Content files with a digest are appended once
+each as blob records and shared by every module record listing them;
+a blob no module refers to any more is garbage.
+
+Record layout: header (kind, id length, payload length, crc32), module
+id (or blob digest), payload. Only the newest pack is ever appended to.
+Given a DecodePool, large records are decompressed in another process.
+"""
+import asyncio
+import logging
+import lzma
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .blobs import BlobRefs, blob_digests, join_blobs, split_blobs
+from .codec import pack, unpack
+from .decode import DecodeError, DecodePool
+from .types import StorageTier
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct("<BHII")
+PUT, TOMBSTONE, BLOB = 1, 0, 2
+
+
+@dataclass(frozen=True)
+class PackRecord:
+    kind: int
+    module_id: str
+    pack: int
+    start: int  # of the header
+    offset: int  # of the payload
+    length: int
+    crc: int
+
+    @property
+    def size(self) -> int:
+        return self.offset + self.length - self.start
+
+
+class ColdStorage:
+    """Heavily compressed archive of rarely used modules
+
+    Thread-safe; run() repacks in the background until stop().
+    """
+
+    tier = StorageTier.COLD
+
+    def __init__(
+        self,
+        archive_dir: Path,
+        max_pack_size: int = 64 * 1024 * 1024,
+        preset: int = 6,
+        garbage_threshold: float = 0.5,
+        repack_interval: float = 300.0,
+        decoder: Optional[DecodePool] = None,
+        offload_min_bytes: int = 64 * 1024,
+    ):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.max_pack_size = max_pack_size
+        self.preset = preset
+        self.garbage_threshold = garbage_threshold
+        self.repack_interval = repack_interval
+        self.decoder = decoder
+        # Smaller records decode faster inline than the round trip to a worker
+        self.offload_min_bytes = offload_min_bytes
+        self.index: Dict[str, PackRecord] = {}
+        self.blobs: Dict[str, PackRecord] = {}
+        self.refs = BlobRefs()
+        self.pack_sizes: Dict[int, int] = {}
+        self.garbage: Dict[int, int] = {}
+        self.repacks = 0
+        self._lock = threading.Lock()
+        self._running = False
+        for pack_no in sorted(self._existing_packs()):
+            self._load_pack(pack_no)
+        self._active = max(self.pack_sizes, default=0)
+        self.pack_sizes.setdefault(self._active, 0)
+        self.garbage.setdefault(self._active, 0)
+        if self.blobs:
+            self._load_refs()
+        logger.debug(f"Cold tier at {self.archive_dir}: {len(self.index)} modules in {len(self.pack_sizes)} packs")
+
+    def __contains__(self, module_id: str) -> bool:
+        return module_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    # Pack files
+
+    def _pack_path(self, pack_no: int) -> Path:
+        return self.archive_dir / f"pack-{pack_no:06d}.pack"
+
+    def _existing_packs(self) -> List[int]:
+        return [int(p.stem.split("-")[1]) for p in self.archive_dir.glob("pack-*.pack")]
+
+    def _scan(self, pack_no: int) -> Iterator[PackRecord]:
+        """Records in a pack, stopping at a torn tail"""
+        path = self._pack_path(pack_no)
+        size = path.stat().st_size
+        with open(path, "rb") as f:
+            start = 0
+            while start + HEADER.size <= size:
+                kind, id_len, length, crc = HEADER.unpack(f.read(HEADER.size))
+                offset = start + HEADER.size + id_len
+                if offset + length > size:
+                    break
+                module_id = f.read(id_len).decode()
+                f.seek(length, os.SEEK_CUR)
+                yield PackRecord(kind, module_id, pack_no, start, offset, length, crc)
+                start = offset + length
+
+    def _load_pack(self, pack_no: int) -> None:
+        self.pack_sizes[pack_no] = 0
+        self.garbage[pack_no] = 0
+        end = 0
+        for record in self._scan(pack_no):
+            self._apply(record)
+            end = record.offset + record.length
+        if end < self._pack_path(pack_no).stat().st_size:
+            logger.warning(f"Truncating torn write at the end of pack {pack_no}")
+            os.truncate(self._pack_path(pack_no), end)
+        self.pack_sizes[pack_no] = end
+
+    def _load_refs(self) -> None:
+        """Rebuild blob reference counts from the module records"""
+        for module_id, record in self.index.items():
+            payload = self._read(record)
+            if zlib.crc32(payload) != record.crc:
+                logger.error(f"Corrupt cold record for {module_id} in pack {record.pack}")
+                continue
+            digests = blob_digests(unpack(lzma.decompress(payload)))
+            self.refs.link(module_id, [d for d in digests if d in self.blobs])
+        for digest in set(self.blobs) - set(self.refs.counts):
+            self._drop_blob(digest)
+
+    def _apply(self, record: PackRecord) -> None:
+        """Point the index at a newer record; caller holds the lock"""
+        if record.kind == BLOB:
+            previous = self.blobs.get(record.module_id)
+            if previous is not None:
+                self.garbage[previous.pack] += previous.size
+            self.blobs[record.module_id] = record
+            return
+        previous = self.index.pop(record.module_id, None)
+        if previous is not None:
+            self.garbage[previous.pack] += previous.size
+        if record.kind == PUT:
+            self.index[record.module_id] = record
+        else:
+            self.garbage[record.pack] += record.size
+
+    def _drop_blob(self, digest: str) -> None:
+        """Forget a blob nothing refers to; caller holds the lock"""
+        record = self.blobs.pop(digest)
+        self.garbage[record.pack] += record.size
+
+    def _roll_over(self) -> None:
+        self._active += 1
+        self.pack_sizes[self._active] = 0
+        self.garbage[self._active] = 0
+
+    def _append(self, kind: int, module_id: str, payload: bytes, crc: Optional[int] = None) -> PackRecord:
+        """Append to the newest pack, rolling over when full; caller holds the lock"""
+        if self.pack_sizes[self._active] >= self.max_pack_size:
+            self._roll_over()
+        name = module_id.encode()
+        crc = zlib.crc32(payload) if crc is None else crc
+        start = self.pack_sizes[self._active]
+        with open(self._pack_path(self._active), "ab") as f:
+            f.write(HEADER.pack(kind, len(name), len(payload), crc) + name + payload)
+        record = PackRecord(kind, module_id, self._active, start, start + HEADER.size + len(name), len(payload), crc)
+        self.pack_sizes[self._active] = record.offset + record.length
+        self._apply(record)
+        return record
+
+    # Tier interface
+
+    def _compress(self, data: Any) -> bytes:
+        return lzma.compress(pack(data), preset=self.preset)
+
+    def archive(self, module_id: str, module_data: Any) -> None:
+        module_data, blobs = split_blobs(module_data)
+        # Compressed outside the lock; a blob archived meanwhile is skipped
+        fresh = {digest: self._compress(data) for digest, data in blobs.items() if digest not in self.blobs}
+        payload = self._compress(module_data)
+        with self._lock:
+            for digest, data in blobs.items():
+                if digest not in self.blobs:
+                    self._append(BLOB, digest, fresh.get(digest) or self._compress(data))
+            self._append(PUT, module_id, payload)
+            for digest in self.refs.link(module_id, list(blobs))[1]:
+                self._drop_blob(digest)
+
+    store = archive
+
+    def _read(self, record: PackRecord) -> bytes:
+        with open(self._pack_path(record.pack), "rb", buffering=0) as f:
+            f.seek(record.offset)
+            return f.read(record.length)
+
+    def _decode(self, table: Dict[str, PackRecord], key: str) -> Any:
+        """Decoded payload of the record under key in table (index or blobs)"""
+        for _ in range(2):
+            record = table.get(key)
+            if record is None:
+                return None
+            try:
+                if self.decoder is not None and record.length >= self.offload_min_bytes:
+                    return self.decoder.decode(self._pack_path(record.pack), record.offset, record.length, record.crc)
+                payload = self._read(record)
+                break
+            except FileNotFoundError:
+                # Repacked away between the lookup and the read
+                continue
+            except DecodeError:
+                logger.error(f"Corrupt cold record for {key} in pack {record.pack}")
+                return None
+        else:
+            return None
+        if zlib.crc32(payload) != record.crc:
+            logger.error(f"Corrupt cold record for {key} in pack {record.pack}")
+            return None
+        return unpack(lzma.decompress(payload))
+
+    def retrieve(self, module_id: str) -> Any:
+        """The module's payload with its shared files filled back in"""
+        module_data = self._decode(self.index, module_id)
+        if module_data is None:
+            return None
+        return join_blobs(module_data, lambda digest: self._decode(self.blobs, digest))
+
+    def remove(self, module_id: str) -> bool:
+        with self._lock:
+            if module_id not in self.index:
+                return False
+            self._append(TOMBSTONE, module_id, b"")
+            for digest in self.refs.unlink(module_id):
+                self._drop_blob(digest)
+        return True
+
+    def module_ids(self) -> List[str]:
+        return list(self.index)
+
+    # Garbage collection
+
+    def repack(self, threshold: Optional[float] = None) -> int:
+        """Rewrite sealed packs that are mostly garbage; returns bytes reclaimed"""
+        threshold = self.garbage_threshold if threshold is None else threshold
+        with self._lock:
+            candidates = [
+                pack_no for pack_no, size in self.pack_sizes.items()
+                if size and self.garbage[pack_no] / size >= threshold
+            ]
+            if self._active in candidates:
+                # Seal the newest pack so its live records can move out
+                self._roll_over()
+        return sum(self._repack_one(pack_no) for pack_no in sorted(candidates))
+
+    def _repack_one(self, pack_no: int) -> int:
+        # Sealed packs are immutable, so they can be scanned without the lock
+        records = list(self._scan(pack_no))
+        copied = 0
+        for record in records:
+            with self._lock:
+                if record.kind == PUT:
+                    if self.index.get(record.module_id) != record:
+                        continue
+                elif record.kind == BLOB:
+                    if self.blobs.get(record.module_id) != record:
+                        continue
+                elif pack_no == min(self.pack_sizes) or record.module_id in self.index:
+                    # Nothing older left to shadow, or a newer put supersedes it
+                    continue
+                self._append(record.kind, record.module_id, self._read(record), record.crc)
+                copied += record.size
+        with self._lock:
+            reclaimed = self.pack_sizes.pop(pack_no) - copied
+            del self.garbage[pack_no]
+            self._pack_path(pack_no).unlink()
+            self.repacks += 1
+        logger.info(f"Repacked cold pack {pack_no}, reclaimed {reclaimed} bytes")
+        return reclaimed
+
+    async def run(self) -> None:
+        """Repack periodically until stop() is called"""
+        self._running = True
+        while self._running:
+            await asyncio.sleep(self.repack_interval)
+            if self._running:
+                try:
+                    await asyncio.to_thread(self.repack)
+                except Exception as e:
+                    logger.error(f"Cold tier repack failed: {e}")
+
+    def stop(self) -> None:
+        self._running = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.pack_sizes.values())
+            garbage = sum(self.garbage.values())
+            return {
+                "modules": len(self.index),
+                "blobs": len(self.blobs),
+                "blob_bytes": sum(record.size for record in self.blobs.values()),
+                "blob_bytes_saved": self.refs.bytes_saved(lambda digest: self.blobs[digest].size),
+                "packs": len(self.pack_sizes),
+                "bytes_on_disk": total,
+                "garbage_bytes": garbage,
+                "repacks": self.repacks,
+                "decode": self.decoder.stats() if self.decoder is not None else None,
+            }
@@ -0,0 +1,402 @@
+"""Thread-safe hot tier with lock striping
+
+Modules are spread over stripes by key, each with its own lock, dict and
+eviction policy, so loader threads touching different modules don't
+contend. Capacity is tracked by a single SizeAccountant: space is reserved
+before a module is inserted, so concurrent stores can never push the tier
+over max_size. A store reserves what is free, then picks victims covering
+the rest and keeps the space they free for itself; nothing is evicted
+unless the victims found are enough. Victims are taken one at a time
+from a merge of the stripes' heads; each stripe caches its head until a
+store, or a read or removal of the head itself, may have changed it, so
+an eviction costs a few dictionary lookups whatever the tier holds.
+
+Lock order: a stripe lock is never held while taking another stripe's
+lock, the accountant's, or the admission filter's.
+"""
+import heapq
+import itertools
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .admission import TinyLFUAdmission, make_admission
+from .eviction import PROTECTED_PRIORITIES, EvictionPolicy, make_policy
+from .hot import token_size
+
+logger = logging.getLogger(__name__)
+
+
+class SizeAccountant:
+    """Globally consistent token budget"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_reserve(self, size: int) -> bool:
+        with self._lock:
+            if self.used + size > self.capacity:
+                return False
+            self.used += size
+            return True
+
+    def reserve_up_to(self, size: int) -> int:
+        """Reserve as much of size as is free; returns the amount reserved"""
+        with self._lock:
+            amount = max(0, min(size, self.capacity - self.used))
+            self.used += amount
+            return amount
+
+    def release(self, size: int) -> None:
+        with self._lock:
+            self.used -= size
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self.used
+
+
+class _Stripe:
+    __slots__ = (
+        "lock", "modules", "sizes", "stamps", "policy", "pending", "head", "used", "pinned", "pinned_size",
+        "hits", "misses", "hit_tokens", "miss_tokens",
+    )
+
+    def __init__(self, policy: EvictionPolicy):
+        self.lock = threading.Lock()
+        self.modules: Dict[str, Any] = {}
+        self.sizes: Dict[str, int] = {}
+        self.stamps: Dict[str, int] = {}
+        self.policy = policy
+        self.pending: List[str] = []  # reads not yet fed to the admission filter
+        self.head: Optional[Tuple] = None  # (rank, stamp, id, size) of the next victim, () if none; None if stale
+        self.used = 0
+        self.pinned: Set[str] = set()  # protected priorities, never victims
+        self.pinned_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.hit_tokens = 0
+        self.miss_tokens = 0
+
+
+class ThreadSafeHotStorage:
+    """Drop-in HotStorage for concurrent access
+
+    Each stripe evicts by its own policy; across stripes the victim is the
+    stripe candidate with the lowest policy rank, then the oldest access.
+    """
+
+    thread_safe = True
+
+    def __init__(
+        self,
+        max_size: int = 50000,
+        eviction: str = "lru",
+        lower_tier: Any = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+        admission: str = "none",
+        stripes: int = 16,
+    ):
+        self.max_size = max_size
+        self.accountant = SizeAccountant(max_size)
+        self._stripes = [_Stripe(make_policy(eviction)) for _ in range(max(1, stripes))]
+        self._clock = itertools.count()
+        self.lower_tier = lower_tier
+        self.on_evict = on_evict
+        self.admission: Optional[TinyLFUAdmission] = make_admission(admission)
+        self._admission_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.evictions = 0
+        self.rejections = 0
+
+    def _stripe(self, module_id: str) -> _Stripe:
+        return self._stripes[hash(module_id) % len(self._stripes)]
+
+    @property
+    def current_size(self) -> int:
+        return self.accountant.used
+
+    @property
+    def modules(self) -> Dict[str, Any]:
+        """Snapshot of resident modules"""
+        snapshot: Dict[str, Any] = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                snapshot.update(stripe.modules)
+        return snapshot
+
+    @property
+    def sizes(self) -> Dict[str, int]:
+        snapshot: Dict[str, int] = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                snapshot.update(stripe.sizes)
+        return snapshot
+
+    def __contains__(self, module_id: str) -> bool:
+        stripe = self._stripe(module_id)
+        with stripe.lock:
+            return module_id in stripe.modules
+
+    def __len__(self) -> int:
+        return sum(len(stripe.modules) for stripe in self._stripes)
+
+    def store(
+        self,
+        module_id: str,
+        module_data: Any,
+        size: Optional[int] = None,
+        priority: str = "normal",
+        force: bool = False,
+    ) -> bool:
+        """Admit a module, evicting others if needed (see HotStorage.store)"""
+        size = token_size(module_data) if size is None else size
+        if size > self.max_size:
+            return False
+        stripe = self._stripe(module_id)
+        screen = (
+            self.admission is not None
+            and not force
+            and priority not in PROTECTED_PRIORITIES
+            and module_id not in self
+        )
+        reserved = self.accountant.reserve_up_to(size)
+        while reserved < size:
+            victims = self._victims_for(size - reserved, module_id)
+            if victims is None:
+                self.accountant.release(reserved)
+                return False
+            if screen:
+                screen = False
+                self._drain_reads()
+                with self._admission_lock:
+                    admitted = self.admission.admit(module_id, victims)
+                if not admitted:
+                    self.accountant.release(reserved)
+                    with self._stats_lock:
+                        self.rejections += 1
+                    logger.debug(f"Hot tier rejected {module_id} ({size} tokens)")
+                    return False
+            for victim in victims:
+                taken = self._take(victim)
+                if taken is None:
+                    # Lost a race; its space went back to the pool
+                    continue
+                reserved += taken[1]
+                if victim != module_id:
+                    self._demote(victim, taken[0])
+            reserved += self.accountant.reserve_up_to(size - reserved)
+        if reserved > size:
+            self.accountant.release(reserved - size)
+
+        with stripe.lock:
+            replaced = stripe.sizes.get(module_id)
+            if replaced is not None:
+                stripe.used -= replaced
+                if module_id in stripe.pinned:
+                    stripe.pinned.discard(module_id)
+                    stripe.pinned_size -= replaced
+            stripe.modules[module_id] = module_data
+            stripe.sizes[module_id] = size
+            stripe.stamps[module_id] = next(self._clock)
+            stripe.policy.add(module_id, priority)
+            stripe.head = None
+            stripe.used += size
+            if priority in PROTECTED_PRIORITIES:
+                stripe.pinned.add(module_id)
+                stripe.pinned_size += size
+        if replaced is not None:
+            # A concurrent store of the same module won the race
+            self.accountant.release(replaced)
+        return True
+
+    def retrieve(self, module_id: str, size: Optional[int] = None) -> Any:
+        stripe = self._stripe(module_id)
+        reads = None
+        with stripe.lock:
+            if self.admission is not None:
+                stripe.pending.append(module_id)
+                if len(stripe.pending) >= 64:
+                    reads, stripe.pending = stripe.pending, []
+            if module_id in stripe.modules:
+                stripe.hits += 1
+                stripe.hit_tokens += stripe.sizes[module_id]
+                stripe.policy.touch(module_id)
+                stripe.stamps[module_id] = next(self._clock)
+                if stripe.head and stripe.head[2] == module_id:
+                    stripe.head = None
+                data = stripe.modules[module_id]
+            else:
+                stripe.misses += 1
+                stripe.miss_tokens += size or 0
+                data = None
+        if reads:
+            self._record_reads(reads)
+        return data
+
+    def _record_reads(self, reads: List[str]) -> None:
+        with self._admission_lock:
+            for module_id in reads:
+                self.admission.record(module_id)
+
+    def _drain_reads(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                reads, stripe.pending = stripe.pending, []
+            if reads:
+                self._record_reads(reads)
+
+    def _victims_for(self, needed: int, module_id: str) -> Optional[List[str]]:
+        """Victims freeing needed tokens, in global eviction order; None if none do
+
+        A resident copy of module_id, about to be replaced, goes first.
+        The rest come one at a time from a merge of each stripe's next few
+        candidates, a stripe being read further only once its share runs out.
+        """
+        victims = []
+        stripe = self._stripe(module_id)
+        with stripe.lock:
+            resident = stripe.sizes.get(module_id)
+            own = resident if resident is not None and module_id not in stripe.pinned else 0
+        if resident is not None:
+            victims.append(module_id)
+            needed -= resident
+            if needed <= 0:
+                return victims
+        # A store that cannot fit is turned away without reading any stripe
+        if sum(s.used - s.pinned_size for s in self._stripes) - own < needed:
+            return None
+
+        stripes = self._stripes
+        heap: List[Tuple[int, int, str, int, int]] = []
+        depth = [1] * len(stripes)
+        left = [0] * len(stripes)
+        more = [False] * len(stripes)
+        for n, stripe in enumerate(stripes):
+            head = stripe.head
+            if head is None:
+                head = self._head(stripe)
+            if head:
+                more[n] = True
+                if head[2] != module_id:
+                    heap.append(head + (n,))
+                    left[n] = 1
+        heapq.heapify(heap)
+
+        def pull(n: int) -> None:
+            """Read the next candidates of a stripe whose share ran out"""
+            stripe = stripes[n]
+            depth[n] *= 4
+            with stripe.lock:
+                heads = [
+                    (stripe.policy.rank(m), stripe.stamps[m], m, stripe.sizes[m])
+                    for m in itertools.islice(stripe.policy.victims(), depth[n])
+                ]
+            more[n] = len(heads) == depth[n]
+            seen = {module_id, *victims, *(entry[2] for entry in heap)}
+            for head in heads:
+                if head[2] not in seen:
+                    heapq.heappush(heap, head + (n,))
+                    left[n] += 1
+
+        for n in range(len(stripes)):
+            while not left[n] and more[n]:
+                pull(n)
+        while heap:
+            _, _, victim, size, n = heapq.heappop(heap)
+            victims.append(victim)
+            needed -= size
+            if needed <= 0:
+                return victims
+            left[n] -= 1
+            # Refill before the stripe's next candidate could be needed
+            while not left[n] and more[n]:
+                pull(n)
+        return None
+
+    @staticmethod
+    def _head(stripe: _Stripe) -> Tuple:
+        """The stripe's next victim as (rank, stamp, id, size), () if it has none"""
+        head = stripe.head
+        if head is None:
+            with stripe.lock:
+                victim = stripe.policy.victim()
+                if victim is None:
+                    head = ()
+                else:
+                    head = (stripe.policy.rank(victim), stripe.stamps[victim], victim, stripe.sizes[victim])
+                stripe.head = head
+        return head
+
+    def remove(self, module_id: str) -> bool:
+        return self._discard(module_id) is not None
+
+    def evict(self, module_id: str) -> Any:
+        """Move a module down a tier; returns its data, None if already gone"""
+        data = self._discard(module_id)
+        if data is None:
+            return None
+        self._demote(module_id, data)
+        return data
+
+    def _demote(self, module_id: str, data: Any) -> None:
+        with self._stats_lock:
+            self.evictions += 1
+        if self.lower_tier is not None:
+            self.lower_tier.store(module_id, data)
+        if self.on_evict is not None:
+            self.on_evict(module_id, data)
+        logger.debug(f"Evicted {module_id} from hot tier")
+
+    def _discard(self, module_id: str) -> Any:
+        taken = self._take(module_id)
+        if taken is None:
+            return None
+        self.accountant.release(taken[1])
+        return taken[0]
+
+    def _take(self, module_id: str) -> Optional[Tuple[Any, int]]:
+        """Unlink a module, keeping its space reserved; (data, size) or None"""
+        stripe = self._stripe(module_id)
+        with stripe.lock:
+            if module_id not in stripe.modules:
+                return None
+            data = stripe.modules.pop(module_id)
+            size = stripe.sizes.pop(module_id)
+            del stripe.stamps[module_id]
+            stripe.policy.remove(module_id)
+            if stripe.head and stripe.head[2] == module_id:
+                stripe.head = None
+            stripe.used -= size
+            if module_id in stripe.pinned:
+                stripe.pinned.discard(module_id)
+                stripe.pinned_size -= size
+        return data, size
+
+    def get_free_space(self) -> int:
+        return self.accountant.free
+
+    def module_ids(self) -> List[str]:
+        return list(self.modules)
+
+    def stats(self) -> Dict[str, Any]:
+        """Same shape as HotStorage.stats()"""
+        hits = misses = hit_tokens = miss_tokens = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                hits += stripe.hits
+                misses += stripe.misses
+                hit_tokens += stripe.hit_tokens
+                miss_tokens += stripe.miss_tokens
+        requests = hits + misses
+        requested_tokens = hit_tokens + miss_tokens
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / requests, 4) if requests else 0.0,
+            "byte_hit_ratio": round(hit_tokens / requested_tokens, 4) if requested_tokens else 0.0,
+            "evictions": self.evictions,
+            "rejections": self.rejections,
+        }
@@ -0,0 +1,137 @@
+"""Cold-tier decompression in a process pool
+
+lzma-decompressing a large archived module is seconds of CPU. On a
+thread it still competes with the event loop for the GIL, so cold loads
+would stall every other request on the worker. Records are instead read
+and decompressed by pool processes, which hand the raw msgpack back in a
+shared memory block: only the block's name crosses the pipe, and the
+caller unpacks straight from the mapped buffer.
+"""
+import lzma
+import multiprocessing
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .codec import unpack
+
+
+class DecodeError(Exception):
+    pass
+
+
+def _decode_record(path: str, offset: int, length: int, crc: int) -> Tuple[str, int]:
+    """Runs in a pool process: read, verify and decompress one record"""
+    with open(path, "rb", buffering=0) as f:
+        f.seek(offset)
+        payload = f.read(length)
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise DecodeError(f"corrupt record at {path}:{offset}")
+    raw = lzma.decompress(payload)
+    shm = SharedMemory(create=True, size=max(len(raw), 1))
+    shm.buf[: len(raw)] = raw
+    # Ownership passes to the caller, which unlinks the block
+    resource_tracker.unregister(shm._name, "shared_memory")
+    shm.close()
+    return shm.name, len(raw)
+
+
+def _take(name: str, size: int) -> Any:
+    """Unpack a worker's result and free its shared memory block"""
+    shm = SharedMemory(name=name)
+    view = shm.buf[:size]
+    try:
+        return unpack(view)
+    finally:
+        view.release()
+        shm.close()
+        shm.unlink()
+
+
+class DecodePool:
+    """Bounded process pool for cold record decompression
+
+    decode() blocks the calling thread (a load worker), never the event
+    loop. At most max_in_flight records are being decoded at once; callers
+    beyond that wait, and are counted in the queue-depth metrics.
+    """
+
+    def __init__(self, workers: int = 2, max_in_flight: Optional[int] = None):
+        self.workers = max(1, workers)
+        self.max_in_flight = max_in_flight or self.workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.in_flight = 0
+        self.peak_waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=1024)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs threads is unsafe
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def decode(self, path: Path, offset: int, length: int, crc: int) -> Any:
+        """Decompress and unpack the record at path[offset:offset + length]"""
+        pool = self._pool()
+        start = time.perf_counter()
+        with self._lock:
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+        self._slots.acquire()
+        with self._lock:
+            self.waiting -= 1
+            self.in_flight += 1
+        try:
+            name, size = pool.submit(_decode_record, str(path), offset, length, crc).result()
+            data = _take(name, size)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+                self.latencies_ms.append((time.perf_counter() - start) * 1000)
+            return data
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def percentile(self, pct: float) -> float:
+        with self._lock:
+            ordered = sorted(self.latencies_ms)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {
+                "workers": self.workers,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self.in_flight,
+                "queue_depth": self.waiting,
+                "peak_queue_depth": self.peak_waiting,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+        return {**counts, "p50_ms": round(self.percentile(50), 2), "p99_ms": round(self.percentile(99), 2)}
@@ -0,0 +1,194 @@
+"""Eviction policies for the hot tier
+
+Every operation is O(1): LRU is an ordered dict, LFU keeps keys in a
+linked list of frequency buckets, and priority keeps one LRU per class.
+No policy nominates a key added with a protected (critical) priority.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Set
+
+# Least important first; critical modules are never chosen as victims
+EVICTION_ORDER = ("background", "normal", "high")
+PROTECTED_PRIORITIES = frozenset({"critical"})
+
+
+class EvictionPolicy:
+    """Tracks keys and nominates the next victim"""
+
+    def add(self, key: str, priority: str = "normal") -> None:
+        raise NotImplementedError
+
+    def touch(self, key: str) -> None:
+        raise NotImplementedError
+
+    def remove(self, key: str) -> None:
+        raise NotImplementedError
+
+    def victims(self) -> Iterator[str]:
+        """Keys in the order they would be evicted"""
+        raise NotImplementedError
+
+    def victim(self) -> Optional[str]:
+        return next(self.victims(), None)
+
+    def rank(self, key: str) -> int:
+        """Coarse eviction order for comparing victims across policies
+
+        Lower goes first; ties are broken by recency.
+        """
+        return 0
+
+
+class LRUPolicy(EvictionPolicy):
+    def __init__(self):
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+        self._protected: Set[str] = set()
+
+    def add(self, key: str, priority: str = "normal") -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+        if priority in PROTECTED_PRIORITIES:
+            self._protected.add(key)
+        else:
+            self._protected.discard(key)
+
+    def touch(self, key: str) -> None:
+        self._order.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        self._order.pop(key, None)
+        self._protected.discard(key)
+
+    def victims(self) -> Iterator[str]:
+        return (key for key in self._order if key not in self._protected)
+
+
+class _FreqNode:
+    __slots__ = ("freq", "keys", "prev", "next")
+
+    def __init__(self, freq: int):
+        self.freq = freq
+        self.keys: "OrderedDict[str, None]" = OrderedDict()
+        self.prev: Optional["_FreqNode"] = None
+        self.next: Optional["_FreqNode"] = None
+
+
+class LFUPolicy(EvictionPolicy):
+    """O(1) LFU; ties within a frequency are broken by recency"""
+
+    def __init__(self):
+        self._head: Optional[_FreqNode] = None  # lowest frequency
+        self._nodes: Dict[str, _FreqNode] = {}
+        self._protected: Set[str] = set()
+
+    def _insert_after(self, node: Optional[_FreqNode], freq: int) -> _FreqNode:
+        new = _FreqNode(freq)
+        if node is None:
+            new.next = self._head
+            if self._head:
+                self._head.prev = new
+            self._head = new
+        else:
+            new.prev, new.next = node, node.next
+            if node.next:
+                node.next.prev = new
+            node.next = new
+        return new
+
+    def _unlink_if_empty(self, node: _FreqNode) -> None:
+        if node.keys:
+            return
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self._head = node.next
+        if node.next:
+            node.next.prev = node.prev
+
+    def add(self, key: str, priority: str = "normal") -> None:
+        if priority in PROTECTED_PRIORITIES:
+            self._protected.add(key)
+        else:
+            self._protected.discard(key)
+        if key in self._nodes:
+            self.touch(key)
+            return
+        node = self._head if self._head and self._head.freq == 1 else self._insert_after(None, 1)
+        node.keys[key] = None
+        self._nodes[key] = node
+
+    def touch(self, key: str) -> None:
+        node = self._nodes[key]
+        nxt = node.next
+        if nxt is None or nxt.freq != node.freq + 1:
+            nxt = self._insert_after(node, node.freq + 1)
+        del node.keys[key]
+        nxt.keys[key] = None
+        self._nodes[key] = nxt
+        self._unlink_if_empty(node)
+
+    def remove(self, key: str) -> None:
+        self._protected.discard(key)
+        node = self._nodes.pop(key, None)
+        if node is not None:
+            del node.keys[key]
+            self._unlink_if_empty(node)
+
+    def victims(self) -> Iterator[str]:
+        node = self._head
+        while node is not None:
+            for key in node.keys:
+                if key not in self._protected:
+                    yield key
+            node = node.next
+
+    def frequency(self, key: str) -> int:
+        return self._nodes[key].freq
+
+    def rank(self, key: str) -> int:
+        return self.frequency(key)
+
+
+class PriorityPolicy(EvictionPolicy):
+    """Evicts the least important class first, LRU within a class
+
+    Critical (core) modules are tracked but never nominated.
+    """
+
+    def __init__(self):
+        self._classes: Dict[str, "OrderedDict[str, None]"] = {
+            p: OrderedDict() for p in EVICTION_ORDER + tuple(PROTECTED_PRIORITIES)
+        }
+        self._priority: Dict[str, str] = {}
+
+    def add(self, key: str, priority: str = "normal") -> None:
+        self.remove(key)
+        if priority not in self._classes:
+            priority = "normal"
+        self._classes[priority][key] = None
+        self._priority[key] = priority
+
+    def touch(self, key: str) -> None:
+        self._classes[self._priority[key]].move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        priority = self._priority.pop(key, None)
+        if priority is not None:
+            del self._classes[priority][key]
+
+    def victims(self) -> Iterator[str]:
+        for priority in EVICTION_ORDER:
+            yield from self._classes[priority]
+
+    def rank(self, key: str) -> int:
+        return EVICTION_ORDER.index(self._priority[key])
+
+
+POLICIES = {"lru": LRUPolicy, "lfu": LFUPolicy, "priority": PriorityPolicy}
+
+
+def make_policy(name: str) -> EvictionPolicy:
+    try:
+        return POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown eviction policy: {name}") from None
@@ -0,0 +1,191 @@
+"""Hot tier - uncompressed modules in memory, budgeted in tokens"""
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .admission import TinyLFUAdmission, make_admission
+from .eviction import PROTECTED_PRIORITIES, EvictionPolicy, make_policy
+
+logger = logging.getLogger(__name__)
+
+
+def token_size(module_data: Any) -> int:
+    """Size declared by the module, else a ~4 chars/token estimate"""
+    if isinstance(module_data, dict):
+        for key in ("size_tokens", "size"):
+            if key in module_data:
+                return int(module_data[key])
+    return max(1, len(repr(module_data)) // 4)
+
+
+class HotStorage:
+    """Active module storage with pluggable eviction
+
+    When full, victims chosen by the policy are demoted to lower_tier (any
+    object with store(module_id, data)) instead of being dropped, so new
+    modules keep being admitted. on_evict is called for every victim.
+
+    With an admission filter, a module that would force evictions is only
+    admitted if it is requested more often than its victims; retrieve()
+    feeds the filter, so callers should retrieve before storing on a miss.
+    Not thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 50000,
+        eviction: str = "lru",
+        lower_tier: Any = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+        admission: str = "none",
+    ):
+        self.max_size = max_size
+        self.current_size = 0
+        self.modules: Dict[str, Any] = {}
+        self.sizes: Dict[str, int] = {}
+        self.policy: EvictionPolicy = make_policy(eviction)
+        self.lower_tier = lower_tier
+        self.on_evict = on_evict
+        self.admission: Optional[TinyLFUAdmission] = make_admission(admission)
+        self.hits = 0
+        self.misses = 0
+        self.hit_tokens = 0
+        self.miss_tokens = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    def __contains__(self, module_id: str) -> bool:
+        return module_id in self.modules
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def store(
+        self,
+        module_id: str,
+        module_data: Any,
+        size: Optional[int] = None,
+        priority: str = "normal",
+        force: bool = False,
+    ) -> bool:
+        """Admit a module, evicting others if needed
+
+        Returns False if the module cannot fit even after evicting
+        everything evictable, or if the admission filter rejects it.
+        force and critical priority bypass the filter.
+        """
+        size = token_size(module_data) if size is None else size
+        if size > self.max_size:
+            return False
+        # Nothing is evicted until the whole victim set is known to make room
+        victims = self._victims_for(size, module_id)
+        if victims is None:
+            return False
+        if module_id in self.modules:
+            self._discard(module_id)
+        elif (
+            victims
+            and self.admission is not None
+            and not force
+            and priority not in PROTECTED_PRIORITIES
+            and not self.admission.admit(module_id, victims)
+        ):
+            self.rejections += 1
+            logger.debug(f"Hot tier rejected {module_id} ({size} tokens)")
+            return False
+
+        for victim in victims:
+            self.evict(victim)
+
+        self.modules[module_id] = module_data
+        self.sizes[module_id] = size
+        self.current_size += size
+        self.policy.add(module_id, priority)
+        return True
+
+    def _victims_for(self, size: int, module_id: Optional[str] = None) -> Optional[List[str]]:
+        """Victims the policy would evict to make room, None if it can't
+
+        module_id is the module being stored; a resident copy of it is
+        replaced, so its size counts as freed and it is never a victim.
+        """
+        needed = self.current_size + size - self.max_size - self.sizes.get(module_id, 0)
+        victims: List[str] = []
+        if needed <= 0:
+            return victims
+        for victim in self.policy.victims():
+            if victim == module_id:
+                continue
+            victims.append(victim)
+            needed -= self.sizes[victim]
+            if needed <= 0:
+                return victims
+        return None
+
+    def retrieve(self, module_id: str, size: Optional[int] = None) -> Any:
+        """Return a resident module, or None on a miss
+
+        size is the module's size if known, used for the byte hit ratio.
+        """
+        if self.admission is not None:
+            self.admission.record(module_id)
+        if module_id not in self.modules:
+            self.misses += 1
+            self.miss_tokens += size or 0
+            return None
+        self.hits += 1
+        self.hit_tokens += self.sizes[module_id]
+        self.policy.touch(module_id)
+        return self.modules[module_id]
+
+    def remove(self, module_id: str) -> bool:
+        if module_id not in self.modules:
+            return False
+        self._discard(module_id)
+        return True
+
+    def evict(self, module_id: str) -> None:
+        """Move a module down a tier"""
+        data = self.modules[module_id]
+        self._discard(module_id)
+        self.evictions += 1
+        if self.lower_tier is not None:
+            self.lower_tier.store(module_id, data)
+        if self.on_evict is not None:
+            self.on_evict(module_id, data)
+        logger.debug(f"Evicted {module_id} from hot tier")
+
+    def _discard(self, module_id: str) -> None:
+        del self.modules[module_id]
+        self.current_size -= self.sizes.pop(module_id)
+        self.policy.remove(module_id)
+
+    def get_free_space(self) -> int:
+        return self.max_size - self.current_size
+
+    def module_ids(self) -> List[str]:
+        return list(self.modules)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratios (by count and by tokens) and admission counters"""
+        requests = self.hits + self.misses
+        requested_tokens = self.hit_tokens + self.miss_tokens
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / requests, 4) if requests else 0.0,
+            "byte_hit_ratio": round(self.hit_tokens / requested_tokens, 4) if requested_tokens else 0.0,
+            "evictions": self.evictions,
+            "rejections": self.rejections,
+        }
+
+
+def replay(storage: HotStorage, trace: Iterable[Tuple[str, int]]) -> Dict[str, Any]:
+    """Run a (module_id, size) request trace through a tier
+
+    Misses are stored as placeholders, like a loader would; returns the
+    tier's stats so policies can be compared on the same trace.
+    """
+    for module_id, size in trace:
+        if storage.retrieve(module_id, size) is None:
+            storage.store(module_id, module_id, size)
+    return storage.stats()
@@ -0,0 +1,152 @@
+"""Shared warm tier in Redis, backed by the local warm tier
+
+Several Cortex instances can point at the same Redis so a module
+decompressed by one is a network fetch away for the others. Payloads are
+the same lz4-framed msgpack as the local warm tier. Writes go through to
+the local tier as well, so its index holds every module this instance
+has demoted, with its true size. Whenever Redis is unreachable the local
+tier takes over, and Redis is left alone for retry_after seconds so a
+dead server costs one timeout, not one per call.
+"""
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import lz4.frame
+import redis
+
+from .codec import pack, unpack
+from .types import StorageTier
+from .warm import WarmStorage
+
+logger = logging.getLogger(__name__)
+
+
+def connect(url: str, max_connections: int = 16, timeout: float = 0.5) -> redis.Redis:
+    """Pooled client that fails fast, so fallback kicks in quickly"""
+    pool = redis.ConnectionPool.from_url(
+        url,
+        max_connections=max_connections,
+        socket_timeout=timeout,
+        socket_connect_timeout=timeout,
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+class SharedWarmStorage:
+    """Redis-first warm tier with the local WarmStorage as fallback
+
+    index, last-access times and warm -> cold demotion stay with the local
+    tier; entries in Redis age out through ttl (or the server's maxmemory
+    policy) instead.
+    """
+
+    tier = StorageTier.WARM
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        local: WarmStorage,
+        prefix: str = "cortex:warm:",
+        ttl: Optional[int] = 86400,
+        retry_after: float = 30.0,
+    ):
+        self.client = client
+        self.local = local
+        self.prefix = prefix
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._down_until = 0.0
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "errors": 0, "fallbacks": 0}
+
+    @property
+    def index(self):
+        return self.local.index
+
+    def _key(self, module_id: str) -> str:
+        return f"{self.prefix}{module_id}"
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, e: Exception) -> None:
+        self.counters["errors"] += 1
+        self._down_until = time.monotonic() + self.retry_after
+        logger.warning(f"Redis warm tier unavailable, using local tier for {self.retry_after}s: {e}")
+
+    def __contains__(self, module_id: str) -> bool:
+        if module_id in self.local:
+            return True
+        if not self.available:
+            return False
+        try:
+            return bool(self.client.exists(self._key(module_id)))
+        except redis.RedisError as e:
+            self._failed(e)
+            return False
+
+    def __len__(self) -> int:
+        return len(self.local)
+
+    def store(self, module_id: str, module_data: Any) -> None:
+        self.store_many({module_id: module_data})
+
+    def store_many(self, modules: Dict[str, Any]) -> None:
+        """Write several modules in one pipelined round trip, and locally"""
+        shared = False
+        if self.available:
+            try:
+                with self.client.pipeline(transaction=False) as pipe:
+                    for module_id, module_data in modules.items():
+                        pipe.set(self._key(module_id), lz4.frame.compress(pack(module_data)), ex=self.ttl)
+                    pipe.execute()
+                shared = True
+            except redis.RedisError as e:
+                self._failed(e)
+        if not shared:
+            self.counters["fallbacks"] += 1
+        # The local copy keeps index, sizes and warm -> cold demotion exact
+        for module_id, module_data in modules.items():
+            self.local.store(module_id, module_data)
+
+    def retrieve(self, module_id: str) -> Any:
+        return self.retrieve_many([module_id]).get(module_id)
+
+    def retrieve_many(self, module_ids: Iterable[str]) -> Dict[str, Any]:
+        """Fetch several modules with one MGET; misses are tried locally"""
+        module_ids = list(module_ids)
+        found: Dict[str, Any] = {}
+        if module_ids and self.available:
+            try:
+                payloads = self.client.mget([self._key(m) for m in module_ids])
+            except redis.RedisError as e:
+                self._failed(e)
+            else:
+                for module_id, payload in zip(module_ids, payloads):
+                    if payload is not None:
+                        found[module_id] = unpack(lz4.frame.decompress(payload))
+                self.counters["hits"] += len(found)
+                self.counters["misses"] += len(module_ids) - len(found)
+        for module_id in module_ids:
+            if module_id not in found:
+                data = self.local.retrieve(module_id)
+                if data is not None:
+                    found[module_id] = data
+        return found
+
+    def remove(self, module_id: str) -> bool:
+        removed = self.local.remove(module_id)
+        if self.available:
+            try:
+                removed = bool(self.client.delete(self._key(module_id))) or removed
+            except redis.RedisError as e:
+                self._failed(e)
+        return removed
+
+    def module_ids(self) -> List[str]:
+        return self.local.module_ids()
+
+    def stats(self) -> Dict[str, Any]:
+        """Local warm tier stats plus Redis hit/miss/error counters"""
+        return {**self.local.stats(), **{f"redis_{k}": v for k, v in self.counters.items()}, "redis_available": self.available}
@@ -0,0 +1,8 @@
+"""Storage tier types"""
+from enum import Enum
+
+
+class StorageTier(str, Enum):
+    HOT = "hot"
+    WARM = "warm"
+    COLD = "cold"
@@ -0,0 +1,216 @@
+"""Warm tier - msgpack payloads in lz4 frames on local disk
+
+Each module is one `{module_id}.warm` file. Writes go to a temp file in
+the same directory and are renamed into place, so readers never see a
+partial file. Which modules exist and how big they are is kept in memory,
+so lookups never stat the disk. Content files with a digest are kept
+once each under `blobs/{digest}.blob` and shared by every module record
+that lists them.
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import lz4.frame
+
+from .blobs import BlobRefs, blob_digests, join_blobs, split_blobs
+from .codec import pack, unpack
+from .types import StorageTier
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".warm"
+BLOB_SUFFIX = ".blob"
+
+
+@dataclass
+class WarmEntry:
+    size: int  # bytes of the module record on disk, shared blobs excluded
+    raw_size: Optional[int] = None  # uncompressed bytes, once known
+    last_access: float = 0.0  # time.time() of the last store or read
+
+
+class WarmStorage:
+    """Lightly compressed on-disk tier with an in-memory index"""
+
+    tier = StorageTier.WARM
+
+    def __init__(self, storage_dir: Path, compression_level: int = 0):
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+        self.blob_dir = self.storage_dir / "blobs"
+        self.index: Dict[str, WarmEntry] = {}
+        self.blob_sizes: Dict[str, int] = {}
+        self.refs = BlobRefs()
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.bytes_read = 0
+        self.read_seconds = 0.0
+        self.writes = 0
+        for entry in os.scandir(self.storage_dir):
+            if entry.name.endswith(SUFFIX) and entry.is_file():
+                st = entry.stat()
+                self.index[entry.name[: -len(SUFFIX)]] = WarmEntry(st.st_size, last_access=st.st_mtime)
+            elif entry.name.endswith(".tmp"):
+                # Left behind by a write that never reached its rename
+                os.unlink(entry.path)
+        if self.blob_dir.is_dir():
+            self._load_blobs()
+        logger.debug(f"Warm tier at {self.storage_dir}: {len(self.index)} modules, {len(self.blob_sizes)} blobs")
+
+    def _load_blobs(self) -> None:
+        """Rebuild blob reference counts from the module records"""
+        for entry in os.scandir(self.blob_dir):
+            if entry.name.endswith(BLOB_SUFFIX):
+                self.blob_sizes[entry.name[: -len(BLOB_SUFFIX)]] = entry.stat().st_size
+            elif entry.name.endswith(".tmp"):
+                os.unlink(entry.path)
+        for module_id in self.index:
+            record = unpack(lz4.frame.decompress(self._path(module_id).read_bytes()))
+            self.refs.link(module_id, [d for d in blob_digests(record) if d in self.blob_sizes])
+        for digest in set(self.blob_sizes) - set(self.refs.counts):
+            # Written by a store that never got to its module record
+            self._unlink_blob(digest)
+
+    def _path(self, module_id: str) -> Path:
+        return self.storage_dir / f"{module_id}{SUFFIX}"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / f"{digest}{BLOB_SUFFIX}"
+
+    def _write(self, directory: Path, path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _unlink_blob(self, digest: str) -> None:
+        """Delete an unreferenced blob; caller holds the lock (or is __init__)"""
+        self.blob_sizes.pop(digest, None)
+        try:
+            self._blob_path(digest).unlink()
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, module_id: str) -> bool:
+        return module_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def store(self, module_id: str, module_data: Any) -> None:
+        module_data, blobs = split_blobs(module_data)
+        with self._lock:
+            # Held under the temp-file name until the record is in place, so
+            # neither a concurrent remove nor a failed write drops live blobs
+            added, _ = self.refs.link(f".{module_id}", list(blobs))
+        try:
+            for digest in added:
+                self.blob_dir.mkdir(exist_ok=True)
+                data = lz4.frame.compress(pack(blobs[digest]), compression_level=self.compression_level)
+                self._write(self.blob_dir, self._blob_path(digest), data)
+                with self._lock:
+                    self.blob_sizes[digest] = len(data)
+            raw = pack(module_data)
+            compressed = lz4.frame.compress(raw, compression_level=self.compression_level)
+            self._write(self.storage_dir, self._path(module_id), compressed)
+        except BaseException:
+            with self._lock:
+                for digest in self.refs.unlink(f".{module_id}"):
+                    self._unlink_blob(digest)
+            raise
+        with self._lock:
+            _, dropped = self.refs.link(module_id, list(blobs))
+            dropped += self.refs.unlink(f".{module_id}")
+            for digest in dropped:
+                self._unlink_blob(digest)
+            self.index[module_id] = WarmEntry(len(compressed), len(raw), time.time())
+            self.writes += 1
+
+    def retrieve_view(self, module_id: str) -> Optional[memoryview]:
+        """Uncompressed msgpack module record, without copying it again
+
+        Files kept as shared blobs are left out; retrieve() fills them in.
+        """
+        entry = self.index.get(module_id)
+        if entry is None:
+            return None
+        start = time.perf_counter()
+        try:
+            with open(self._path(module_id), "rb", buffering=0) as f:
+                buf = bytearray(entry.size)
+                read = f.readinto(buf)
+                if read == entry.size:
+                    # The file may have been replaced by a bigger one
+                    rest = f.read()
+                    buf += rest
+                    read += len(rest)
+        except FileNotFoundError:
+            with self._lock:
+                self.index.pop(module_id, None)
+            return None
+        payload = lz4.frame.decompress(memoryview(buf)[:read])
+        with self._lock:
+            entry.raw_size = len(payload)
+            entry.last_access = time.time()
+            self.reads += 1
+            self.bytes_read += len(payload)
+            self.read_seconds += time.perf_counter() - start
+        return memoryview(payload)
+
+    def _read_blob(self, digest: str) -> Any:
+        try:
+            with open(self._blob_path(digest), "rb", buffering=0) as f:
+                return unpack(lz4.frame.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+
+    def retrieve(self, module_id: str) -> Any:
+        """The module's payload with its shared files filled back in"""
+        view = self.retrieve_view(module_id)
+        return None if view is None else join_blobs(unpack(view), self._read_blob)
+
+    def remove(self, module_id: str) -> bool:
+        with self._lock:
+            if self.index.pop(module_id, None) is None:
+                return False
+            for digest in self.refs.unlink(module_id):
+                self._unlink_blob(digest)
+        try:
+            self._path(module_id).unlink()
+        except FileNotFoundError:
+            pass
+        return True
+
+    def module_ids(self) -> List[str]:
+        return list(self.index)
+
+    def stats(self) -> Dict[str, Any]:
+        """Read throughput is measured on uncompressed bytes"""
+        entries = list(self.index.values())
+        sized = [e for e in entries if e.raw_size is not None]
+        compressed = sum(e.size for e in sized)
+        with self._lock:
+            blob_bytes = sum(self.blob_sizes.values())
+            saved = self.refs.bytes_saved(lambda digest: self.blob_sizes.get(digest, 0))
+        return {
+            "modules": len(entries),
+            "bytes_on_disk": sum(e.size for e in entries) + blob_bytes,
+            "blobs": len(self.blob_sizes),
+            "blob_bytes": blob_bytes,
+            "blob_bytes_saved": saved,
+            "reads": self.reads,
+            "writes": self.writes,
+            "read_mb_per_s": round(self.bytes_read / self.read_seconds / 1e6, 2) if self.read_seconds else 0.0,
+            "compression_ratio": round(sum(e.raw_size for e in sized) / compressed, 2) if compressed else 0.0,
+        }
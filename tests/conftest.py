@@ -2,9 +2,15 @@
 """Pytest configuration and shared fixtures"""
 import pytest
 from pathlib import Path
+import random
 import tempfile
 import shutil
-from typing import Generator
+import threading
+from typing import Any, Callable, Dict, Generator, Optional
+
+import yaml
+
+from cortex.modules.loader import ModuleLoader
 
 @pytest.fixture
 def temp_dir() -> Generator[Path, None, None]:
@@ -46,6 +52,90 @@ content:
     
     return module_dir
 
+@pytest.fixture
+def write_module(temp_dir: Path) -> Callable[..., Path]:
+    """Factory writing a minimal module directory under temp_dir/modules
+
+    files maps content file names to their text, listed as knowledge
+    files; other keyword arguments become top-level manifest fields.
+    """
+    def write(
+        module_id: str,
+        files: Optional[Dict[str, str]] = None,
+        size: Optional[int] = None,
+        priority: Optional[str] = None,
+        auto_load: Optional[bool] = None,
+        **fields: Any,
+    ) -> Path:
+        module_dir = temp_dir / "modules" / module_id
+        (module_dir / "content").mkdir(parents=True)
+        manifest = {"id": module_id, "version": "1.0.0", **fields}
+        if size is not None:
+            manifest["resources"] = {"size_tokens": size}
+        behavior = {"priority": priority, "auto_load": auto_load}
+        behavior = {key: value for key, value in behavior.items() if value is not None}
+        if behavior:
+            manifest["behavior"] = behavior
+        if files:
+            manifest["content"] = {"knowledge_files": [f"content/{name}" for name in files]}
+            for name, text in files.items():
+                (module_dir / "content" / name).write_text(text)
+        (module_dir / "manifest.yaml").write_text(yaml.safe_dump(manifest))
+        return module_dir
+
+    return write
+
+@pytest.fixture
+def hammer() -> Callable[..., bool]:
+    """Mixed get/put traffic on a hot tier from several threads
+
+    Returns whether the tier's books still balance: no lost hit/miss
+    counts and a size total matching its contents, within budget.
+    """
+    def run(storage: Any, threads: int, ops_per_thread: int = 2000, keys: int = 128, read_ratio: float = 0.8) -> bool:
+        reads_done = [0] * threads
+
+        def worker(n: int) -> None:
+            rng = random.Random(n)
+            for _ in range(ops_per_thread):
+                module_id = f"m{rng.randrange(keys)}"
+                if rng.random() < read_ratio:
+                    storage.retrieve(module_id, 100)
+                    reads_done[n] += 1
+                else:
+                    storage.store(module_id, module_id, 100)
+
+        pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        stats = storage.stats()
+        return (
+            stats["hits"] + stats["misses"] == sum(reads_done)
+            and storage.current_size == sum(storage.sizes.values()) <= storage.max_size
+        )
+
+    return run
+
+class GatedLoader(ModuleLoader):
+    """Loader that records load order and blocks until the gate opens"""
+
+    def __init__(self, registry):
+        super().__init__(registry)
+        self.gate = threading.Event()
+        self.order = []
+
+    def load(self, module_id, priority="normal"):
+        self.order.append(module_id)
+        self.gate.wait(timeout=5)
+        return super().load(module_id, priority)
+
+@pytest.fixture
+def gated_loader() -> Callable[..., GatedLoader]:
+    """Factory for loaders whose loads wait for loader.gate.set()"""
+    return GatedLoader
+
 @pytest.fixture
 def mock_event_bus():
     """Create a mock event bus"""
@@ -0,0 +1,81 @@
+"""Tests for the context analysis cache"""
+from cortex.context import AnalysisCache, ContextAnalyzer
+from cortex.modules import ModuleRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAnalysisCache:
+    """Test suite for AnalysisCache"""
+
+    def test_normalized_text_hits(self):
+        """Test whitespace variants of a text share one entry"""
+        cache = AnalysisCache()
+        analyzer = ContextAnalyzer(cache=cache)
+
+        first = analyzer.analyze("Help me debug   this Python code\n\n")
+        second = analyzer.analyze("  Help me debug this\tPython code")
+
+        assert cache.stats()["hits"] == 1 and len(cache) == 1
+        assert second.keywords == first.keywords
+        assert second.raw_input == "  Help me debug this\tPython code"
+        second.keywords.append("mutated")
+        assert "mutated" not in analyzer.analyze("Help me debug this Python code").keywords
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry goes first"""
+        cache = AnalysisCache(max_entries=2)
+        analyzer = ContextAnalyzer(cache=cache)
+
+        analyzer.analyze("alpha")
+        analyzer.analyze("beta")
+        analyzer.analyze("alpha")  # refresh
+        analyzer.analyze("gamma")  # evicts beta
+
+        assert cache.get("alpha") is not None
+        assert cache.get("beta") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after the TTL"""
+        clock = FakeClock()
+        cache = AnalysisCache(ttl=10, clock=clock)
+        analyzer = ContextAnalyzer(cache=cache)
+
+        analyzer.analyze("Write a creative story")
+        clock.now = 9
+        assert cache.get("Write a creative story") is not None
+        clock.now = 11
+        assert cache.get("Write a creative story") is None
+        assert cache.stats()["expirations"] == 1 and len(cache) == 0
+
+    def test_trigger_change_invalidates(self, mock_module_dir):
+        """Test registering a module empties the cache"""
+        registry = ModuleRegistry()
+        cache = AnalysisCache(version=lambda: registry.trigger_version)
+        analyzer = ContextAnalyzer(cache=cache)
+
+        analyzer.analyze("Help me debug this Python code")
+        registry.register(str(mock_module_dir))
+        analyzer.analyze("Help me debug this Python code")
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["invalidations"]) == (0, 2, 1)
+        assert registry.trigger_version == 1
+
+    def test_batch_uses_cache(self):
+        """Test batch items already cached skip analysis"""
+        cache = AnalysisCache()
+        analyzer = ContextAnalyzer(cache=cache)
+        analyzer.analyze("Create a new Python project")
+
+        results = analyzer.analyze_batch(["Create a new Python project", "Tell me about France"])
+
+        assert [r.intent for r in results] == ["creation", "general"]
+        assert cache.stats()["hits"] == 1 and len(cache) == 2
@@ -0,0 +1,202 @@
+"""Tests for the pack-file cold archive"""
+import asyncio
+import os
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from cortex.storage.cold import HEADER, ColdStorage
+from cortex.storage.decode import DecodePool
+
+
+def module(n, size=2000):
+    return {"id": f"mod{n}", "data": f"payload {n} " * (size // 10)}
+
+
+class TestColdStorage:
+    """Test suite for ColdStorage"""
+
+    def test_many_modules_share_few_packs(self, temp_dir):
+        """Test modules are appended to pack files, not one file each"""
+        cold = ColdStorage(temp_dir, max_pack_size=20000)
+        for n in range(200):
+            cold.archive(f"mod{n}", module(n))
+
+        packs = sorted(p.name for p in temp_dir.iterdir())
+        assert 1 < len(packs) < 20
+        assert all(name.startswith("pack-") for name in packs)
+        assert cold.retrieve("mod123") == module(123)
+        assert len(cold) == 200
+
+    def test_index_rebuilt_from_packs(self, temp_dir):
+        """Test a new instance rebuilds the offset table from the packs"""
+        cold = ColdStorage(temp_dir, max_pack_size=5000)
+        for n in range(20):
+            cold.archive(f"mod{n}", module(n))
+        cold.archive("mod3", {"v": 2})
+        cold.remove("mod4")
+
+        reopened = ColdStorage(temp_dir, max_pack_size=5000)
+
+        assert reopened.index == cold.index
+        assert reopened.retrieve("mod3") == {"v": 2}
+        assert reopened.retrieve("mod4") is None
+        assert reopened.stats()["garbage_bytes"] == cold.stats()["garbage_bytes"]
+
+    def test_torn_tail_truncated(self, temp_dir):
+        """Test a half-written record at the end of a pack is dropped"""
+        cold = ColdStorage(temp_dir)
+        cold.archive("good", {"v": 1})
+        pack = temp_dir / "pack-000000.pack"
+        size = pack.stat().st_size
+        with open(pack, "ab") as f:
+            f.write(HEADER.pack(1, 4, 1000, 0) + b"torn" + b"x" * 10)
+
+        reopened = ColdStorage(temp_dir)
+
+        assert reopened.module_ids() == ["good"]
+        assert pack.stat().st_size == size
+        reopened.archive("next", {"v": 2})
+        assert ColdStorage(temp_dir).retrieve("next") == {"v": 2}
+
+    def test_single_seek_and_read(self, temp_dir, monkeypatch):
+        """Test retrieval opens the pack once and reads only the payload"""
+        cold = ColdStorage(temp_dir)
+        for n in range(10):
+            cold.archive(f"mod{n}", module(n))
+        reads = []
+        original = cold._read
+        monkeypatch.setattr(cold, "_read", lambda record: reads.append(record) or original(record))
+
+        assert cold.retrieve("mod7") == module(7)
+        assert reads == [cold.index["mod7"]]
+
+    def test_corruption_detected(self, temp_dir):
+        """Test a payload failing its checksum is not returned"""
+        cold = ColdStorage(temp_dir)
+        cold.archive("mod", module(1))
+        record = cold.index["mod"]
+        with open(temp_dir / "pack-000000.pack", "r+b") as f:
+            f.seek(record.offset + 5)
+            f.write(b"\x00\x00\x00")
+
+        assert cold.retrieve("mod") is None
+
+    def test_repack_reclaims_garbage(self, temp_dir):
+        """Test repacking drops dead records and keeps live ones readable"""
+        cold = ColdStorage(temp_dir, max_pack_size=10000)
+        for n in range(30):
+            cold.archive(f"mod{n}", module(n))
+        for n in range(25):
+            cold.remove(f"mod{n}")
+        before = cold.stats()
+
+        reclaimed = cold.repack(threshold=0.5)
+
+        after = cold.stats()
+        assert reclaimed > 0
+        assert after["bytes_on_disk"] < before["bytes_on_disk"]
+        assert after["repacks"] > 0
+        assert sorted(cold.module_ids()) == [f"mod{n}" for n in range(25, 30)]
+        for n in range(25, 30):
+            assert cold.retrieve(f"mod{n}") == module(n)
+
+        reopened = ColdStorage(temp_dir)
+        assert sorted(reopened.module_ids()) == sorted(cold.module_ids())
+
+    def test_repack_keeps_needed_tombstones(self, temp_dir):
+        """Test a delete survives repacking while an older copy remains"""
+        cold = ColdStorage(temp_dir, max_pack_size=1)
+        cold.archive("keep", {"v": 1})   # pack 0
+        cold.archive("gone", {"v": 1})   # pack 1
+        cold.archive("other", {"v": 1})  # pack 2
+        cold.remove("gone")              # tombstone in pack 3
+        cold.archive("filler", {"v": 1})
+
+        cold.repack(threshold=0.0)
+
+        assert "gone" not in ColdStorage(temp_dir)
+        assert sorted(ColdStorage(temp_dir).module_ids()) == ["filler", "keep", "other"]
+
+    @pytest.mark.asyncio
+    async def test_background_repack(self, temp_dir):
+        """Test run() repacks periodically until stopped"""
+        cold = ColdStorage(temp_dir, max_pack_size=1000, repack_interval=0.01)
+        for n in range(5):
+            cold.archive(f"mod{n}", module(n, 500))
+        for n in range(4):
+            cold.remove(f"mod{n}")
+
+        task = asyncio.create_task(cold.run())
+        await asyncio.sleep(0.2)
+        cold.stop()
+        await task
+
+        assert cold.stats()["repacks"] > 0
+        assert cold.retrieve("mod4") == module(4, 500)
+
+
+@pytest.fixture(scope="module")
+def decoder():
+    pool = DecodePool(workers=2)
+    yield pool
+    pool.shutdown()
+
+
+def shm_blocks():
+    if not os.path.isdir("/dev/shm"):
+        return set()
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+class TestDecodePool:
+    """Test suite for process-pool cold decompression"""
+
+    def test_offloaded_retrieve(self, temp_dir, decoder):
+        """Test large records are decoded by the pool and shared memory is freed"""
+        cold = ColdStorage(temp_dir, decoder=decoder, offload_min_bytes=0)
+        cold.archive("mod", module(1, 200000))
+        before = decoder.stats()["completed"]
+        blocks = shm_blocks()
+
+        assert cold.retrieve("mod") == module(1, 200000)
+        assert decoder.stats()["completed"] == before + 1
+        assert shm_blocks() <= blocks
+
+    def test_small_records_inline(self, temp_dir, decoder):
+        """Test records below offload_min_bytes skip the pool"""
+        cold = ColdStorage(temp_dir, decoder=decoder)
+        cold.archive("mod", {"v": 1})
+        before = decoder.stats()["completed"]
+
+        assert cold.retrieve("mod") == {"v": 1}
+        assert decoder.stats()["completed"] == before
+
+    def test_corruption_detected(self, temp_dir, decoder):
+        """Test a worker rejects a payload failing its checksum"""
+        cold = ColdStorage(temp_dir, decoder=decoder, offload_min_bytes=0)
+        cold.archive("mod", module(1))
+        record = cold.index["mod"]
+        with open(temp_dir / "pack-000000.pack", "r+b") as f:
+            f.seek(record.offset + 5)
+            f.write(b"\x00\x00\x00")
+
+        assert cold.retrieve("mod") is None
+        assert cold.stats()["decode"]["failed"] >= 1
+
+    def test_concurrency_limit(self, temp_dir):
+        """Test decodes beyond max_in_flight queue and are counted"""
+        pool = DecodePool(workers=1, max_in_flight=1)
+        cold = ColdStorage(temp_dir, decoder=pool, offload_min_bytes=0)
+        for n in range(6):
+            cold.archive(f"mod{n}", module(n, 100000))
+        try:
+            with ThreadPoolExecutor(6) as threads:
+                results = list(threads.map(cold.retrieve, [f"mod{n}" for n in range(6)]))
+            stats = pool.stats()
+        finally:
+            pool.shutdown()
+
+        assert results == [module(n, 100000) for n in range(6)]
+        assert stats["completed"] == 6
+        assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+        assert stats["peak_queue_depth"] >= 1
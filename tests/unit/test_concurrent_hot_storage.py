@@ -0,0 +1,166 @@
+"""Tests for the striped thread-safe hot tier"""
+import threading
+
+from cortex.modules.loader import ModuleLoader
+from cortex.modules.registry import ModuleRegistry
+from cortex.storage.concurrent import SizeAccountant, ThreadSafeHotStorage
+
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestSizeAccountant:
+    """Test suite for SizeAccountant"""
+
+    def test_never_over_reserves(self):
+        """Test concurrent reservations stop at capacity"""
+        accountant = SizeAccountant(1000)
+        granted = []
+
+        def reserve(n):
+            for _ in range(100):
+                if accountant.try_reserve(7):
+                    granted.append(7)
+
+        run_threads(reserve, 8)
+        assert accountant.used == sum(granted) <= 1000
+        assert accountant.free < 7
+
+
+class TestThreadSafeHotStorage:
+    """Test suite for ThreadSafeHotStorage"""
+
+    def test_basic_operations(self):
+        """Test store, retrieve and remove across stripes"""
+        hot = ThreadSafeHotStorage(max_size=1000, stripes=4)
+        for n in range(5):
+            assert hot.store(f"m{n}", {"n": n}, 100)
+
+        assert len(hot) == 5
+        assert hot.retrieve("m3") == {"n": 3}
+        assert "m3" in hot
+        assert hot.remove("m3")
+        assert "m3" not in hot
+        assert hot.current_size == 400
+
+    def test_global_lru_across_stripes(self):
+        """Test the oldest module is evicted whichever stripe holds it"""
+        hot = ThreadSafeHotStorage(max_size=300, stripes=8)
+        evicted = []
+        hot.on_evict = lambda module_id, data: evicted.append(module_id)
+        for module_id in ("a", "b", "c"):
+            hot.store(module_id, {}, 100)
+        hot.retrieve("a")
+        hot.store("d", {}, 100)
+
+        assert evicted == ["b"]
+        assert set(hot.modules) == {"a", "c", "d"}
+
+    def test_cached_heads_follow_reads(self):
+        """Test victims stay in global LRU order as reads move stripe heads"""
+        hot = ThreadSafeHotStorage(max_size=200, stripes=8)
+        evicted = []
+        hot.on_evict = lambda module_id, data: evicted.append(module_id)
+        for n in range(200):
+            hot.store(f"m{n}", {}, 1)
+        for n in range(0, 200, 2):
+            hot.retrieve(f"m{n}")
+        for n in range(150):
+            hot.store(f"x{n}", {}, 1)
+
+        expected = [f"m{n}" for n in range(1, 200, 2)] + [f"m{n}" for n in range(0, 100, 2)]
+        assert evicted == expected
+        assert hot.current_size == 200
+
+    def test_critical_never_evicted(self):
+        """Test priority eviction spans stripes and protects critical"""
+        hot = ThreadSafeHotStorage(max_size=200, eviction="priority", stripes=8)
+        hot.store("core", {}, 100, priority="critical")
+        hot.store("extra", {}, 100, priority="high")
+
+        assert hot.store("next", {}, 100)
+        assert set(hot.modules) == {"core", "next"}
+        assert not hot.store("big", {}, 200)
+
+    def test_failed_store_evicts_nothing(self):
+        """Test a store that cannot fit leaves residents and budget in place"""
+        hot = ThreadSafeHotStorage(max_size=3000, stripes=8)
+        hot.store("core", {}, 1000, priority="critical")
+        hot.store("a", {}, 1000)
+        hot.store("b", {}, 1000)
+
+        assert not hot.store("big", {}, 2500)
+        assert set(hot.modules) == {"core", "a", "b"}
+        assert hot.evictions == 0
+        assert hot.current_size == 3000
+
+    def test_replace_resident_module(self):
+        """Test re-storing a module frees its old copy first"""
+        hot = ThreadSafeHotStorage(max_size=300, stripes=8)
+        hot.store("a", {}, 100)
+        hot.store("b", {}, 200)
+
+        assert hot.store("b", {"v": 2}, 250)
+        assert hot.retrieve("b") == {"v": 2}
+        assert set(hot.modules) == {"b"}
+        assert hot.current_size == 250
+
+    def test_concurrent_stores_never_over_admit(self):
+        """Test racing stores keep the tier within budget"""
+        hot = ThreadSafeHotStorage(max_size=1000, stripes=4)
+
+        def fill(n):
+            for i in range(200):
+                hot.store(f"t{n}_{i}", {}, 30)
+                assert hot.current_size <= 1000
+
+        run_threads(fill, 8)
+        assert hot.current_size == sum(hot.sizes.values()) <= 1000
+
+    def test_admission_filter(self):
+        """Test TinyLFU admission works through buffered reads"""
+        hot = ThreadSafeHotStorage(max_size=1000, admission="tinylfu")
+        for module_id in ("a", "b"):
+            for _ in range(3):
+                hot.retrieve(module_id, 500)
+            hot.store(module_id, {}, 500)
+
+        hot.retrieve("scan", 1000)
+        assert hot.store("scan", {}, 1000) is False
+        assert hot.stats()["rejections"] == 1
+
+    def test_stress_consistency(self, hammer):
+        """Test mixed get/put traffic loses no updates at any thread count"""
+        for threads in (1, 2, 4):
+            assert hammer(ThreadSafeHotStorage(max_size=5000), threads)
+
+    def test_loader_concurrent_loads(self, temp_dir):
+        """Test loader threads share the tier without a global lock"""
+        registry = ModuleRegistry()
+        for n in range(20):
+            module_dir = temp_dir / f"mod{n}"
+            module_dir.mkdir()
+            (module_dir / "manifest.yaml").write_text(
+                f"id: mod{n}\nversion: 1.0.0\nresources:\n  size_tokens: 100\n"
+            )
+            registry.register(str(module_dir))
+        hot = ThreadSafeHotStorage(max_size=1000)
+        loader = ModuleLoader(registry, hot=hot)
+
+        def load(n):
+            for i in range(20):
+                try:
+                    loader.load(f"mod{(n * 7 + i) % 20}")
+                except Exception as e:  # pragma: no cover - surfaced below
+                    errors.append(e)
+
+        errors = []
+        run_threads(load, 4)
+        assert not errors
+        assert hot.current_size == sum(hot.sizes.values()) <= 1000
+        assert set(hot.module_ids()) <= set(registry.modules)
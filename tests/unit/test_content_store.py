@@ -0,0 +1,148 @@
+"""Tests for content-addressed module content"""
+import pytest
+
+from cortex.modules.content import ContentStore, thaw
+from cortex.modules.loader import ModuleLoader, tier_payload
+from cortex.modules.registry import ModuleRegistry
+from cortex.storage import ColdStorage, WarmStorage
+
+
+GLOSSARY = '{"terms": {"module": "loadable unit", "tier": "storage level"}}'
+
+
+class TestContentStore:
+    """Test suite for ContentStore"""
+
+    def test_identical_files_parsed_once(self, write_module):
+        """Test shared files across modules are parsed once and shared"""
+        registry = ModuleRegistry()
+        registry.register(str(write_module('a', {'glossary.json': GLOSSARY})))
+        registry.register(str(write_module('b', {'glossary.json': GLOSSARY})))
+
+        a = registry.load_content('a').content['knowledge']['content/glossary.json']
+        b = registry.load_content('b').content['knowledge']['content/glossary.json']
+
+        assert a is b
+        assert registry.content_store.parses == 1
+        assert registry.content_store.hits == 1
+
+    def test_shared_content_read_only(self, temp_dir):
+        """Test shared content cannot be mutated"""
+        store = ContentStore()
+        path = temp_dir / "glossary.json"
+        path.write_text(GLOSSARY)
+
+        data = store.load('a', 'glossary.json', path)
+
+        with pytest.raises(TypeError):
+            data['terms']['module'] = 'changed'
+        assert thaw(data) == {"terms": {"module": "loadable unit", "tier": "storage level"}}
+
+    def test_dedup_report(self, write_module):
+        """Test dedup ratio and bytes saved"""
+        registry = ModuleRegistry()
+        for module_id in ('a', 'b', 'c'):
+            registry.register(str(write_module(module_id, {
+                'glossary.json': GLOSSARY,
+                'own.json': f'{{"id": "{module_id}"}}',
+            })))
+            registry.load_content(module_id)
+
+        report = registry.content_store.report()
+
+        assert report.files == 6
+        assert report.unique_files == 4
+        assert report.bytes_saved == 2 * len(GLOSSARY)
+        assert report.dedup_ratio > 1.0
+
+    def test_release_drops_unreferenced(self, write_module):
+        """Test entries are freed once no module references them"""
+        registry = ModuleRegistry()
+        registry.register(str(write_module('a', {'glossary.json': GLOSSARY})))
+        registry.register(str(write_module('b', {'glossary.json': GLOSSARY})))
+        registry.load_content('a')
+        registry.load_content('b')
+
+        registry.unload_content('a')
+        assert len(registry.content_store.entries) == 1
+
+        registry.unload_content('b')
+        assert registry.content_store.entries == {}
+
+    def test_reverted_file_reuses_entry(self, temp_dir):
+        """Test a file reverting to earlier bytes shares the existing entry"""
+        store = ContentStore()
+        path = temp_dir / "glossary.json"
+        path.write_text(GLOSSARY)
+        other = temp_dir / "copy.json"
+        other.write_text(GLOSSARY)
+        store.load('b', 'copy.json', other)
+
+        first = store.load('a', 'glossary.json', path)
+        path.write_text('{"terms": {}}')
+        store.load('a', 'glossary.json', path)
+        path.write_text(GLOSSARY)
+        reverted = store.load('a', 'glossary.json', path)
+
+        assert reverted is first
+        assert store.parses == 2
+        assert len(store.entries) == 1
+
+    def test_restored_content_shared(self, write_module, temp_dir):
+        """Test copies restored from a lower tier share entries by digest"""
+        registry = ModuleRegistry()
+        warm = WarmStorage(temp_dir / "warm")
+        for module_id in ('a', 'b'):
+            registry.register(str(write_module(module_id, {'glossary.json': GLOSSARY})))
+            content = registry.load_content(module_id).content
+            warm.store(module_id, tier_payload(registry, module_id, content))
+        registry.unload_content('b')
+        loader = ModuleLoader(registry, lower_tiers=(warm,))
+
+        restored = loader.load('b').content['knowledge']['content/glossary.json']
+
+        assert restored is registry.modules['a'].content['knowledge']['content/glossary.json']
+        assert len(registry.content_store.entries) == 1
+        assert registry.content_store.report().bytes_saved == len(GLOSSARY)
+
+    @pytest.mark.parametrize("tier_class", [WarmStorage, ColdStorage])
+    def test_tiers_store_shared_file_once(self, write_module, temp_dir, tier_class):
+        """Test two modules with an identical file take one blob on disk"""
+        registry = ModuleRegistry()
+        tier = tier_class(temp_dir / "tier")
+        payloads = {}
+        for module_id in ('a', 'b'):
+            registry.register(str(write_module(module_id, {'glossary.json': GLOSSARY})))
+            content = registry.load_content(module_id).content
+            payloads[module_id] = tier_payload(registry, module_id, content)
+            tier.store(module_id, payloads[module_id])
+
+        stats = tier.stats()
+        assert stats["blobs"] == 1
+        assert stats["blob_bytes_saved"] == stats["blob_bytes"] > 0
+        if tier_class is WarmStorage:
+            assert len(list((temp_dir / "tier" / "blobs").iterdir())) == 1
+        assert thaw(tier.retrieve('b')) == thaw(payloads['b'])
+
+        tier.remove('a')
+        assert tier.stats()["blobs"] == 1
+        assert thaw(tier.retrieve('b')) == thaw(payloads['b'])
+        tier.remove('b')
+        assert tier.stats()["blobs"] == 0
+
+    @pytest.mark.parametrize("tier_class", [WarmStorage, ColdStorage])
+    def test_blob_refs_rebuilt_on_startup(self, write_module, temp_dir, tier_class):
+        """Test a reopened tier still shares blobs and drops unreferenced ones"""
+        registry = ModuleRegistry()
+        tier = tier_class(temp_dir / "tier")
+        for module_id in ('a', 'b'):
+            registry.register(str(write_module(module_id, {'glossary.json': GLOSSARY})))
+            content = registry.load_content(module_id).content
+            tier.store(module_id, tier_payload(registry, module_id, content))
+
+        reopened = tier_class(temp_dir / "tier")
+        reopened.remove('a')
+        assert 'content/glossary.json' in reopened.retrieve('b')['content']['knowledge']
+        reopened.remove('b')
+
+        assert tier_class(temp_dir / "tier").stats()["blobs"] == 0
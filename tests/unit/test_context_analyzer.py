@@ -1,56 +1,13 @@
 # /Users/bard/Code/cortex_2/tests/unit/test_context_analyzer.py
 """Tests for Context Analyzer"""
+import time
 import pytest
-from unittest.mock import Mock, patch
-
-# Mock implementation
-class Context:
-    def __init__(self, raw_input, keywords, domain, intent, confidence):
-        self.raw_input = raw_input
-        self.keywords = keywords
-        self.domain = domain
-        self.intent = intent
-        self.confidence = confidence
-        self.suggested_modules = []
-
-class ContextAnalyzer:
-    def __init__(self):
-        self.stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were'}
-        
-    def analyze(self, input_text: str) -> Context:
-        # Simple mock implementation
-        words = input_text.lower().split()
-        keywords = [w for w in words if w not in self.stopwords and len(w) > 2]
-        
-        # Detect domain
-        domain = 'general'
-        if any(w in input_text.lower() for w in ['python', 'code', 'debug']):
-            domain = 'programming'
-        elif any(w in input_text.lower() for w in ['write', 'story', 'creative']):
-            domain = 'creative'
-            
-        # Detect intent
-        intent = 'general'
-        if 'help' in input_text.lower():
-            intent = 'assistance'
-        elif 'create' in input_text.lower() or 'build' in input_text.lower():
-            intent = 'creation'
-            
-        context = Context(
-            raw_input=input_text,
-            keywords=keywords,
-            domain=domain,
-            intent=intent,
-            confidence=0.85
-        )
-        
-        # Suggest modules
-        if domain == 'programming':
-            context.suggested_modules = ['python_expertise', 'debugging_tools']
-        elif domain == 'creative':
-            context.suggested_modules = ['creative_writing']
-            
-        return context
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from cortex.api import context as context_api
+from cortex.context import ContextAnalysisError, ContextAnalyzer, ContextTables, ContextTablesError, IncrementalAnalysis
+
 
 class TestContextAnalyzer:
     """Test suite for Context Analyzer"""
@@ -123,7 +80,7 @@ class TestContextAnalyzer:
         
         # Creative context
         context2 = analyzer.analyze("Write a creative story")
-        assert 'creative_writing' in context1.suggested_modules
+        assert 'creative_writing' in context2.suggested_modules
     
     def test_empty_input(self):
         """Test handling empty input"""
@@ -140,11 +97,12 @@ class TestContextAnalyzer:
         
         # Code pattern
         context1 = analyzer.analyze("def hello_world():\n    print('Hello')")
-        # assert 'code' in context1.patterns
+        assert 'code' in context1.patterns
         
         # Question pattern
         context2 = analyzer.analyze("What is the meaning of life?")
-        # assert 'question' in context2.patterns
+        assert 'question' in context2.patterns
+        assert 'code' not in context2.patterns
     
     def test_confidence_scoring(self):
         """Test confidence scoring"""
@@ -173,9 +131,284 @@ class TestContextAnalyzer:
     
     def test_multilingual_support(self):
         """Test handling non-English input"""
-        # analyzer = ContextAnalyzer()
+        analyzer = ContextAnalyzer()
         
         # Should handle gracefully
-        # context = analyzer.analyze("Bonjour, comment allez-vous?")
-        # assert context is not None
-        pass
+        context = analyzer.analyze("Bonjour, comment allez-vous?")
+        assert context is not None
+        assert 'bonjour' in context.keywords
+        assert context.domain == 'general'
+
+    def test_keywords_ranked_by_informativeness(self):
+        """Test repeated and vocabulary terms outrank incidental words"""
+        analyzer = ContextAnalyzer(max_keywords=3)
+        
+        context = analyzer.analyze("profiling tips: profiling shows the python parser is slow, profiling again")
+        
+        assert context.keywords[0] == 'profiling'
+        assert 'python' in context.keywords
+        assert len(context.keywords) == 3
+
+    def test_tables_from_config(self, temp_dir):
+        """Test domain and intent tables can be replaced from YAML"""
+        path = temp_dir / "context.yaml"
+        path.write_text(
+            "domains:\n"
+            "  cooking:\n"
+            "    keywords: [recipe, bake, oven]\n"
+            "    modules: [kitchen_basics]\n"
+            "intents:\n"
+            "  planning: [plan, schedule]\n"
+        )
+        analyzer = ContextAnalyzer(ContextTables.load(path))
+        
+        context = analyzer.analyze("Plan a recipe to bake bread in the oven")
+        
+        assert context.domain == 'cooking'
+        assert context.intent == 'planning'
+        assert context.suggested_modules == ['kitchen_basics']
+        assert 'the' not in context.keywords  # default stopwords kept
+        
+        path.write_text("- not a mapping\n")
+        with pytest.raises(ContextTablesError):
+            ContextTables.load(path)
+
+    def test_large_input_latency(self):
+        """Test 100KB of input is analyzed within the 50ms target"""
+        analyzer = ContextAnalyzer()
+        paragraph = (
+            "Help me debug this Python function; the traceback shows a KeyError when "
+            "the parser reads config files from disk and the cache is cold. "
+        )
+        text = paragraph * (100 * 1024 // len(paragraph))
+        
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            context = analyzer.analyze(text)
+            timings.append(time.perf_counter() - start)
+        
+        assert context.domain == 'programming'
+        assert min(timings) < 0.05
+
+
+class TestBatchAnalysis:
+    """Test suite for batched context analysis"""
+
+    def test_batch_matches_single_analysis(self):
+        """Test a batch returns the same contexts, in order, as one-by-one analysis"""
+        analyzer = ContextAnalyzer()
+        texts = [
+            "Help me debug this Python code",
+            "Write a creative story about dragons",
+            "What's the weather like today?",
+            "Help me debug this Python code",
+        ]
+
+        results = analyzer.analyze_batch(texts)
+
+        assert [r.raw_input for r in results] == texts
+        for text, result in zip(texts, results):
+            single = analyzer.analyze(text)
+            assert (result.keywords, result.domain, result.intent, result.confidence) == (
+                single.keywords, single.domain, single.intent, single.confidence
+            )
+        # Repeated texts are analyzed once but not shared
+        assert results[0] is not results[3]
+        results[0].keywords.append("mutated")
+        assert "mutated" not in results[3].keywords
+
+    def test_items_fail_independently(self):
+        """Test a bad item gets an error in its slot without failing the batch"""
+        analyzer = ContextAnalyzer(max_chars=40)
+
+        results = analyzer.analyze_batch(["Create a new Python project", "x" * 41, None, "Tell me about France"])
+
+        assert results[0].intent == 'creation'
+        assert isinstance(results[1], ContextAnalysisError)
+        assert isinstance(results[2], ContextAnalysisError)
+        assert results[3].domain == 'general'
+        with pytest.raises(ContextAnalysisError):
+            analyzer.analyze("y" * 41)
+
+    def test_batch_size_limit(self):
+        """Test batches over max_batch are rejected as a whole"""
+        analyzer = ContextAnalyzer(max_batch=2)
+
+        with pytest.raises(ContextAnalysisError):
+            analyzer.analyze_batch(["a", "b", "c"])
+
+
+class TestAnalyzeEndpoint:
+    """Test suite for POST /context/analyze"""
+
+    def test_large_text_leaves_event_loop(self, monkeypatch):
+        """Test long texts are analyzed in a worker thread, short ones inline"""
+        app = FastAPI()
+        app.include_router(context_api.router, prefix="/context")
+        app.state.analyzer = ContextAnalyzer()
+        client = TestClient(app)
+        offloaded = []
+        to_thread = context_api.asyncio.to_thread
+
+        async def spy(func, *args):
+            offloaded.append(len(args[0]))
+            return await to_thread(func, *args)
+
+        monkeypatch.setattr(context_api.asyncio, "to_thread", spy)
+        long_text = "Debug this Python code " * 1000
+
+        assert client.post("/context/analyze", json={"text": "Debug this Python code"}).status_code == 200
+        response = client.post("/context/analyze", json={"text": long_text})
+
+        assert response.status_code == 200
+        assert response.json()["domain"] == 'programming'
+        assert offloaded == [len(long_text)]
+
+
+class TestBatchAnalysisEndpoint:
+    """Test suite for POST /context/analyze/batch"""
+
+    def test_ordered_results_with_per_item_errors(self):
+        """Test results come back in request order with failures marked"""
+        app = FastAPI()
+        app.include_router(context_api.router, prefix="/context")
+        app.state.analyzer = ContextAnalyzer(max_chars=40, max_batch=3)
+        client = TestClient(app)
+
+        response = client.post("/context/analyze/batch", json={"texts": ["Debug this Python code", "z" * 41]})
+        body = response.json()
+
+        assert response.status_code == 200
+        assert [item["index"] for item in body["results"]] == [0, 1]
+        assert body["results"][0]["analysis"]["domain"] == 'programming'
+        assert "exceeds" in body["results"][1]["error"]
+        assert (body["analyzed"], body["failed"]) == (1, 1)
+
+        response = client.post("/context/analyze/batch", json={"texts": ["a", "b", "c", "d"]})
+        assert response.status_code == 413
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStreamAnalysis:
+    """Test suite for incremental (streamed) context analysis"""
+
+    TEXT = (
+        "Why does this Python function fail?\n"
+        "def load(path):\n    return open(path).read()\n"
+        + "The quick brown fox jumps over the lazy dog; again\n" * 40
+        + "lorem ipsum dolor " * 600
+        + "\n"
+    )
+
+    def test_chunked_matches_whole_text(self):
+        """Test any chunking gives the same context as analyzing the whole text"""
+        analyzer = ContextAnalyzer()
+        whole = analyzer.analyze(self.TEXT)
+
+        for size in (1, 7, 64, 1000, 5000):
+            analysis = analyzer.stream(confidence=2.0)
+            for start in range(0, len(self.TEXT), size):
+                assert analysis.feed(self.TEXT[start:start + size])
+            context = analysis.finish()
+
+            assert analysis.chars == len(self.TEXT)
+            assert (context.keywords, context.domain, context.intent, context.confidence, context.patterns) == (
+                whole.keywords, whole.domain, whole.intent, whole.confidence, whole.patterns
+            )
+
+    def test_cut_lines_do_not_fake_patterns(self):
+        """Test a long line cut mid-way does not look like a line end or start"""
+        analyzer = ContextAnalyzer()
+        line = "words " * 1000 + "and a closing brace } then more " + "words " * 1000 + "\n"
+
+        analysis = analyzer.stream(confidence=2.0)
+        for start in range(0, len(line), 3000):
+            analysis.feed(line[start:start + 3000])
+
+        assert analysis.finish().patterns == analyzer.analyze(line).patterns == []
+
+    def test_stops_once_confident(self):
+        """Test feeding stops once the confidence threshold is reached"""
+        analyzer = ContextAnalyzer(stream_confidence=0.9)
+        analysis = analyzer.stream()
+        line = "Help me fix the bug in this Python function and debug the script\n"
+
+        fed = 0
+        while analysis.feed(line):
+            fed += 1
+        context = analysis.finish()
+
+        assert analysis.stopped == "confident"
+        assert fed < 10
+        assert context.domain == 'programming' and context.confidence >= 0.9
+        assert not analysis.feed(line)
+
+    def test_stops_at_deadline(self):
+        """Test feeding stops once max_seconds have passed"""
+        clock = FakeClock()
+        analysis = IncrementalAnalysis(ContextAnalyzer(), confidence=2.0, max_seconds=1.0, clock=clock)
+
+        assert analysis.feed("Tell me about France\n")
+        clock.now = 1.5
+        assert not analysis.feed("and its history\n")
+        assert analysis.stopped == "deadline"
+
+    def test_term_memory_is_bounded(self):
+        """Test distinct words are cut back while table terms are kept"""
+        analysis = IncrementalAnalysis(ContextAnalyzer(), confidence=2.0, max_terms=100)
+
+        analysis.feed("python python debug\n")
+        for n in range(50):
+            analysis.feed(" ".join(f"word{n}x{i}" for i in range(20)) + "\n")
+            assert len(analysis._counts) <= 100
+
+        context = analysis.finish()
+        assert context.domain == 'programming'
+        assert 'python' in context.keywords
+
+
+class TestStreamAnalysisEndpoint:
+    """Test suite for POST /context/analyze/stream"""
+
+    def _client(self, analyzer):
+        app = FastAPI()
+        app.include_router(context_api.router, prefix="/context")
+        app.state.analyzer = analyzer
+        return TestClient(app)
+
+    def test_streamed_body(self):
+        """Test a chunked body is analyzed, including characters split across chunks"""
+        client = self._client(ContextAnalyzer(stream_confidence=2.0))
+        body = "Explain how the café's Python server works?\n".encode() * 50
+        chunks = (body[i:i + 5] for i in range(0, len(body), 5))  # splits the é
+
+        response = client.post("/context/analyze/stream", content=chunks)
+        result = response.json()
+
+        assert response.status_code == 200
+        assert result["chars"] == len(body.decode())
+        assert result["stopped"] is None
+        assert result["analysis"]["domain"] == 'programming'
+        assert result["analysis"]["intent"] == 'explanation'
+        assert "café" in result["analysis"]["keywords"]
+        assert result["analysis"]["patterns"] == ["question"]
+
+    def test_confidence_override(self):
+        """Test the server's threshold can be lowered per request"""
+        client = self._client(ContextAnalyzer(stream_confidence=2.0))
+        line = b"Help me fix the bug in this Python function and debug the script\n"
+
+        response = client.post("/context/analyze/stream", params={"confidence": 0.9}, content=(line for _ in range(1000)))
+        result = response.json()
+
+        assert response.status_code == 200
+        assert result["stopped"] == "confident"
+        assert result["analysis"]["confidence"] >= 0.9
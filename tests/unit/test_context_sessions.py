@@ -0,0 +1,136 @@
+"""Tests for session-scoped context state"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from cortex.api import context as context_api
+from cortex.api import resources as resources_api
+from cortex.context import ContextAnalyzer, ContextSessions
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestContextSessions:
+    """Test suite for ContextSessions"""
+
+    def test_pushes_accumulate(self):
+        """Test a session builds on its earlier pushes"""
+        sessions = ContextSessions(ContextAnalyzer())
+
+        session = sessions.push(None, "general", "general", ["python", "debug"])
+        assert session.session_id and session.domain == 'programming'
+        assert sessions.push(session.session_id, "general", "assistance", ["parser"]) is session
+
+        assert session.pushes == 2
+        assert session.intent == 'assistance'
+        assert set(sessions.keywords(session)) == {"python", "debug", "parser"}
+        assert sessions.suggestions(session) == (["python_expertise", "debugging_tools"], {})
+
+    def test_older_pushes_decay(self):
+        """Test weights halve every half-life and recent context wins"""
+        clock = FakeClock()
+        sessions = ContextSessions(ContextAnalyzer(), half_life=10, clock=clock)
+
+        session = sessions.push("s", "programming", "assistance", ["python", "code", "debug"])
+        clock.now = 10
+        assert sessions.weight(session, "python") == pytest.approx(0.5)
+
+        clock.now = 40
+        sessions.push("s", "creative", "creation", ["story"])
+        assert session.domain == 'creative'
+        assert sessions.keywords(session)[0] == "story"
+        assert sessions.suggestions(session)[0] == ["creative_writing"]
+
+    def test_long_sessions_rebase(self):
+        """Test the stored scale is reset instead of overflowing"""
+        clock = FakeClock()
+        sessions = ContextSessions(ContextAnalyzer(), half_life=1, idle_ttl=1e9, clock=clock)
+
+        session = sessions.push("s", "programming", "review", ["python"])
+        clock.now = 5000
+        sessions.push("s", "programming", "review", ["rust"])
+
+        assert session.origin == 5000
+        assert sessions.weight(session, "rust") == pytest.approx(1.0)
+        assert sessions.weight(session, "python") == 0.0
+
+    def test_suggestions_cached_until_trigger_change(self):
+        """Test suggestions are reused until their inputs or the trigger version move"""
+        version = [0]
+        sessions = ContextSessions(ContextAnalyzer(), version=lambda: version[0])
+        session = sessions.push("s", "programming", "assistance", ["python"])
+
+        sessions.suggestions(session)
+        cached = session._suggestions
+        sessions.push("s", "programming", "assistance", ["python"])
+        sessions.suggestions(session)
+        assert session._suggestions is cached
+
+        sessions.push("s", "programming", "assistance", ["parser"])
+        sessions.suggestions(session)
+        assert session._suggestions is not cached
+        cached = session._suggestions
+
+        version[0] += 1
+        sessions.suggestions(session)
+        assert session._suggestions is not cached
+
+    def test_keywords_bounded(self):
+        """Test a session keeps at most max_keywords keywords"""
+        sessions = ContextSessions(ContextAnalyzer(), max_keywords=10)
+
+        for n in range(20):
+            session = sessions.push("s", "general", "general", [f"word{n}", "python"])
+            assert len(session.weights) <= 10
+
+        assert "python" in session.weights
+
+    def test_idle_sessions_expire(self):
+        """Test idle sessions are dropped and the cap evicts the least recent"""
+        clock = FakeClock()
+        sessions = ContextSessions(ContextAnalyzer(), idle_ttl=100, max_sessions=2, clock=clock)
+
+        sessions.push("a", "general", "general", [])
+        clock.now = 50
+        sessions.push("b", "general", "general", [])
+        sessions.push("a", "general", "general", [])
+        sessions.push("c", "general", "general", [])  # evicts b
+        assert sessions.get("b") is None
+
+        clock.now = 160
+        sessions.push("d", "general", "general", [])  # a and c idle since 50
+        assert sessions.get("a") is None and sessions.get("c") is None
+        stats = sessions.stats()
+        assert (stats["sessions"], stats["evicted"], stats["expired"]) == (1, 1, 2)
+
+
+class TestContextPushEndpoint:
+    """Test suite for POST /context/push"""
+
+    def test_push_session_round_trip(self):
+        """Test a returned session id carries context into the next push"""
+        app = FastAPI()
+        app.include_router(context_api.router, prefix="/context")
+        app.include_router(resources_api.router, prefix="/resources")
+        app.state.sessions = ContextSessions(ContextAnalyzer())
+        client = TestClient(app)
+
+        first = client.post("/context/push", json={"domain": "general", "intent": "general", "keywords": ["python"]})
+        session_id = first.json()["session_id"]
+        second = client.post(
+            "/context/push",
+            json={"session_id": session_id, "domain": "general", "intent": "review", "keywords": ["tests"]},
+        ).json()
+
+        assert first.status_code == 200
+        assert first.json()["suggested_modules"] == ["python_expertise", "debugging_tools"]
+        assert second["session_id"] == session_id
+        assert (second["domain"], second["intent"]) == ('programming', 'review')
+        assert set(second["keywords"]) == {"python", "tests"}
+        assert client.get("/resources/context-sessions").json()["sessions"] == 1
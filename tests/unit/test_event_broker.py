@@ -0,0 +1,174 @@
+"""Tests for the cross-worker event broker"""
+import asyncio
+import time
+import pytest
+
+from cortex.events import AsyncEventBus, BrokerLink
+from cortex.events.broker import encode_frame, read_frame, serve
+from cortex.storage.codec import unpack
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+async def start_worker(path, **kwargs):
+    bus = AsyncEventBus()
+    link = BrokerLink(bus, path, ["module_loaded", "module_unloaded", "module_evicted"], retry_interval=0.05, **kwargs)
+    task = asyncio.create_task(link.run())
+    await wait_for(lambda: link.connected)
+    return bus, link, task
+
+
+async def stop_worker(bus, task):
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await bus.close()
+
+
+class TestFraming:
+    """Test suite for broker frames"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        """Test a frame decodes back to its messages"""
+        reader = asyncio.StreamReader()
+        reader.feed_data(encode_frame([["module_loaded", {"module_id": "a"}]]) + encode_frame([]))
+        reader.feed_eof()
+
+        assert unpack(await read_frame(reader)) == [["module_loaded", {"module_id": "a"}]]
+        assert unpack(await read_frame(reader)) == []
+        with pytest.raises(asyncio.IncompleteReadError):
+            await read_frame(reader)
+
+
+class TestBrokerLink:
+    """Test suite for relaying events between workers"""
+
+    @pytest.mark.asyncio
+    async def test_elects_one_broker_and_relays(self, temp_dir):
+        """Test the first worker becomes the broker and events cross without echoing back"""
+        path = temp_dir / "events.sock"
+        bus_a, link_a, task_a = await start_worker(path)
+        bus_b, link_b, task_b = await start_worker(path)
+        assert (link_a.role, link_b.role) == ("broker", "worker")
+        seen_a, seen_b = [], []
+        bus_a.on("module_loaded", seen_a.append)
+        bus_b.on("module_loaded", seen_b.append)
+
+        bus_a.emit("module_loaded", {"module_id": "a"})
+        bus_a.emit("resource_warning", {"level": "high"})  # not relayed
+        await wait_for(lambda: seen_b)
+        await asyncio.sleep(0.05)
+
+        assert seen_a == [{"module_id": "a"}]
+        assert seen_b == [{"module_id": "a"}]
+        assert link_a.received_events == 0 and link_b.sent_events == 0
+
+        await stop_worker(bus_b, task_b)
+        await stop_worker(bus_a, task_a)
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_bursts_batched_into_frames(self, temp_dir):
+        """Test a burst of events goes out as one frame"""
+        path = temp_dir / "events.sock"
+        bus_a, link_a, task_a = await start_worker(path, flush_interval=0.02)
+        bus_b, link_b, task_b = await start_worker(path)
+        remote = []
+        link_b.on_remote = lambda event, data: remote.append(data)
+
+        for n in range(50):
+            bus_a.emit("module_loaded", {"n": n})
+        await wait_for(lambda: len(remote) == 50)
+
+        assert [data["n"] for data in remote] == list(range(50))
+        assert link_a.sent_events == 50 and link_a.sent_frames == 1
+        assert link_a.stats()["broker"]["frames"] == 1
+
+        await stop_worker(bus_b, task_b)
+        await stop_worker(bus_a, task_a)
+
+    @pytest.mark.asyncio
+    async def test_failover_to_surviving_worker(self, temp_dir):
+        """Test another worker takes over when the broker's worker exits"""
+        path = temp_dir / "events.sock"
+        bus_a, link_a, task_a = await start_worker(path)
+        bus_b, link_b, task_b = await start_worker(path)
+        bus_c, link_c, task_c = await start_worker(path)
+
+        await stop_worker(bus_a, task_a)
+        await wait_for(lambda: any(link.broker and len(link.broker.peers) == 2 for link in (link_b, link_c)))
+        assert sorted([link_b.role, link_c.role]) == ["broker", "worker"]
+
+        seen = []
+        bus_c.on("module_unloaded", seen.append)
+        bus_b.emit("module_unloaded", {"module_id": "x"})
+        await wait_for(lambda: seen)
+        assert seen == [{"module_id": "x"}]
+
+        await stop_worker(bus_b, task_b)
+        await stop_worker(bus_c, task_c)
+
+    @pytest.mark.asyncio
+    async def test_default_topics_are_invalidations(self, temp_dir):
+        """Test only registry invalidations are relayed unless configured"""
+        path = temp_dir / "events.sock"
+        links = [BrokerLink(AsyncEventBus(), path, retry_interval=0.05) for _ in range(2)]
+        tasks = [asyncio.create_task(link.run()) for link in links]
+        await wait_for(lambda: all(link.connected for link in links))
+        remote = []
+        links[1].on_remote = lambda event, data: remote.append(event)
+
+        links[0].bus.emit("module_loaded", {"module_id": "a"})
+        links[0].bus.emit("module_updated", {"module_id": "a"})
+        await wait_for(lambda: remote)
+        await asyncio.sleep(0.05)
+        assert remote == ["module_updated"]
+
+        for link, task in zip(links, tasks):
+            await stop_worker(link.bus, task)
+
+    @pytest.mark.asyncio
+    async def test_sidecar_broker(self, temp_dir):
+        """Test workers join a standalone broker instead of electing one"""
+        path = temp_dir / "events.sock"
+        sidecar = asyncio.create_task(serve(path))
+        await wait_for(path.exists)
+        bus_a, link_a, task_a = await start_worker(path)
+        bus_b, link_b, task_b = await start_worker(path)
+        assert (link_a.role, link_b.role) == ("worker", "worker")
+
+        seen = []
+        bus_b.on("#", lambda event, data: seen.append(event))
+        bus_a.emit("module_evicted", {"module_id": "a"})
+        await wait_for(lambda: seen)
+        assert seen == ["module_evicted"]
+
+        await stop_worker(bus_a, task_a)
+        await stop_worker(bus_b, task_b)
+        sidecar.cancel()
+        await asyncio.gather(sidecar, return_exceptions=True)
+
+
+class TestRemoteEvents:
+    """Test suite for remote events on AsyncEventBus"""
+
+    @pytest.mark.asyncio
+    async def test_local_only_and_coalescing(self):
+        """Test remote events skip local_only subscribers and coalescing"""
+        bus = AsyncEventBus()
+        bus.coalesce("tick", "batch", window_ms=1000)
+        local, everything = [], []
+        bus.on("tick", local.append, local_only=True)
+        bus.on("tick", everything.append)
+
+        bus.emit("tick", 1, remote=True)
+        await bus.join()
+
+        assert local == [] and everything == [1]
+        await bus.close()
@@ -3,8 +3,12 @@
 import pytest
 from unittest.mock import Mock
 import asyncio
+import threading
+import time
 from typing import List, Dict, Any
 
+from cortex.events import AsyncEventBus, TopicTrie
+
 class EventBus:
     def __init__(self):
         self.subscribers: Dict[str, List] = {}
@@ -163,61 +167,69 @@ class TestEventBus:
         bus.emit('event2', None)
         assert call_count == 1  # Should not increase
     
-    def test_wildcard_subscriptions(self):
+    @pytest.mark.asyncio
+    async def test_wildcard_subscriptions(self):
         """Test wildcard event subscriptions"""
-        # bus = EventBus()
-        # results = []
+        bus = AsyncEventBus()
+        results = []
         
-        # def wildcard_handler(event, data):
-        #     results.append((event, data))
+        def wildcard_handler(event, data):
+            results.append((event, data))
             
         # Subscribe to all events starting with 'module.'
-        # bus.on('module.*', wildcard_handler)
+        bus.on('module.*', wildcard_handler)
         
-        # bus.emit('module.loaded', 'module1')
-        # bus.emit('module.unloaded', 'module2')
-        # bus.emit('other.event', 'data')
+        bus.emit('module.loaded', 'module1')
+        bus.emit('module.unloaded', 'module2')
+        bus.emit('other.event', 'data')
+        await bus.join()
         
         # Should only catch module events
-        # assert len(results) == 2
-        pass
+        assert len(results) == 2
+        assert results == [('module.loaded', 'module1'), ('module.unloaded', 'module2')]
+        await bus.close()
     
-    def test_priority_subscribers(self):
+    @pytest.mark.asyncio
+    async def test_priority_subscribers(self):
         """Test priority-based event handling"""
-        # bus = EventBus()
-        # order = []
+        bus = AsyncEventBus()
+        order = []
         
-        # def high_priority(data):
-        #     order.append('high')
+        def high_priority(data):
+            order.append('high')
             
-        # def low_priority(data):
-        #     order.append('low')
+        def low_priority(data):
+            order.append('low')
             
-        # bus.on('test_event', low_priority, priority=10)
-        # bus.on('test_event', high_priority, priority=100)
+        bus.on('test_event', low_priority, priority=10)
+        bus.on('test_event', high_priority, priority=100)
+        await asyncio.sleep(0)  # drain tasks are idle, as in a running server
         
-        # bus.emit('test_event', None)
+        bus.emit('test_event', None)
+        await bus.join()
         
         # High priority should run first
-        # assert order == ['high', 'low']
-        pass
+        assert order == ['high', 'low']
+        await bus.close()
     
-    def test_async_handlers(self):
+    @pytest.mark.asyncio
+    async def test_async_handlers(self):
         """Test async event handlers"""
-        # bus = AsyncEventBus()
-        # results = []
+        bus = AsyncEventBus()
+        results = []
         
-        # async def async_handler(data):
-        #     await asyncio.sleep(0.01)
-        #     results.append(data)
+        async def async_handler(data):
+            await asyncio.sleep(0.01)
+            results.append(data)
             
-        # bus.on('test_event', async_handler)
+        bus.on('test_event', async_handler)
         
-        # await bus.emit('test_event', 'async_data')
+        bus.emit('test_event', 'async_data')
+        await bus.join()
         
-        # assert len(results) == 1
-        # assert results[0] == 'async_data'
-        pass
+        assert len(results) == 1
+        assert results[0] == 'async_data'
+        await bus.close()
     
     def test_event_filtering(self):
         """Test event filtering/middleware"""
@@ -241,3 +253,171 @@ class TestEventBus:
         # assert len(results) == 1
         # assert results[0] == 'valid'
         pass
+
+
+class TestTopicTrie:
+    """Test suite for TopicTrie"""
+
+    def test_wildcards(self):
+        """Test * matches one segment and # matches any number"""
+        trie = TopicTrie()
+        for pattern in ('module.loaded', 'module.*', 'module.#', '#', '*.loaded', 'resource.*.warning'):
+            trie.add(pattern, pattern)
+
+        assert sorted(trie.match('module.loaded')) == ['#', '*.loaded', 'module.#', 'module.*', 'module.loaded']
+        assert sorted(trie.match('module')) == ['#', 'module.#']
+        assert sorted(trie.match('module.content.updated')) == ['#', 'module.#']
+        assert sorted(trie.match('resource.memory.warning')) == ['#', 'resource.*.warning']
+        assert trie.match('resource.warning') == ['#']
+
+    def test_remove_prunes(self):
+        """Test removing the last value under a pattern prunes its branch"""
+        trie = TopicTrie()
+        trie.add('a.b.c', 1)
+        trie.add('a', 2)
+
+        assert trie.remove('a.b.c', 1)
+        assert not trie.remove('a.b.c', 1)
+        assert list(trie.root.children['a'].children) == []
+        assert trie.match('a') == [2]
+
+
+class TestAsyncEventBus:
+    """Test suite for AsyncEventBus"""
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_does_not_delay_emit(self):
+        """Test emit returns immediately while handlers run concurrently"""
+        bus = AsyncEventBus()
+        started = []
+
+        async def slow(data):
+            started.append(data)
+            await asyncio.sleep(0.2)
+
+        bus.on('module_loaded', slow)
+        bus.on('module_loaded', slow)
+
+        start = time.perf_counter()
+        bus.emit('module_loaded', 'a')
+        assert time.perf_counter() - start < 0.01
+        await bus.join()
+        assert time.perf_counter() - start < 0.35  # both handlers ran at once
+        assert started == ['a', 'a']
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        """Test a full drop_oldest queue keeps the newest events"""
+        bus = AsyncEventBus(queue_size=2, overflow='drop_oldest')
+        gate = asyncio.Event()
+        seen = []
+
+        async def handler(data):
+            await gate.wait()
+            seen.append(data)
+
+        subscription = bus.on('tick', handler)
+        bus.emit('tick', 0)
+        await asyncio.sleep(0)  # handler takes event 0 and waits
+        for n in range(1, 6):
+            bus.emit('tick', n)
+        gate.set()
+        await bus.join()
+
+        assert seen == [0, 4, 5]
+        assert subscription.dropped == 3
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_newest(self):
+        """Test a full drop_newest queue keeps the oldest events"""
+        bus = AsyncEventBus(queue_size=2, overflow='drop_newest')
+        seen = []
+        subscription = bus.on('tick', seen.append)
+        for n in range(5):
+            bus.emit('tick', n)
+        await bus.join()
+
+        assert seen == [0, 1]
+        assert subscription.dropped == 3
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_block_applies_backpressure(self):
+        """Test publish waits for room in a block-policy queue"""
+        bus = AsyncEventBus(queue_size=1, overflow='block')
+        gate = asyncio.Event()
+        seen = []
+
+        async def handler(data):
+            await gate.wait()
+            seen.append(data)
+
+        bus.on('tick', handler)
+        await bus.publish('tick', 0)
+        await asyncio.sleep(0)
+        await bus.publish('tick', 1)
+        blocked = asyncio.create_task(bus.publish('tick', 2))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        gate.set()
+        await blocked
+        await bus.join()
+        assert seen == [0, 1, 2]
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_emit_from_worker_thread(self):
+        """Test events emitted by load worker threads reach loop handlers"""
+        bus = AsyncEventBus()
+        seen = []
+        bus.on('module_loaded', seen.append)
+
+        thread = threading.Thread(target=lambda: [bus.emit('module_loaded', n) for n in range(10)])
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        await asyncio.sleep(0)
+        await bus.join()
+
+        assert seen == list(range(10))
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_handler_isolated(self):
+        """Test a raising handler is counted and does not stop its queue"""
+        bus = AsyncEventBus()
+        seen = []
+
+        def handler(data):
+            if data == 'bad':
+                raise ValueError(data)
+            seen.append(data)
+
+        subscription = bus.on('tick', handler)
+        for data in ('bad', 'good'):
+            bus.emit('tick', data)
+        await bus.join()
+
+        assert seen == ['good']
+        assert subscription.failed == 1
+        assert bus.stats()['subscriptions'][0]['delivered'] == 1
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_dispatch_plan_cached(self):
+        """Test each event name resolves once until subscriptions change"""
+        bus = AsyncEventBus()
+        bus.on('module.#', lambda event, data: None, priority=1)
+        bus.on('module.loaded', lambda data: None, priority=5)
+
+        plan = bus.plan('module.loaded')
+        assert [s.event for s in plan] == ['module.loaded', 'module.#']
+        assert bus.plan('module.loaded') is plan
+
+        bus.on('*.loaded', lambda event, data: None)
+        assert bus.plan('module.loaded') is not plan
+        assert len(bus.plan('module.loaded')) == 3
+        await bus.close()
+
@@ -0,0 +1,105 @@
+"""Tests for event coalescing policies"""
+import asyncio
+import threading
+import pytest
+
+from cortex.events import AsyncEventBus, make_coalescer
+
+
+class TestCoalescing:
+    """Test suite for per-topic coalescing on AsyncEventBus"""
+
+    @pytest.mark.asyncio
+    async def test_last_value_wins(self):
+        """Test only the newest value in a window is delivered"""
+        bus = AsyncEventBus()
+        bus.coalesce("memory_usage", "last_value", window_ms=20)
+        seen = []
+        bus.on("memory_usage", seen.append)
+
+        for used in range(100):
+            bus.emit("memory_usage", used)
+        await asyncio.sleep(0.05)
+        await bus.join()
+
+        assert seen == [99]
+        assert bus.stats()["coalesced_in"] == 100
+        assert bus.stats()["coalesced_out"] == 1
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_count_summary(self):
+        """Test a window is summarized as a count with first and last"""
+        bus = AsyncEventBus()
+        bus.coalesce("resource.*", "count", window_ms=1000)
+        seen = []
+        bus.on("resource.warning", seen.append)
+
+        for n in range(5):
+            bus.emit("resource.warning", {"n": n})
+        bus.flush()
+        await bus.join()
+
+        assert seen == [{"count": 5, "first": {"n": 0}, "last": {"n": 4}, "window_ms": 1000}]
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_micro_batches(self):
+        """Test batches flush at max_items and the rest after the window"""
+        bus = AsyncEventBus()
+        bus.coalesce("module.accessed", "batch", window_ms=20, max_items=4)
+        batches = []
+        bus.on("module.accessed", batches.append)
+
+        for n in range(10):
+            bus.emit("module.accessed", n)
+        await asyncio.sleep(0.05)
+        await bus.join()
+
+        assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_event_names_buffered_separately(self):
+        """Test each event name matching a pattern gets its own window"""
+        bus = AsyncEventBus()
+        bus.coalesce("#", "last_value", window_ms=1000)
+        seen = []
+        bus.on("#", lambda event, data: seen.append((event, data)))
+
+        for n in range(3):
+            bus.emit("a", n)
+            bus.emit("b", n)
+        bus.flush()
+        await bus.join()
+
+        assert sorted(seen) == [("a", 2), ("b", 2)]
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_worker_threads_schedule_once_per_window(self):
+        """Test thread emits hand the loop one flush, not one callback per event"""
+        bus = AsyncEventBus()
+        bus.coalesce("tick", "batch", window_ms=50)
+        batches = []
+        bus.on("tick", batches.append)
+        scheduled = []
+        loop = asyncio.get_running_loop()
+        original = loop.call_soon_threadsafe
+        loop.call_soon_threadsafe = lambda *args: scheduled.append(args) or original(*args)
+
+        thread = threading.Thread(target=lambda: [bus.emit("tick", n) for n in range(200)])
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        await asyncio.sleep(0.1)
+        await bus.join()
+        del loop.call_soon_threadsafe
+
+        assert [args[0] for args in scheduled if args[0] in (loop.call_later, bus._offer)] == [loop.call_later]
+        assert batches == [list(range(200))]
+        await bus.close()
+
+    def test_unknown_policy(self):
+        """Test an unknown policy name is rejected"""
+        with pytest.raises(ValueError):
+            make_coalescer("median")
@@ -0,0 +1,108 @@
+"""Tests for the ring-buffer event history"""
+import asyncio
+import pytest
+
+from cortex.events import AsyncEventBus, EventHistory
+
+
+class TestEventHistory:
+    """Test suite for EventHistory"""
+
+    def test_bounded_with_sequence_numbers(self):
+        """Test only the newest capacity events are kept, in order"""
+        history = EventHistory(capacity=4)
+        for n in range(10):
+            history.append("tick", n)
+
+        records = history.replay()
+        assert len(history) == 4
+        assert [r.seq for r in records] == [7, 8, 9, 10]
+        assert [r.data for r in records] == [6, 7, 8, 9]
+        assert history.first_seq == 7 and history.last_seq == 10
+
+    def test_event_names_interned(self):
+        """Test records share one string per event name"""
+        history = EventHistory()
+        for n in range(2):
+            history.append("".join(["module", ".", "loaded"]), n)
+
+        first, second = history.replay()
+        assert first.event is second.event
+
+    def test_replay_since_and_topic(self):
+        """Test replay filters by sequence number and topic pattern"""
+        history = EventHistory()
+        for event in ("module.loaded", "resource.warning", "module.unloaded", "module.loaded"):
+            history.append(event, event)
+
+        assert [r.seq for r in history.replay(since=2)] == [3, 4]
+        assert [r.seq for r in history.replay(pattern="module.*")] == [1, 3, 4]
+        assert [r.seq for r in history.replay(pattern="module.*", limit=2)] == [1, 3]
+
+    def test_spill_to_disk(self, temp_dir):
+        """Test large payloads live on disk and old segments are deleted"""
+        history = EventHistory(capacity=8, spill_dir=temp_dir, spill_min_bytes=100)
+        for n in range(40):
+            history.append("big", {"n": n, "blob": "x" * 200})
+        history.append("small", {"n": 40})
+        history.flush()
+
+        records = history.replay()
+        assert [r.data["n"] for r in records] == list(range(33, 41))
+        assert all(r.spilled for r in history._ring if r.event == "big")
+        assert len(list(temp_dir.glob("events-*.spill"))) <= 2
+
+        history.close()
+        assert list(temp_dir.glob("events-*.spill")) == []
+
+
+    def test_spill_leaves_append_path(self, temp_dir):
+        """Test payloads are written by the background writer, small ones never"""
+        history = EventHistory(capacity=8, spill_dir=temp_dir, spill_min_bytes=100)
+        big = {"blob": "x" * 200}
+        history.append("big", big)
+        history.append("small", {"n": 1})
+        assert history.replay()[0].data == big
+
+        history.flush()
+        records = history.replay()
+
+        assert [r.data for r in records] == [big, {"n": 1}]
+        assert [r.spilled for r in history._ring[1:3]] == [True, False]
+        history.close()
+
+
+class TestBusReplay:
+    """Test suite for replay through AsyncEventBus"""
+
+    @pytest.mark.asyncio
+    async def test_late_subscriber_catches_up(self):
+        """Test a subscriber replays matching history, then gets live events"""
+        bus = AsyncEventBus(history=EventHistory(capacity=16))
+        bus.emit("module.loaded", "a")
+        bus.emit("resource.warning", "memory")
+        bus.emit("module.loaded", "b")
+        seen = []
+
+        bus.on("module.*", lambda event, data: seen.append(data), replay_since=0)
+        bus.emit("module.unloaded", "a")
+        await bus.join()
+
+        assert seen == ["a", "b", "a"]
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_replayed_events_not_delivered_twice(self):
+        """Test an event already replayed is skipped when it arrives live"""
+        bus = AsyncEventBus(history=EventHistory())
+        bus.on("tick", lambda data: None)
+        seen = []
+
+        # As if emitted from a worker thread: recorded now, delivered later
+        seq = bus._record("tick", 1)
+        bus.on("tick", seen.append, replay_since=0)
+        bus._offer(seq, "tick", 1)
+        await bus.join()
+
+        assert seen == [1]
+        await bus.close()
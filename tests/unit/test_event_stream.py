@@ -0,0 +1,174 @@
+"""Tests for the WebSocket event stream"""
+import asyncio
+import json
+import time
+import pytest
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from cortex.api import events as events_api
+from cortex.events import AsyncEventBus, EventStream
+from cortex.events.stream import TRY_AGAIN_LATER
+
+
+class FakeWebSocket:
+    """Collects sent frames; send_text blocks while the gate is closed"""
+
+    def __init__(self):
+        self.frames = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.disconnected = asyncio.Event()
+        self.close_code = None
+
+    async def send_text(self, frame):
+        await self.gate.wait()
+        self.frames.append(frame)
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "websocket.disconnect"}
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def connect(stream, patterns):
+    websocket = FakeWebSocket()
+    task = asyncio.create_task(stream.serve(websocket, patterns))
+    await asyncio.sleep(0)
+    return websocket, task
+
+
+async def settle(bus):
+    await bus.join()
+    await asyncio.sleep(0.01)
+
+
+class TestEventStream:
+    """Test suite for EventStream fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_one_serialization_per_event(self):
+        """Test matching clients share one encoded frame per event"""
+        bus = AsyncEventBus()
+        stream = EventStream(bus)
+        clients = [await connect(stream, ["module.*"]) for _ in range(3)]
+        other, other_task = await connect(stream, ["resource.#"])
+
+        for n in range(5):
+            bus.emit("module.loaded", {"module_id": f"m{n}"})
+        await settle(bus)
+
+        assert stream.serialized == 5
+        frames = [websocket.frames for websocket, _ in clients]
+        assert all(len(f) == 5 for f in frames)
+        assert all(a is b for a, b in zip(frames[0], frames[1]))
+        assert json.loads(frames[0][0])["data"] == {"module_id": "m0"}
+        assert other.frames == []
+
+        bus.emit("unwatched", None)
+        await settle(bus)
+        assert stream.serialized == 5
+
+        for websocket, task in clients + [(other, other_task)]:
+            websocket.disconnected.set()
+            await task
+        assert stream.clients == [] and bus.subscribers == {}
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_downsampled(self):
+        """Test a slow client drops its oldest frames without delaying others"""
+        bus = AsyncEventBus()
+        stream = EventStream(bus, max_buffer=3)
+        slow, slow_task = await connect(stream, ["#"])
+        fast, fast_task = await connect(stream, ["#"])
+        slow.gate.clear()
+
+        for n in range(10):
+            bus.emit("tick", n)
+            await asyncio.sleep(0)
+        await settle(bus)
+        assert len(fast.frames) == 10
+
+        slow.gate.set()
+        await asyncio.sleep(0.01)
+        received = [json.loads(frame) for frame in slow.frames]
+        assert received[0]["data"] == 0  # in flight when the gate closed
+        assert received[1] == {"event": "stream.dropped", "data": {"count": 6}}
+        assert [r["data"] for r in received[2:]] == [7, 8, 9]
+
+        for websocket, task in ((slow, slow_task), (fast, fast_task)):
+            websocket.disconnected.set()
+            await task
+        assert stream.stats()["dropped"] == 6
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_disconnected(self):
+        """Test the disconnect policy closes an overflowing client with 1013"""
+        bus = AsyncEventBus()
+        stream = EventStream(bus, max_buffer=2, slow_consumer="disconnect")
+        slow, slow_task = await connect(stream, ["#"])
+        fast, fast_task = await connect(stream, ["#"])
+        slow.gate.clear()
+
+        for n in range(5):
+            bus.emit("tick", n)
+            await asyncio.sleep(0)
+        await settle(bus)
+        slow.gate.set()
+        await slow_task
+
+        assert slow.close_code == TRY_AGAIN_LATER
+        assert stream.clients == [stream.clients[0]] and stream.clients[0].websocket is fast
+        assert stream.stats()["disconnected_slow"] == 1
+        assert len(fast.frames) == 5
+
+        fast.disconnected.set()
+        await fast_task
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_client_limit(self):
+        """Test connections beyond max_clients are turned away"""
+        bus = AsyncEventBus()
+        stream = EventStream(bus, max_clients=1)
+        first, first_task = await connect(stream, ["#"])
+        second, second_task = await connect(stream, ["#"])
+        await second_task
+
+        assert second.close_code == TRY_AGAIN_LATER
+        first.disconnected.set()
+        await first_task
+        await bus.close()
+
+
+class TestEventStreamEndpoint:
+    """Test suite for the /events/stream WebSocket route"""
+
+    def test_streams_filtered_topics(self):
+        """Test a connected client receives only the topics it asked for"""
+        @asynccontextmanager
+        async def lifespan(app):
+            app.state.events = AsyncEventBus()
+            app.state.stream = EventStream(app.state.events)
+            yield
+            await app.state.events.close()
+
+        app = FastAPI(lifespan=lifespan)
+        app.include_router(events_api.router, prefix="/events")
+
+        with TestClient(app) as client:
+            with client.websocket_connect("/events/stream?topic=module.*") as websocket:
+                deadline = time.monotonic() + 2
+                while not app.state.stream.clients and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                app.state.events.emit("resource.warning", {"level": "high"})
+                app.state.events.emit("module.loaded", {"module_id": "demo"})
+
+                frame = websocket.receive_json()
+                assert frame["event"] == "module.loaded"
+                assert frame["data"] == {"module_id": "demo"}
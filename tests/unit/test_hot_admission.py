@@ -0,0 +1,114 @@
+"""Tests for TinyLFU admission in front of the hot tier"""
+import pytest
+
+from cortex.storage.admission import CountMinSketch, TinyLFUAdmission, make_admission
+from cortex.storage.hot import HotStorage, replay
+
+
+def scan_trace():
+    """Eight popular small modules with a one-off large module every 50 requests"""
+    trace = []
+    for round_no in range(200):
+        trace += [(f"small_{(round_no + i) % 8}", 500) for i in range(5)]
+        if round_no % 10 == 0:
+            trace.append((f"scan_{round_no}", 4000))
+    return trace
+
+
+class TestCountMinSketch:
+    """Test suite for CountMinSketch"""
+
+    def test_estimates_frequency(self):
+        """Test estimates track increments and never undercount"""
+        sketch = CountMinSketch(width=64)
+        for _ in range(5):
+            sketch.increment("popular")
+        sketch.increment("rare")
+
+        assert sketch.estimate("popular") >= 5
+        assert sketch.estimate("rare") >= 1
+        assert sketch.estimate("popular") > sketch.estimate("rare")
+
+    def test_counters_saturate(self):
+        """Test counters stop at the 4-bit maximum"""
+        sketch = CountMinSketch(width=64)
+        for _ in range(40):
+            sketch.increment("key")
+
+        assert sketch.estimate("key") == 15
+
+    def test_aging_halves_counts(self):
+        """Test counters are halved after sample_size increments"""
+        sketch = CountMinSketch(width=64, sample_size=8)
+        for _ in range(8):
+            sketch.increment("key")
+
+        assert sketch.resets == 1
+        assert sketch.estimate("key") == 4
+
+
+class TestTinyLFUAdmission:
+    """Test suite for admission in HotStorage"""
+
+    def test_rejects_cold_candidate(self):
+        """Test a one-off module cannot displace frequently used ones"""
+        hot = HotStorage(max_size=1000, admission="tinylfu")
+        for module_id in ("a", "b"):
+            for _ in range(3):
+                hot.retrieve(module_id, 500)
+            hot.store(module_id, {}, 500)
+
+        hot.retrieve("scan", 1000)
+        assert hot.store("scan", {}, 1000) is False
+        assert hot.module_ids() == ["a", "b"]
+        assert hot.rejections == 1
+
+    def test_admits_hot_candidate(self):
+        """Test a candidate requested more often than its victims gets in"""
+        hot = HotStorage(max_size=1000, admission="tinylfu")
+        hot.retrieve("a", 1000)
+        hot.store("a", {}, 1000)
+        for _ in range(3):
+            hot.retrieve("b", 1000)
+
+        assert hot.store("b", {}, 1000) is True
+        assert hot.module_ids() == ["b"]
+
+    def test_force_and_critical_bypass(self):
+        """Test forced and critical stores skip the filter"""
+        hot = HotStorage(max_size=1000, admission="tinylfu")
+        for _ in range(3):
+            hot.retrieve("a", 1000)
+        hot.store("a", {}, 1000)
+
+        assert hot.store("b", {}, 1000, force=True) is True
+        assert hot.store("c", {}, 1000, priority="critical") is True
+        assert hot.rejections == 0
+
+    def test_replay_beats_lru_on_scans(self):
+        """Test admission improves hit ratios on a scan-polluted trace"""
+        lru = replay(HotStorage(max_size=5000), scan_trace())
+        tinylfu = replay(HotStorage(max_size=5000, admission="tinylfu"), scan_trace())
+
+        assert tinylfu["hit_ratio"] > lru["hit_ratio"]
+        assert tinylfu["byte_hit_ratio"] > lru["byte_hit_ratio"]
+        assert tinylfu["rejections"] > 0
+        assert lru["rejections"] == 0
+
+    def test_stats(self):
+        """Test hit ratio and byte hit ratio are reported"""
+        hot = HotStorage(max_size=1000)
+        hot.store("a", {}, 100)
+        hot.retrieve("a")
+        hot.retrieve("b", 300)
+
+        stats = hot.stats()
+        assert stats["hit_ratio"] == 0.5
+        assert stats["byte_hit_ratio"] == 0.25
+
+    def test_unknown_filter(self):
+        """Test unknown admission filters are rejected"""
+        assert make_admission("none") is None
+        assert isinstance(make_admission("tinylfu"), TinyLFUAdmission)
+        with pytest.raises(ValueError):
+            HotStorage(admission="wtinylfu")
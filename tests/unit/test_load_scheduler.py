@@ -0,0 +1,158 @@
+"""Tests for the priority load scheduler"""
+import asyncio
+import pytest
+
+from cortex.modules.loader import ModuleLoader
+from cortex.modules.registry import ModuleNotFoundError, ModuleRegistry
+from cortex.modules.scheduler import LoadDroppedError, LoadScheduler
+
+
+@pytest.fixture
+def registry(write_module):
+    registry = ModuleRegistry()
+    for module_id in ("first", "bg_a", "bg_b", "norm", "crit"):
+        registry.register(str(write_module(module_id)))
+    return registry
+
+
+async def settle():
+    await asyncio.sleep(0.05)
+
+
+class TestLoadScheduler:
+    """Test suite for LoadScheduler"""
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self, registry, gated_loader):
+        """Test queued loads run critical first"""
+        loader = gated_loader(registry)
+        scheduler = LoadScheduler(loader, workers=1)
+        await scheduler.start()
+
+        futures = [scheduler.submit("first")]
+        await settle()
+        futures += [scheduler.submit("norm"), scheduler.submit("crit", "critical")]
+        loader.gate.set()
+        await asyncio.gather(*futures)
+        await scheduler.stop()
+
+        assert loader.order == ["first", "crit", "norm"]
+
+    @pytest.mark.asyncio
+    async def test_single_worker_runs_no_background(self, registry, gated_loader):
+        """Test a lone worker is never taken by speculative loads"""
+        loader = gated_loader(registry)
+        scheduler = LoadScheduler(loader, workers=1, background_slots=1)
+        await scheduler.start()
+
+        with pytest.raises(LoadDroppedError):
+            await scheduler.submit("bg_a", "background")
+        crit = scheduler.submit("crit", "critical")
+        loader.gate.set()
+        await crit
+        await scheduler.stop()
+
+        assert scheduler.background_slots == 0
+        assert loader.order == ["crit"]
+        assert scheduler.report()["background"]["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_background_cannot_take_every_worker(self, registry, gated_loader):
+        """Test interactive loads always find a worker free of speculative work"""
+        loader = gated_loader(registry)
+        scheduler = LoadScheduler(loader, workers=2, background_slots=1)
+        await scheduler.start()
+
+        scheduler.submit("bg_a", "background")
+        scheduler.submit("bg_b", "background")
+        await settle()
+        assert loader.order == ["bg_a"]
+
+        crit = scheduler.submit("crit", "critical")
+        await settle()
+        assert loader.order == ["bg_a", "crit"]
+
+        loader.gate.set()
+        await crit
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_promotion_shares_pending_load(self, registry, gated_loader):
+        """Test a foreground request promotes a queued speculative load"""
+        loader = gated_loader(registry)
+        scheduler = LoadScheduler(loader, workers=2, background_slots=1)
+        await scheduler.start()
+
+        first = scheduler.submit("first")
+        await settle()
+        busy = scheduler.submit("bg_b", "background")
+        await settle()
+        speculative = scheduler.submit("bg_a", "background")
+        urgent = scheduler.submit("bg_a", "critical")
+        loader.gate.set()
+        await asyncio.gather(first, busy, speculative)
+        await scheduler.stop()
+
+        assert speculative is urgent
+        assert loader.order == ["first", "bg_b", "bg_a"]
+        assert scheduler.report()["critical"]["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_background_dropped(self, registry, gated_loader):
+        """Test speculative loads past their budget are dropped"""
+        loader = gated_loader(registry)
+        scheduler = LoadScheduler(loader, workers=2, background_slots=1, budgets_ms={"background": 0})
+        await scheduler.start()
+
+        scheduler.submit("first")
+        await settle()
+        stale = scheduler.submit("bg_a", "background")
+        await settle()
+
+        with pytest.raises(LoadDroppedError):
+            await stale
+        loader.gate.set()
+        await scheduler.stop()
+        assert scheduler.report()["background"]["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_speculative(self, registry, gated_loader):
+        """Test queued background loads can be cancelled"""
+        loader = gated_loader(registry)
+        scheduler = LoadScheduler(loader, workers=2, background_slots=1)
+        await scheduler.start()
+
+        scheduler.submit("bg_b", "background")
+        await settle()
+        bg = scheduler.submit("bg_a", "background")
+
+        assert scheduler.cancel_speculative() == 1
+        assert bg.done()
+        loader.gate.set()
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_latency_stats(self, registry):
+        """Test completed loads feed per-priority latency stats"""
+        loader = ModuleLoader(registry)
+        scheduler = LoadScheduler(loader, workers=2)
+        await scheduler.start()
+
+        await scheduler.load("crit", "critical")
+        await scheduler.load("crit", "critical")  # already resident
+        await scheduler.stop()
+
+        stats = scheduler.report()["critical"]
+        assert stats["completed"] == 2
+        assert stats["p99_ms"] >= stats["p50_ms"] >= 0
+        assert loader.is_loaded("crit")
+
+    @pytest.mark.asyncio
+    async def test_rejects_bad_requests(self, registry):
+        """Test unknown priorities and modules fail fast"""
+        scheduler = LoadScheduler(ModuleLoader(registry))
+
+        with pytest.raises(ValueError):
+            scheduler.submit("first", "urgent")
+        with pytest.raises(ModuleNotFoundError):
+            scheduler.submit("missing")
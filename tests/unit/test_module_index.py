@@ -0,0 +1,117 @@
+"""Tests for the module listing index"""
+import pytest
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from cortex.modules.index import InvalidCursorError, ModuleIndex
+from cortex.modules.types import ModuleManifest, ModuleRecord, ModuleStatus
+
+
+def make_record(module_id: str, type: str = "knowledge", size: int = 1000, tags=(), name=None) -> ModuleRecord:
+    manifest = ModuleManifest(
+        id=module_id, version="1.0.0", type=type, name=name or module_id,
+        description="", size_tokens=size, tags=list(tags),
+    )
+    return ModuleRecord(id=module_id, version="1.0.0", type=type, path=Path(module_id), manifest=manifest)
+
+
+def all_pages(index: ModuleIndex, **kwargs) -> list:
+    ids, cursor = index.query(**kwargs)
+    while cursor:
+        page, cursor = index.query(cursor=cursor, **kwargs)
+        ids.extend(page)
+    return ids
+
+
+@pytest.fixture
+def index():
+    index = ModuleIndex()
+    for i in range(100):
+        index.update(make_record(
+            f"module_{i:03d}",
+            type="capability" if i % 10 == 0 else "knowledge",
+            size=(i * 37) % 100,
+            tags=["python"] if i % 3 == 0 else [],
+        ))
+    return index
+
+
+class TestModuleIndex:
+    """Test suite for ModuleIndex"""
+
+    def test_pagination_covers_everything_once(self, index):
+        """Test cursors walk all records in name order"""
+        ids = all_pages(index, limit=7)
+
+        assert ids == sorted(ids)
+        assert len(ids) == len(set(ids)) == 100
+
+    def test_filters(self, index):
+        """Test type, tag and prefix filters"""
+        assert len(all_pages(index, type="capability")) == 10
+        assert len(all_pages(index, tag="Python")) == 34
+        assert all_pages(index, prefix="module_09") == [f"module_09{i}" for i in range(10)]
+        assert all_pages(index, type="capability", tag="python", limit=2) == \
+            ["module_000", "module_030", "module_060", "module_090"]
+
+    def test_status_filter_follows_updates(self, index):
+        """Test re-indexing a record moves it between status sets"""
+        record = make_record("module_005")
+        index.update(replace(record, status=ModuleStatus.LOADED))
+
+        assert all_pages(index, status="loaded") == ["module_005"]
+        assert "module_005" not in all_pages(index, status="available")
+
+    def test_sort_by_manifest_name(self):
+        """Test the name sort uses display names, not ids"""
+        index = ModuleIndex()
+        index.update(make_record("a_module", name="Zebra"))
+        index.update(make_record("z_module", name="apple"))
+        index.update(make_record("m_module", name="Mango"))
+
+        assert all_pages(index, sort="name", limit=2) == ["z_module", "m_module", "a_module"]
+
+    def test_sort_by_size_descending(self, index):
+        """Test size ordering with pagination"""
+        ids = all_pages(index, sort="size", descending=True, limit=9)
+        sizes = [index._facets[i].keys[1][0] for i in ids]
+
+        assert len(ids) == 100
+        assert sizes == sorted(sizes, reverse=True)
+
+    def test_sort_by_last_used(self, index):
+        """Test usage updates reorder the last_used listing"""
+        now = datetime.now()
+        for offset, module_id in enumerate(["module_050", "module_010", "module_070"]):
+            record = make_record(module_id)
+            record.stats.last_used = now + timedelta(seconds=offset)
+            index.update(record)
+
+        ids, _ = index.query(sort="last_used", descending=True, limit=3)
+
+        assert ids == ["module_070", "module_010", "module_050"]
+
+    def test_remove(self, index):
+        """Test removed records disappear from every index"""
+        index.remove("module_000")
+
+        assert "module_000" not in all_pages(index)
+        assert "module_000" not in all_pages(index, type="capability")
+        assert len(index) == 99
+
+    def test_invalid_cursor(self, index):
+        """Test garbage cursors are rejected"""
+        with pytest.raises(InvalidCursorError):
+            index.query(cursor="not-a-cursor")
+
+    def test_registry_keeps_index_current(self, mock_module_dir):
+        """Test registry operations maintain the index"""
+        from cortex.modules.registry import ModuleRegistry
+
+        registry = ModuleRegistry()
+        registry.register(str(mock_module_dir))
+        registry.load_content("test_module")
+
+        assert registry.index.query(status="loaded")[0] == ["test_module"]
+        assert registry.index.query(prefix="test m")[0] == ["test_module"]
@@ -0,0 +1,157 @@
+"""Tests for trigger-based module suggestions"""
+import time
+
+from cortex.context import ContextAnalyzer, ContextSessions, ModuleSuggester
+from cortex.context import suggest
+from cortex.context.suggest import required_literals
+from cortex.modules import ModuleRegistry, parse_manifest
+
+
+PYTHON_TRIGGERS = {
+    "keywords": {"high_confidence": ["python", "pytest"], "medium_confidence": ["import", "class"]},
+    "patterns": [
+        {"regex": "^#!/usr/bin/env python", "confidence": 1.0},
+        {"regex": "^from .* import .*", "confidence": 0.8},
+    ],
+    "contexts": ["programming", "debugging"],
+}
+PROJECT_TRIGGERS = {
+    "keywords": ["cortex", "knowledge graph"],
+    "patterns": [{"regex": "(anna|nexus|cortex)_?2?", "confidence": 0.9}],
+    "context_patterns": [{"task_type": "architecture"}],
+}
+
+
+class TestManifestTriggers:
+    """Test suite for trigger parsing"""
+
+    def test_tiers_and_contexts(self, write_module):
+        """Test keyword tiers, pattern confidence and both context layouts are parsed"""
+        python = parse_manifest(write_module("python_expertise", triggers=PYTHON_TRIGGERS)).triggers
+        project = parse_manifest(write_module("project", triggers=PROJECT_TRIGGERS)).triggers
+
+        assert python.keywords == {"python": 1.0, "pytest": 1.0, "import": 0.6, "class": 0.6}
+        assert [(p.regex, p.confidence) for p in python.patterns][0] == ("^#!/usr/bin/env python", 1.0)
+        assert python.contexts == ["programming", "debugging"]
+        assert project.keywords == {"cortex": 0.8, "knowledge graph": 0.8}
+        assert project.contexts == ["architecture"]
+
+
+class TestModuleSuggester:
+    """Test suite for ModuleSuggester"""
+
+    def _registry(self, write_module):
+        registry = ModuleRegistry()
+        registry.register(str(write_module("python_expertise", triggers=PYTHON_TRIGGERS)))
+        registry.register(str(write_module("project", triggers=PROJECT_TRIGGERS)))
+        return registry
+
+    def test_required_literals(self):
+        """Test regexes are indexed by a literal every match contains"""
+        assert required_literals("^from .* import .*") == {" import "}
+        assert required_literals("(anna|nexus|cortex)_?2?") == {"anna", "nexus", "cortex"}
+        assert required_literals(".*\\.py$") == {".py"}
+        assert required_literals("a|b") is None
+        assert required_literals("[a-z]+ing") == {"ing"}
+        assert required_literals("[a-z]+ed?") is None
+
+    def test_patterns_run_without_regex_parser(self, write_module, monkeypatch):
+        """Test patterns still match when the private regex parser is unavailable"""
+        monkeypatch.setattr(suggest, "sre_parse", None)
+        suggester = ModuleSuggester(self._registry(write_module))
+
+        assert required_literals("^from .* import .*") is None
+        assert suggester.suggest({}, text="notes on nexus2 and\nfrom os import path") == [
+            ("project", 0.9), ("python_expertise", 0.8)
+        ]
+
+    def test_keyword_context_and_pattern_scores(self, write_module):
+        """Test every trigger kind adds its tier weight"""
+        suggester = ModuleSuggester(self._registry(write_module))
+
+        assert suggester.suggest({"python": 1.0, "import": 1.0}) == [("python_expertise", 1.6)]
+        assert suggester.suggest({"debugging": 1.0}) == [("python_expertise", 0.5)]
+        assert suggester.suggest({"knowledge_graph": 1.0}) == [("project", 0.8)]
+        assert suggester.suggest({"graph": 1.0}) == [("project", 0.4)]
+        assert suggester.suggest({}, text="notes on nexus2 and\nfrom os import path") == [
+            ("project", 0.9), ("python_expertise", 0.8)
+        ]
+
+    def test_prefix_sharing_literals(self, write_module):
+        """Test a literal that prefixes another at the same position is still found"""
+        registry = ModuleRegistry()
+        registry.register(str(write_module("numpy", triggers={"patterns": [{"regex": "import\\s+numpy"}]})))
+        registry.register(str(write_module("impo", triggers={"patterns": [{"regex": "impo\\w+"}]})))
+        suggester = ModuleSuggester(registry)
+
+        assert suggester.match("import numpy") == {("numpy", "import\\s+numpy"), ("impo", "impo\\w+")}
+        assert suggester.match("Impossible") == {("impo", "impo\\w+")}
+
+    def test_rebuilds_on_trigger_change(self, write_module):
+        """Test the index follows registrations"""
+        registry = self._registry(write_module)
+        suggester = ModuleSuggester(registry)
+        assert suggester.suggest({"cortex": 1.0}) == [("project", 0.8)]
+
+        registry.unregister("project")
+        assert suggester.suggest({"cortex": 1.0}) == []
+        assert suggester.rebuilds == 2
+
+    def test_analyzer_and_sessions_use_suggester(self, write_module):
+        """Test registered modules lead the suggestions of both context endpoints"""
+        analyzer = ContextAnalyzer(suggester=ModuleSuggester(self._registry(write_module)))
+
+        context = analyzer.analyze("#!/usr/bin/env python\nHelp me debug this pytest failure")
+        assert context.suggested_modules[0] == "python_expertise"
+        assert context.module_scores["python_expertise"] > 2
+        assert "debugging_tools" in context.suggested_modules
+
+        streamed = analyzer.stream(confidence=2.0)
+        streamed.feed("#!/usr/bin/env python\nHelp me debug this pytest failure")
+        assert streamed.finish().module_scores == context.module_scores
+
+        sessions = ContextSessions(analyzer)
+        session = sessions.push(None, "architecture", "review", ["cortex"])
+        assert sessions.suggestions(session)[1] == {"project": 1.3}
+
+    def test_top_k_matches_exhaustive_scoring(self, write_module):
+        """Test early termination returns the same top k as scoring every module"""
+        registry = ModuleRegistry()
+        words = [f"term{n}" for n in range(60)]
+        for m in range(300):
+            tiers = {
+                "high_confidence": words[m % 7::11][:3],
+                "medium_confidence": words[m % 5::13][:4],
+                "low_confidence": words[m % 3::17][:2],
+            }
+            registry.register(str(write_module(f"module{m:03d}", triggers={"keywords": tiers})))
+        index = ModuleSuggester(registry).index
+
+        for query in (words[:3], words[5:15], words[::4], ["term1", "term11", "term50"]):
+            terms = {word: 1.0 / (1 + n) for n, word in enumerate(query)}
+            exhaustive = {}
+            for term, weight in terms.items():
+                for module_id, term_weight in index.postings.get(term, []):
+                    exhaustive[module_id] = exhaustive.get(module_id, 0.0) + weight * term_weight
+            expected = sorted(exhaustive.items(), key=lambda item: (-item[1], item[0]))[:5]
+
+            assert index.top(terms, k=5) == [(m, round(s, 3)) for m, s in expected]
+
+    def test_latency_flat_with_catalog_size(self, write_module):
+        """Test a query over thousands of modules stays within a millisecond budget"""
+        registry = ModuleRegistry()
+        for m in range(2000):
+            registry.register(str(write_module(f"module{m:04d}", triggers={
+                "keywords": {"high_confidence": [f"topic{m}"], "medium_confidence": [f"area{m % 50}", "code"]},
+                "contexts": ["programming"],
+            })))
+        suggester = ModuleSuggester(registry)
+        suggester.index  # build once
+
+        start = time.perf_counter()
+        for _ in range(100):
+            result = suggester.suggest({"topic7": 1.0, "area7": 1.0, "python": 1.0})
+        elapsed = (time.perf_counter() - start) / 100
+
+        assert result[0] == ("module0007", 1.6)
+        assert elapsed < 0.005
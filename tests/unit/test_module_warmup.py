@@ -0,0 +1,119 @@
+"""Tests for auto_load warm-up"""
+import asyncio
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from cortex.api import health as health_api
+from cortex.modules.loader import ModuleLoader
+from cortex.modules.registry import ModuleRegistry
+from cortex.modules.scheduler import LoadScheduler
+from cortex.modules.warmup import ModuleWarmup
+
+
+async def started(loader: ModuleLoader) -> LoadScheduler:
+    scheduler = LoadScheduler(loader, workers=2)
+    await scheduler.start()
+    return scheduler
+
+
+@pytest.fixture
+def registry(write_module):
+    registry = ModuleRegistry()
+    registry.register(str(write_module('background_mod', priority='low', auto_load=True)))
+    registry.register(str(write_module('core_mod', priority='high', auto_load=True)))
+    registry.register(str(write_module('normal_mod', auto_load=True)))
+    registry.register(str(write_module('manual_mod', auto_load=False)))
+    return registry
+
+
+class TestModuleWarmup:
+    """Test suite for ModuleWarmup"""
+
+    def test_plan_priority_order(self, registry):
+        """Test only auto_load modules are planned, highest priority first"""
+        warmup = ModuleWarmup(LoadScheduler(ModuleLoader(registry)))
+
+        assert warmup.build_plan() == ['core_mod', 'normal_mod', 'background_mod']
+
+    @pytest.mark.asyncio
+    async def test_warmup_loads_modules(self, registry):
+        """Test warm-up loads every planned module"""
+        loader = ModuleLoader(registry)
+        scheduler = await started(loader)
+        warmup = ModuleWarmup(scheduler, concurrency=2)
+
+        await warmup.run()
+        await scheduler.stop()
+
+        assert warmup.ready
+        assert loader.get_loaded_modules() == ['background_mod', 'core_mod', 'normal_mod']
+        assert not loader.is_loaded('manual_mod')
+
+    @pytest.mark.asyncio
+    async def test_not_ready_until_gating_modules_resident(self, registry, gated_loader):
+        """Test readiness reports progress while high-priority loads run"""
+        loader = gated_loader(registry)
+        scheduler = await started(loader)
+        warmup = ModuleWarmup(scheduler, concurrency=1)
+
+        task = asyncio.create_task(warmup.run())
+        await asyncio.sleep(0.05)
+
+        assert not warmup.ready
+        assert warmup.progress()['pending'] == ['core_mod']
+
+        loader.gate.set()
+        await task
+        await scheduler.stop()
+        assert warmup.ready
+        assert loader.order == ['core_mod', 'normal_mod', 'background_mod']
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_block_readiness(self, registry):
+        """Test a failing non-gating module is reported, not retried forever"""
+        load_content = registry.load_content
+
+        def failing(module_id, *args):
+            if module_id == 'normal_mod':
+                raise OSError("disk gone")
+            return load_content(module_id, *args)
+
+        registry.load_content = failing
+        scheduler = await started(ModuleLoader(registry))
+        warmup = ModuleWarmup(scheduler)
+
+        await warmup.run()
+        await scheduler.stop()
+
+        assert warmup.ready
+        assert warmup.progress()['failed'] == ['normal_mod']
+
+    @pytest.mark.asyncio
+    async def test_failed_gating_module_degrades_readiness(self, registry):
+        """Test readiness stays red, naming the module, when a gating load fails"""
+        registry.load_content = lambda module_id, *args: (_ for _ in ()).throw(OSError("disk gone"))
+        scheduler = await started(ModuleLoader(registry))
+        warmup = ModuleWarmup(scheduler)
+
+        await warmup.run()
+        await scheduler.stop()
+
+        assert not warmup.ready
+        assert warmup.degraded == ['core_mod']
+        assert warmup.progress()['degraded'] == ['core_mod']
+
+        app = FastAPI()
+        app.include_router(health_api.router, prefix="/health")
+        app.state.warmup = warmup
+        response = TestClient(app).get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "degraded"
+
+    def test_disabled(self, registry):
+        """Test auto_load disabled in config skips warm-up"""
+        warmup = ModuleWarmup(LoadScheduler(ModuleLoader(registry)), enabled=False)
+
+        assert warmup.build_plan() == []
+        assert warmup.ready
@@ -0,0 +1,139 @@
+"""Tests for module hot reload"""
+import os
+import pytest
+from pathlib import Path
+
+from cortex.modules.registry import ModuleRegistry
+from cortex.modules.watcher import ModuleWatcher
+
+
+def touch(path: Path, text: str) -> None:
+    """Rewrite a file and push its mtime forward so polling sees it"""
+    path.write_text(text)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def watched(mock_module_dir, mock_event_bus):
+    registry = ModuleRegistry(event_bus=mock_event_bus)
+    watcher = ModuleWatcher(registry, [str(mock_module_dir.parent)])
+    watcher.scan()
+    return registry, watcher
+
+
+class TestModuleWatcher:
+    """Test suite for ModuleWatcher"""
+
+    def test_initial_scan_registers_modules(self, watched):
+        """Test first scan discovers modules"""
+        registry, _ = watched
+
+        assert 'test_module' in registry.modules
+
+    def test_no_change_no_reload(self, watched):
+        """Test unchanged files are not reloaded"""
+        registry, watcher = watched
+        registry.load_content('test_module')
+
+        assert watcher.scan() == {}
+        assert registry.modules['test_module'].revision == 1
+
+    def test_content_change_swaps_loaded_module(self, watched, mock_module_dir):
+        """Test a changed content file is re-read and the revision bumped"""
+        registry, watcher = watched
+        registry.load_content('test_module')
+
+        touch(mock_module_dir / "content" / "knowledge.json", '{"test": "new"}')
+        changes = watcher.scan()
+
+        record = registry.modules['test_module']
+        assert list(changes) == ['test_module']
+        assert record.revision == 2
+        assert record.content['knowledge']['content/knowledge.json'] == {"test": "new"}
+
+    def test_only_changed_files_reparsed(self, watched, mock_module_dir):
+        """Test untouched content keeps the same parsed object"""
+        registry, watcher = watched
+        touch(mock_module_dir / "manifest.yaml", (mock_module_dir / "manifest.yaml").read_text().replace(
+            "    - content/knowledge.json",
+            "    - content/knowledge.json\n  patterns_files:\n    - content/patterns.json",
+        ))
+        (mock_module_dir / "content" / "patterns.json").write_text('{"p": 1}')
+        watcher.scan()
+        before = registry.load_content('test_module').content
+
+        touch(mock_module_dir / "content" / "patterns.json", '{"p": 2}')
+        watcher.scan()
+        after = registry.modules['test_module'].content
+
+        assert after['knowledge']['content/knowledge.json'] is before['knowledge']['content/knowledge.json']
+        assert after['patterns']['content/patterns.json'] == {"p": 2}
+
+    def test_manifest_change_reindexes(self, watched, mock_module_dir):
+        """Test keyword index follows manifest edits"""
+        registry, watcher = watched
+        manifest = mock_module_dir / "manifest.yaml"
+
+        touch(manifest, manifest.read_text().replace("[test, demo]", "[fresh]"))
+        watcher.scan()
+
+        assert registry.find_by_keyword('demo') == []
+        assert registry.find_by_keyword('fresh')[0].id == 'test_module'
+
+    def test_dependents_notified_not_reloaded(self, watched, mock_module_dir, mock_event_bus):
+        """Test dependents get an event but keep their revision"""
+        registry, watcher = watched
+        dependent = mock_module_dir.parent / "dependent"
+        dependent.mkdir()
+        (dependent / "manifest.yaml").write_text("id: dependent\nversion: 1.0.0\ndependencies: [test_module]\n")
+        watcher.scan()
+        registry.load_content('test_module')
+
+        touch(mock_module_dir / "content" / "knowledge.json", '{"test": "v2"}')
+        watcher.scan()
+
+        events = [e for e, _ in mock_event_bus.get_events()]
+        assert 'module_updated' in events
+        assert ('dependency_updated', {'module_id': 'dependent', 'dependency': 'test_module', 'revision': 2}) \
+            in mock_event_bus.get_events()
+        assert registry.modules['dependent'].revision == 1
+
+    def test_removed_module_unregistered(self, watched, mock_module_dir):
+        """Test deleting a module directory unregisters it"""
+        registry, watcher = watched
+
+        (mock_module_dir / "manifest.yaml").unlink()
+        watcher.scan()
+
+        assert 'test_module' not in registry.modules
+
+    def test_failed_directory_retried_only_when_changed(self, watched, mock_module_dir, caplog):
+        """Test a bad manifest is warned about once, then again only after it changes"""
+        _, watcher = watched
+        broken = mock_module_dir.parent / "broken"
+        broken.mkdir()
+        (broken / "manifest.yaml").write_text("id: [unclosed\n")
+
+        watcher.scan()
+        watcher.scan()
+        assert caplog.text.count("Skipping module at") == 1
+
+        touch(broken / "manifest.yaml", "id: broken\nversion: 1.0.0\n")
+        watcher.scan()
+        assert 'broken' in watcher.registry.modules
+
+    def test_duplicate_retried_after_removal(self, watched, mock_module_dir, caplog):
+        """Test a directory clashing on id registers once the other one is gone"""
+        registry, watcher = watched
+        clone = mock_module_dir.parent / "clone"
+        clone.mkdir()
+        (clone / "manifest.yaml").write_text((mock_module_dir / "manifest.yaml").read_text())
+
+        watcher.scan()
+        watcher.scan()
+        assert caplog.text.count("Skipping module at") == 1
+
+        (mock_module_dir / "manifest.yaml").unlink()
+        watcher.scan()
+        assert registry.modules['test_module'].path == clone
@@ -0,0 +1,160 @@
+"""Tests for the Redis-backed shared warm tier
+
+Runs against the server in CORTEX_TEST_REDIS_URL when set, otherwise
+against an in-process fakeredis.
+"""
+import os
+import time
+import pytest
+
+from cortex.modules.loader import ModuleLoader, tier_payload
+from cortex.modules.migration import TierMigrator
+from cortex.modules.registry import ModuleRegistry
+from cortex.storage.cold import ColdStorage
+from cortex.storage.concurrent import ThreadSafeHotStorage
+from cortex.storage.shared import SharedWarmStorage, connect
+from cortex.storage.warm import WarmStorage
+
+
+@pytest.fixture
+def client():
+    url = os.environ.get("CORTEX_TEST_REDIS_URL")
+    if url:
+        client = connect(url)
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.FakeRedis()
+    client.flushdb()
+    yield client
+    client.flushdb()
+
+
+@pytest.fixture
+def shared(client, temp_dir):
+    return SharedWarmStorage(client, WarmStorage(temp_dir / "warm"))
+
+
+class CountingClient:
+    """Forwards to a client, counting commands by name"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        self.calls.append(name)
+        return getattr(self.client, name)
+
+
+class TestSharedWarmStorage:
+    """Test suite for SharedWarmStorage"""
+
+    def test_round_trip(self, shared, client):
+        """Test modules are stored compressed in Redis and read back"""
+        data = {"id": "mod", "facts": ["x"] * 100}
+        shared.store("mod", data)
+
+        assert client.exists("cortex:warm:mod")
+        assert len(client.get("cortex:warm:mod")) < len(str(data))
+        assert "mod" in shared
+        assert shared.retrieve("mod") == data
+        assert shared.stats()["redis_hits"] == 1
+
+    def test_instances_share_entries(self, client, temp_dir):
+        """Test a module stored by one instance is visible to another"""
+        first = SharedWarmStorage(client, WarmStorage(temp_dir / "a"))
+        second = SharedWarmStorage(client, WarmStorage(temp_dir / "b"))
+        first.store("mod", {"v": 1})
+
+        assert second.retrieve("mod") == {"v": 1}
+
+    def test_batched_commands(self, shared, client):
+        """Test multi-module writes and reads cost one round trip each"""
+        counting = CountingClient(client)
+        shared.client = counting
+        shared.store_many({f"mod{n}": {"n": n} for n in range(10)})
+        found = shared.retrieve_many([f"mod{n}" for n in range(10)] + ["missing"])
+
+        assert counting.calls == ["pipeline", "mget"]
+        assert found == {f"mod{n}": {"n": n} for n in range(10)}
+        assert shared.stats()["redis_misses"] == 1
+
+    def test_writes_through_to_local(self, shared):
+        """Test modules written to Redis are indexed locally with their size"""
+        shared.store_many({"a": {"v": 1}, "b": {"v": 2}})
+
+        assert len(shared) == 2
+        assert sorted(shared.module_ids()) == ["a", "b"]
+        assert all(entry.size > 0 for entry in shared.index.values())
+        assert shared.stats()["redis_fallbacks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_idle_modules_demoted_to_cold(self, shared, temp_dir, mock_event_bus):
+        """Test modules held in Redis are still archived once idle"""
+        loader = ModuleLoader(ModuleRegistry(), mock_event_bus, hot=ThreadSafeHotStorage(), lower_tiers=(shared,))
+        cold = ColdStorage(temp_dir / "cold")
+        migrator = TierMigrator(loader, shared, cold, warm_idle=60.0)
+        shared.store("mod", {"v": 1})
+        size = shared.index["mod"].size
+
+        await migrator.tick(now=time.time() + 120.0)
+
+        assert "mod" in cold and "mod" not in shared
+        assert migrator.stats()["warm_to_cold"] == 1
+        assert migrator.stats()["bytes_moved"] == size
+
+    def test_falls_back_to_local(self, temp_dir):
+        """Test an unreachable Redis is skipped in favour of the local tier"""
+        shared = SharedWarmStorage(connect("redis://127.0.0.1:1", timeout=0.1), WarmStorage(temp_dir))
+        shared.store("mod", {"v": 1})
+
+        assert not shared.available
+        assert "mod" in shared.local
+        assert shared.retrieve("mod") == {"v": 1}
+        stats = shared.stats()
+        assert stats["redis_errors"] == 1  # the breaker skips Redis after the first failure
+        assert stats["redis_fallbacks"] == 1
+
+    def test_retries_after_outage(self, shared, client):
+        """Test Redis is used again once retry_after has passed"""
+        shared._down_until = float("inf")
+        shared.store("mod", {"v": 1})
+        assert not client.exists("cortex:warm:mod")
+
+        shared._down_until = 0.0
+        shared.store("mod", {"v": 2})
+        assert shared.retrieve("mod") == {"v": 2}
+
+    def test_remove(self, shared, client):
+        """Test removal clears both Redis and the local tier"""
+        shared.store("mod", {"v": 1})
+        shared.local.store("mod", {"v": 1})
+
+        assert shared.remove("mod")
+        assert "mod" not in shared
+        assert not shared.remove("mod")
+
+
+class TestLoaderPrefetch:
+    """Test suite for loading through the shared warm tier"""
+
+    def test_dependency_chain_fetched_in_one_mget(self, shared, write_module, mock_event_bus):
+        """Test a module and its dependencies come from one MGET"""
+        registry = ModuleRegistry()
+        for module_id in ("base", "util"):
+            registry.register(str(write_module(module_id, {"facts.json": f'{{"module": "{module_id}"}}'}, size=100)))
+        registry.register(str(write_module("app", {"facts.json": '{"module": "app"}'}, size=100, dependencies={"required": ["base", "util"]})))
+        for module_id in ("base", "util", "app"):
+            content = registry.load_content(module_id).content
+            shared.store(module_id, tier_payload(registry, module_id, content))
+            registry.unload_content(module_id)
+
+        counting = CountingClient(shared.client)
+        shared.client = counting
+        loader = ModuleLoader(registry, mock_event_bus, hot=ThreadSafeHotStorage(max_size=10000), lower_tiers=(shared,))
+        loader.load("app")
+
+        assert counting.calls == ["mget"]
+        sources = [data["source"] for event, data in mock_event_bus.get_events() if event == "module_loaded"]
+        assert sources == ["warm", "warm", "warm"]
+        assert loader.get_loaded_modules() == ["app", "base", "util"]
@@ -0,0 +1,213 @@
+"""Tests for background tier migration"""
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+
+from cortex.modules.loader import ModuleLoader
+from cortex.modules.migration import DemandPredictor, TierMigrator, TokenBucket
+from cortex.modules.registry import ModuleRegistry
+from cortex.modules.scheduler import LoadScheduler
+from cortex.server import CortexServer
+from cortex.storage.cold import ColdStorage
+from cortex.storage.concurrent import ThreadSafeHotStorage
+from cortex.storage.warm import WarmStorage
+
+HOUR = 3600.0
+
+
+@pytest.fixture
+def tiers(write_module, temp_dir, mock_event_bus):
+    registry = ModuleRegistry()
+    for module_id, size, priority in (("a", 400, "normal"), ("b", 400, "normal"), ("core", 100, "critical")):
+        registry.register(str(write_module(module_id, {'facts.json': f'{{"module": "{module_id}"}}'}, size=size, priority=priority)))
+    warm = WarmStorage(temp_dir / "warm")
+    cold = ColdStorage(temp_dir / "cold")
+    hot = ThreadSafeHotStorage(max_size=1000)
+    loader = ModuleLoader(registry, mock_event_bus, hot=hot, lower_tiers=(warm, cold))
+    migrator = TierMigrator(loader, warm, cold, hot_idle=HOUR, warm_idle=2 * HOUR)
+    hot.lower_tier = migrator
+    return SimpleNamespace(registry=registry, warm=warm, cold=cold, hot=hot, loader=loader, migrator=migrator)
+
+
+def load_sources(event_bus):
+    return [data["source"] for event, data in event_bus.get_events() if event == "module_loaded"]
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket"""
+
+    @pytest.mark.asyncio
+    async def test_rate_limits_bytes(self):
+        """Test transfers beyond the burst wait for refill"""
+        bucket = TokenBucket(rate=1000, burst=100)
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire(100)
+
+        assert time.monotonic() - start >= 0.15
+
+
+class TestDemandPredictor:
+    """Test suite for DemandPredictor"""
+
+    def test_scores_decay(self, tiers):
+        """Test recent usage scores high and halves every half-life"""
+        predictor = DemandPredictor(half_life=100.0)
+        predictor.observe(tiers.registry, now=0.0)
+        for _ in range(4):
+            tiers.registry.record_usage("a")
+        predictor.observe(tiers.registry, now=1.0)
+        assert predictor.score("a") == 4
+        assert predictor.likely(2.0) == ["a"]
+
+        predictor.observe(tiers.registry, now=101.0)
+        assert predictor.score("a") == pytest.approx(2.0)
+
+
+class TestTierMigrator:
+    """Test suite for TierMigrator"""
+
+    @pytest.mark.asyncio
+    async def test_idle_demotion_to_warm(self, tiers, mock_event_bus):
+        """Test idle hot modules move to warm and load back from there"""
+        tiers.loader.load("a")
+        tiers.loader.load("core")
+
+        await tiers.migrator.tick(now=time.time() + 2 * HOUR - 1)
+
+        assert not tiers.loader.is_loaded("a")
+        assert tiers.loader.is_loaded("core")  # critical modules are pinned
+        assert "a" in tiers.warm
+        assert tiers.migrator.stats()["hot_to_warm"] == 1
+
+        record = tiers.loader.load("a")
+        assert load_sources(mock_event_bus)[-1] == "warm"
+        assert record.content["knowledge"]["content/facts.json"] == {"module": "a"}
+
+    @pytest.mark.asyncio
+    async def test_memory_pressure_demotion(self, tiers):
+        """Test least recently used modules are demoted above the high watermark"""
+        tiers.loader.load("a")
+        tiers.loader.load("b")
+        tiers.loader.load("core")
+        tiers.loader.touch("a")
+
+        await tiers.migrator.tick()
+
+        assert tiers.hot.current_size <= 0.75 * tiers.hot.max_size
+        assert tiers.loader.get_loaded_modules() == ["a", "core"]
+
+    @pytest.mark.asyncio
+    async def test_warm_to_cold_and_back(self, tiers, mock_event_bus):
+        """Test idle warm modules are archived and predicted ones promoted"""
+        scheduler = LoadScheduler(tiers.loader, workers=2)
+        await scheduler.start()
+        tiers.migrator.scheduler = scheduler
+        tiers.loader.load("a")
+        tiers.loader.evict("a")
+        await tiers.migrator.tick(now=time.time() + 3 * HOUR)
+        assert "a" in tiers.cold and "a" not in tiers.warm
+
+        for _ in range(3):
+            tiers.registry.record_usage("a")
+        await tiers.migrator.tick()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+        assert tiers.loader.is_loaded("a")
+        assert "a" in tiers.warm and "a" not in tiers.cold
+        assert load_sources(mock_event_bus)[-1] == "warm"
+        stats = tiers.migrator.stats()
+        assert stats["cold_to_warm"] == 1 and stats["warm_to_hot"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_copy_discarded(self, tiers, temp_dir, mock_event_bus):
+        """Test a demoted copy is dropped once the module's files change"""
+        tiers.loader.load("a")
+        tiers.loader.evict("a")
+        await tiers.migrator.tick()
+        facts = temp_dir / "modules" / "a" / "content" / "facts.json"
+        facts.write_text('{"module": "a", "edited": true}')
+
+        record = tiers.loader.load("a")
+
+        assert load_sources(mock_event_bus)[-1] == "disk"
+        assert record.content["knowledge"]["content/facts.json"]["edited"] is True
+        assert "a" not in tiers.warm
+
+    @pytest.mark.asyncio
+    async def test_pauses_for_foreground_loads(self, tiers):
+        """Test nothing is migrated while interactive loads are queued"""
+        tiers.loader.load("a")
+        tiers.migrator.scheduler = SimpleNamespace(
+            queue_depth=lambda: {"critical": 0, "high": 0, "normal": 1, "background": 0}
+        )
+
+        await tiers.migrator.tick(now=time.time() + 2 * HOUR)
+
+        assert tiers.loader.is_loaded("a")
+        assert tiers.migrator.stats()["skipped_busy"] == 1
+
+
+class TestCortexServer:
+    """Test suite for CortexServer component ownership"""
+
+    @pytest.mark.asyncio
+    async def test_setup_and_stop(self, write_module, temp_dir):
+        """Test the server builds the tiers and runs the migrator"""
+        write_module("a", {"facts.json": '{"module": "a"}'}, size=100)
+        config = SimpleNamespace(
+            module_search_paths=[str(temp_dir / "modules")],
+            module_watch_interval=60.0,
+            module_auto_load=False,
+            module_warmup_concurrency=1,
+            module_load_workers=2,
+            storage_hot_size=1000,
+            storage_hot_eviction="lru",
+            storage_hot_admission="none",
+            storage_hot_stripes=4,
+            storage_warm_dir=str(temp_dir / "warm"),
+            storage_cold_dir=str(temp_dir / "cold"),
+            storage_cold_repack_interval=60.0,
+            storage_cold_decode_workers=1,
+            storage_cold_decode_concurrency=1,
+            storage_warm_redis_url=None,
+            storage_warm_redis_pool_size=4,
+            storage_warm_redis_ttl=60,
+            events_queue_size=16,
+            events_overflow="drop_oldest",
+            events_history_size=64,
+            events_spill_dir=None,
+            events_stream_buffer=16,
+            events_stream_slow_consumer="drop",
+            events_stream_max_clients=4,
+            events_broker_socket=None,
+            events_broker_topics=[],
+            context_tables=None,
+            context_max_keywords=20,
+            context_max_chars=10_000,
+            context_batch_max_items=10,
+            context_cache_size=16,
+            context_cache_ttl=60.0,
+            context_stream_confidence=0.95,
+            context_stream_max_seconds=1.0,
+            context_session_half_life=600.0,
+            context_session_idle_ttl=3600.0,
+            context_max_sessions=100,
+            context_suggest_max=5,
+            migration_interval=60.0,
+            migration_hot_idle=HOUR,
+            migration_warm_idle=HOUR,
+            migration_io_bytes_per_sec=1024 * 1024,
+        )
+        server = CortexServer(config)
+        await server.setup()
+
+        assert "a" in server.registry.modules
+        assert server.hot.lower_tier is server.migrator
+        assert len(server.tasks) == 4
+
+        await server.stop()
+        assert server.tasks == []
+        assert not server.running
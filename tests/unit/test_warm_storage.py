@@ -0,0 +1,89 @@
+"""Tests for the lz4 + msgpack warm tier"""
+from types import MappingProxyType
+
+from cortex.storage.codec import unpack
+from cortex.storage.warm import WarmStorage
+
+
+class TestWarmStorage:
+    """Test suite for WarmStorage"""
+
+    def test_round_trip_compressed(self, temp_dir):
+        """Test modules are stored compressed and read back intact"""
+        warm = WarmStorage(temp_dir)
+        module = {"id": "big", "sections": {"core": {"notes.md": "pattern " * 5000}}, 1: [1, 2]}
+
+        warm.store("big", module)
+
+        assert warm.retrieve("big") == module
+        assert (temp_dir / "big.warm").stat().st_size < 5000
+        assert warm.stats()["compression_ratio"] > 1
+
+    def test_frozen_content(self, temp_dir):
+        """Test frozen registry content serializes as plain containers"""
+        warm = WarmStorage(temp_dir)
+        content = MappingProxyType({"knowledge": MappingProxyType({"a.json": ("x", frozenset({1}))})})
+
+        warm.store("frozen", content)
+
+        assert warm.retrieve("frozen") == {"knowledge": {"a.json": ["x", [1]]}}
+
+    def test_memoryview_payload(self, temp_dir):
+        """Test the uncompressed payload is exposed as a memoryview"""
+        warm = WarmStorage(temp_dir)
+        warm.store("mod", {"data": "x" * 100})
+
+        view = warm.retrieve_view("mod")
+
+        assert isinstance(view, memoryview)
+        assert unpack(view) == {"data": "x" * 100}
+
+    def test_atomic_write_leaves_no_temp_files(self, temp_dir):
+        """Test writes go through a temp file that is renamed into place"""
+        warm = WarmStorage(temp_dir)
+        warm.store("mod", {"v": 1})
+        warm.store("mod", {"v": 2})
+
+        assert sorted(p.name for p in temp_dir.iterdir()) == ["mod.warm"]
+        assert warm.retrieve("mod") == {"v": 2}
+
+    def test_index_rebuilt_on_startup(self, temp_dir):
+        """Test the metadata index is rebuilt and stale temp files removed"""
+        WarmStorage(temp_dir).store("mod", {"v": 1})
+        (temp_dir / ".mod.abc.tmp").write_bytes(b"partial")
+
+        warm = WarmStorage(temp_dir)
+
+        assert "mod" in warm
+        assert warm.module_ids() == ["mod"]
+        assert not (temp_dir / ".mod.abc.tmp").exists()
+
+    def test_lookups_use_index(self, temp_dir):
+        """Test misses are answered from memory and vanished files dropped"""
+        warm = WarmStorage(temp_dir)
+        assert warm.retrieve("missing") is None
+
+        warm.store("mod", {"v": 1})
+        (temp_dir / "mod.warm").unlink()
+        assert warm.retrieve("mod") is None
+        assert "mod" not in warm
+
+    def test_remove(self, temp_dir):
+        """Test removal deletes the file and index entry"""
+        warm = WarmStorage(temp_dir)
+        warm.store("mod", {"v": 1})
+
+        assert warm.remove("mod")
+        assert not warm.remove("mod")
+        assert not (temp_dir / "mod.warm").exists()
+
+    def test_read_throughput(self, temp_dir):
+        """Test reads report throughput in MB/s"""
+        warm = WarmStorage(temp_dir)
+        warm.store("mod", {"data": "y" * 200000})
+        for _ in range(3):
+            warm.retrieve("mod")
+
+        stats = warm.stats()
+        assert stats["reads"] == 3
+        assert stats["read_mb_per_s"] > 0